@@ -146,7 +146,7 @@ async def translate_text(request: Request):
 
 @app.get("/translation-status/{job_id}")
 async def get_translation_status(job_id: str):
-    """Get translation job status"""
+    """Get translation job status; segments are paged from /reviews/{job_id}/segments on the translation service"""
     try:
         async with httpx.AsyncClient() as client:
             response = await client.get(f"{TRANSLATION_SERVICE_URL}/status/{job_id}")
@@ -38,6 +38,22 @@ os.makedirs(EXPORT_FOLDER, exist_ok=True)
 ground_truth_data = {}
 export_files = {}
 
+def _build_segment(seg_data: Dict[str, Any]) -> GroundTruthSegment:
+    """Create a ground truth segment from request data"""
+    return GroundTruthSegment(
+        segment_id=seg_data.get("segment_id", str(uuid.uuid4())),
+        start_time=seg_data.get("start_time", "00:00:00.000"),
+        end_time=seg_data.get("end_time", "00:00:00.000"),
+        original_text=seg_data.get("original_text", ""),
+        translated_text=seg_data.get("translated_text", ""),
+        approved_translation=seg_data.get("approved_translation", ""),
+        status=seg_data.get("status", "approved"),
+        edited_by=seg_data.get("edited_by", "unknown"),
+        edited_at=datetime.fromisoformat(seg_data.get("edited_at", datetime.utcnow().isoformat())),
+        confidence=seg_data.get("confidence"),
+        notes=seg_data.get("notes")
+    )
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -64,22 +80,7 @@ async def save_ground_truth(request: Request):
             raise HTTPException(status_code=400, detail="file_id and evaluation_id are required")
         
         # Create ground truth segments
-        segments = []
-        for seg_data in segments_data:
-            segment = GroundTruthSegment(
-                segment_id=seg_data.get("segment_id", str(uuid.uuid4())),
-                start_time=seg_data.get("start_time", "00:00:00.000"),
-                end_time=seg_data.get("end_time", "00:00:00.000"),
-                original_text=seg_data.get("original_text", ""),
-                translated_text=seg_data.get("translated_text", ""),
-                approved_translation=seg_data.get("approved_translation", ""),
-                status=seg_data.get("status", "approved"),
-                edited_by=seg_data.get("edited_by", "unknown"),
-                edited_at=datetime.fromisoformat(seg_data.get("edited_at", datetime.utcnow().isoformat())),
-                confidence=seg_data.get("confidence"),
-                notes=seg_data.get("notes")
-            )
-            segments.append(segment)
+        segments = [_build_segment(seg_data) for seg_data in segments_data]
         
         # Create ground truth data
         ground_truth = GroundTruthData(
@@ -97,6 +98,65 @@ async def save_ground_truth(request: Request):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save ground truth: {str(e)}")
 
+def _parse_stream_header(line: bytes) -> Dict[str, Any]:
+    """Parse the first NDJSON line, which must name the file and evaluation"""
+    header = json.loads(line)
+    if not isinstance(header, dict) or not header.get("file_id") or not header.get("evaluation_id"):
+        raise HTTPException(status_code=400, detail="file_id and evaluation_id are required")
+    return header
+
+@app.post("/ground-truth/stream")
+async def stream_ground_truth(request: Request):
+    """Save ground truth data sent as newline-delimited JSON
+    
+    The first line holds ``file_id`` and ``evaluation_id``, every following
+    line is one segment. The body is parsed line by line as it arrives, so
+    the raw request is never buffered whole; the parsed segments are kept in
+    memory like every other ground truth record.
+    """
+    try:
+        header = None
+        segments = []
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                if header is None:
+                    header = _parse_stream_header(line)
+                else:
+                    segments.append(_build_segment(json.loads(line)))
+        if buffer.strip():
+            if header is None:
+                header = _parse_stream_header(buffer)
+            else:
+                segments.append(_build_segment(json.loads(buffer)))
+        
+        if header is None:
+            raise HTTPException(status_code=400, detail="file_id and evaluation_id are required")
+        
+        ground_truth = GroundTruthData(
+            file_id=header["file_id"],
+            evaluation_id=header["evaluation_id"],
+            segments=segments,
+            total_segments=len(segments)
+        )
+        ground_truth_data[ground_truth.evaluation_id] = ground_truth
+        
+        return {
+            "evaluation_id": ground_truth.evaluation_id,
+            "total_segments": ground_truth.total_segments
+        }
+        
+    except HTTPException:
+        raise
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid NDJSON line: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to save ground truth: {str(e)}")
+
 @app.get("/ground-truth", response_model=List[GroundTruthData])
 async def get_ground_truth(
     file_id: str = None,
@@ -0,0 +1,15 @@
+import os
+import shutil
+import sys
+import tempfile
+
+# main creates ./data and the export folder relative to the working directory
+_scratch_dir = tempfile.mkdtemp(prefix="storage-service-tests-")
+os.environ["EXPORT_FOLDER"] = os.path.join(_scratch_dir, "exports")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(_scratch_dir)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_scratch_dir, ignore_errors=True)
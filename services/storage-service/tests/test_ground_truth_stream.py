@@ -0,0 +1,63 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def client():
+    main.ground_truth_data.clear()
+    return TestClient(main.app)
+
+
+def _ndjson(*lines) -> bytes:
+    return b"\n".join(json.dumps(line, ensure_ascii=False).encode("utf-8") for line in lines)
+
+
+def _segment(i: int) -> dict:
+    return {"segment_id": f"s{i}", "original_text": f"نص {i}", "approved_translation": f"متن {i}"}
+
+
+def _chunked(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def test_segments_split_across_chunks_are_reassembled(client):
+    body = _ndjson({"file_id": "f1", "evaluation_id": "e1"}, *[_segment(i) for i in range(5)]) + b"\n"
+
+    response = client.post("/ground-truth/stream", content=_chunked(body, 7))
+
+    assert response.status_code == 200
+    assert response.json() == {"evaluation_id": "e1", "total_segments": 5}
+    stored = main.ground_truth_data["e1"]
+    assert [segment.segment_id for segment in stored.segments] == [f"s{i}" for i in range(5)]
+    assert stored.segments[4].approved_translation == "متن 4"
+
+
+def test_last_segment_without_trailing_newline_is_kept(client):
+    body = _ndjson({"file_id": "f1", "evaluation_id": "e2"}, _segment(0), _segment(1))
+
+    assert client.post("/ground-truth/stream", content=body).json()["total_segments"] == 2
+
+
+@pytest.mark.parametrize("body", [
+    _ndjson({"file_id": "f1"}),
+    _ndjson({"file_id": "f1"}) + b"\n",
+    _ndjson({"evaluation_id": "e3"}, _segment(0)),
+    _ndjson(["not", "a", "header"]),
+    b"",
+])
+def test_missing_header_fields_are_rejected(client, body):
+    response = client.post("/ground-truth/stream", content=body)
+
+    assert response.status_code == 400
+    assert not main.ground_truth_data
+
+
+def test_malformed_line_is_rejected(client):
+    body = _ndjson({"file_id": "f1", "evaluation_id": "e4"}) + b"\n{not json"
+
+    assert client.post("/ground-truth/stream", content=body).status_code == 400
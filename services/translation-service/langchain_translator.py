@@ -1,14 +1,19 @@
 import os
+import re
 import asyncio
 import time
 import json
+import logging
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from pydantic import BaseModel
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from pydantic import BaseModel, PrivateAttr
 
 from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
@@ -16,6 +21,12 @@ from langchain.memory import ConversationBufferMemory
 from langchain.chains import LLMChain
 from langchain.schema import BaseOutputParser
 
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # Numba is optional, script scans fall back to regex/set checks
+    njit = None
+
 
 class TranslationSegment(BaseModel):
     segment_id: str
@@ -40,6 +51,118 @@ class TranslationJob(BaseModel):
     completed_segments: int = 0
     average_confidence: Optional[float] = None
     average_quality_score: Optional[float] = None
+    version: int = 0  # bumped on every change, used for ETags
+    
+    # Running score sums so segment edits update the averages in O(1)
+    _conf_sum: float = PrivateAttr(default=0.0)
+    _qual_sum: float = PrivateAttr(default=0.0)
+    # Segment lookup by ID, built on first use (segments are fixed once the job exists)
+    _segments_by_id: Optional[Dict[str, TranslationSegment]] = PrivateAttr(default=None)
+    
+    def get_segment(self, segment_id: str) -> Optional[TranslationSegment]:
+        """Find a segment by ID in O(1)"""
+        if self._segments_by_id is None:
+            # First occurrence wins if IDs repeat, matching a front-to-back scan
+            self._segments_by_id = {}
+            for s in self.segments:
+                self._segments_by_id.setdefault(s.segment_id, s)
+        return self._segments_by_id.get(segment_id)
+    
+    def init_running_sums(self):
+        """Recompute the running score sums from the segments"""
+        self._conf_sum = sum(s.confidence_score or 0 for s in self.segments)
+        self._qual_sum = sum((s.quality_metrics or {}).get("overall_quality_score", 0) for s in self.segments)
+    
+    def merge_edits(self, other: "TranslationJob"):
+        """Take the segment edits of another copy of this job that are newer than ours"""
+        for theirs in other.segments:
+            if not theirs.is_edited:
+                continue
+            mine = self.get_segment(theirs.segment_id)
+            if mine is not None and (theirs.edited_at or "") > (mine.edited_at or ""):
+                mine.llm_translation = theirs.llm_translation
+                mine.is_edited = True
+                mine.edited_at = theirs.edited_at
+    
+    def apply_score_change(self, old_conf: float, new_conf: float, old_qual: float, new_qual: float):
+        """Fold one segment's score change into the sums and refresh the averages"""
+        self._conf_sum += new_conf - old_conf
+        self._qual_sum += new_qual - old_qual
+        if self.completed_segments > 0:
+            self.average_confidence = self._conf_sum / self.completed_segments
+            self.average_quality_score = self._qual_sum / self.completed_segments
+
+
+class JobVersionConflict(Exception):
+    """A job was saved by someone else since it was loaded"""
+
+
+# Status buckets for job listings; "approved" jobs are archived
+JOB_STATUS_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "active": ("pending", "in_progress"),
+    "completed": ("completed", "failed"),
+    "archived": ("approved",),
+}
+
+
+@dataclass(slots=True)
+class JobSummary:
+    """Job-level fields only, for listings that never touch segments"""
+    job_id: str
+    file_id: str
+    status: str
+    total_segments: int
+    completed_segments: int
+    average_confidence: Optional[float]
+    average_quality_score: Optional[float]
+    created_at: datetime
+    completed_at: Optional[datetime]
+    version: int
+    
+    @classmethod
+    def from_job(cls, job: TranslationJob) -> "JobSummary":
+        return cls(
+            job.job_id, job.file_id, job.status, job.total_segments, job.completed_segments,
+            job.average_confidence, job.average_quality_score, job.created_at, job.completed_at, job.version
+        )
+
+
+# Single-pass extraction of the translation and optional trailing notes
+_PARSE_RE = re.compile(
+    r'<urdu_translation>(.*?)</urdu_translation>'
+    r'(?:(?:(?!<urdu_translation>).)*?<translation_notes>(.*?)</translation_notes>)?',
+    re.DOTALL
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Jobs, the translation cache and legacy JSON files live here
+DATA_DIR = os.getenv("DATA_DIR", "/app/data")
+
+# Batch responses are returned through a forced tool call, so the model emits
+# structured JSON instead of free text that has to be filtered line by line
+_EMIT_TOOL = {
+    "name": "emit",
+    "description": "Return the Urdu translation of every numbered Arabic text",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "translations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "text": {"type": "string"}
+                    },
+                    "required": ["id", "text"]
+                }
+            }
+        },
+        "required": ["translations"]
+    }
+}
 
 
 class TranslationOutputParser(BaseOutputParser):
@@ -47,110 +170,663 @@ class TranslationOutputParser(BaseOutputParser):
     
     def parse(self, text: str) -> Dict[str, str]:
         """Parse the LLM response to extract translation and notes"""
-        # Look for translation within tags
-        if "<urdu_translation>" in text and "</urdu_translation>" in text:
-            start = text.find("<urdu_translation>") + len("<urdu_translation>")
-            end = text.find("</urdu_translation>")
-            translation = text[start:end].strip()
-        else:
-            # Fallback: take the entire response as translation
-            translation = text.strip()
-        
-        # Look for notes within tags
-        notes = ""
-        if "<translation_notes>" in text and "</translation_notes>" in text:
-            start = text.find("<translation_notes>") + len("<translation_notes>")
-            end = text.find("</translation_notes>")
-            notes = text[start:end].strip()
+        m = _PARSE_RE.search(text)
+        # Fallback: take the entire response as translation
+        translation = m.group(1).strip() if m else text.strip()
+        notes = m.group(2).strip() if m and m.group(2) else ""
         
         return {
             "translation": translation,
             "notes": notes
         }
+    
+    def parse_all(self, text: str) -> List[Dict[str, str]]:
+        """Parse every tagged translation in a multi-segment response"""
+        return [
+            {
+                "translation": m.group(1).strip(),
+                "notes": (m.group(2) or "").strip()
+            }
+            for m in _PARSE_RE.finditer(text)
+        ]
+
+
+_URDU_SCRIPT_RE = re.compile(r'[\u0600-\u06FF\u0750-\u077F]')
+_URDU_PUNCTUATION = frozenset('،۔!؟')
+_ARABIC_NUMERALS = frozenset('٠١٢٣٤٥٦٧٨٩')
+
+if njit is not None:
+    @njit(cache=True)
+    def _scan_codepoints(codes):
+        """Single native pass over UTF-32 codepoints"""
+        has_urdu_script = False
+        has_punctuation = False
+        has_arabic_numerals = False
+        for c in codes:
+            if (0x0600 <= c <= 0x06FF) or (0x0750 <= c <= 0x077F):
+                has_urdu_script = True
+                if 0x0660 <= c <= 0x0669:
+                    has_arabic_numerals = True
+                elif c == 0x060C or c == 0x06D4 or c == 0x061F:
+                    has_punctuation = True
+            elif c == 0x21:
+                has_punctuation = True
+        return has_urdu_script, has_punctuation, has_arabic_numerals
+
+
+def _scan_script(text: str) -> Tuple[bool, bool, bool]:
+    """Return (has_urdu_script, has_punctuation, has_arabic_numerals) for text"""
+    if njit is not None:
+        return _scan_codepoints(np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32))
+    return (
+        _URDU_SCRIPT_RE.search(text) is not None,
+        not _URDU_PUNCTUATION.isdisjoint(text),
+        not _ARABIC_NUMERALS.isdisjoint(text)
+    )
+
+
+def calculate_confidence_score(arabic_text: str, urdu_text: str) -> float:
+    """Calculate confidence score for translation quality"""
+    score = 0.5  # Base score
+    
+    # Length similarity
+    arabic_length = len(arabic_text)
+    urdu_length = len(urdu_text)
+    if arabic_length > 0 and urdu_length > 0:
+        length_ratio = min(arabic_length, urdu_length) / max(arabic_length, urdu_length)
+        score += length_ratio * 0.2
+    
+    # Check for Urdu script
+    if _scan_script(urdu_text)[0]:
+        score += 0.2
+    
+    # Check for common Urdu words
+    urdu_indicators = ['ہے', 'ہیں', 'کیا', 'کا', 'کی', 'میں', 'پر', 'سے', 'کو', 'کے']
+    if any(word in urdu_text for word in urdu_indicators):
+        score += 0.1
+    
+    # Check for proper formatting
+    if urdu_text.strip() and not urdu_text.isspace():
+        score += 0.1
+    
+    return min(score, 1.0)
+
+
+def calculate_quality_metrics(arabic_text: str, urdu_text: str) -> Dict:
+    """Calculate detailed quality metrics"""
+    has_urdu_script, has_punctuation, has_arabic_numerals = _scan_script(urdu_text)
+    metrics = {
+        "length_ratio": len(urdu_text) / max(len(arabic_text), 1),
+        "has_urdu_script": bool(has_urdu_script),
+        "has_numbers": any(char.isdigit() for char in urdu_text),
+        "has_punctuation": bool(has_punctuation),
+        "word_count": len(urdu_text.split()),
+        "character_count": len(urdu_text),
+        "is_not_empty": bool(urdu_text.strip()),
+        "has_arabic_numerals": bool(has_arabic_numerals)
+    }
+    
+    # Calculate overall quality score
+    quality_score = 0.0
+    if metrics["has_urdu_script"]:
+        quality_score += 0.3
+    if 0.5 <= metrics["length_ratio"] <= 2.0:
+        quality_score += 0.2
+    if metrics["has_punctuation"]:
+        quality_score += 0.1
+    if metrics["is_not_empty"]:
+        quality_score += 0.2
+    if metrics["word_count"] > 0:
+        quality_score += 0.2
+    
+    metrics["overall_quality_score"] = min(quality_score, 1.0)
+    
+    return metrics
+
+
+def score_batch(pairs: List[Tuple[str, str]]) -> List[Tuple[float, Dict]]:
+    """Score (arabic_text, urdu_text) pairs"""
+    return [
+        (calculate_confidence_score(arabic_text, urdu_text), calculate_quality_metrics(arabic_text, urdu_text))
+        for arabic_text, urdu_text in pairs
+    ]
 
 
 class PersistentJobStorage:
-    """Persistent storage for translation jobs using JSON files"""
+    """Persistent storage for translation jobs using SQLite (WAL mode)"""
     
-    def __init__(self, storage_dir: str = "/app/data"):
+    def __init__(self, storage_dir: str = DATA_DIR):
         self.storage_dir = storage_dir
-        self.jobs_file = os.path.join(storage_dir, "translation_jobs.json")
+        self.db_file = os.path.join(storage_dir, "translation_jobs.db")
+        self.legacy_jobs_file = os.path.join(storage_dir, "translation_jobs.json")
         os.makedirs(storage_dir, exist_ok=True)
+        
+        # Writes come from the event loop and from worker threads
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                file_id TEXT,
+                status TEXT,
+                created_at TEXT,
+                completed_at TEXT,
+                json TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+            CREATE TABLE IF NOT EXISTS segments (
+                job_id TEXT,
+                idx INTEGER,
+                confidence REAL,
+                quality REAL,
+                t REAL,
+                translated TEXT,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE TABLE IF NOT EXISTS pending_edits (
+                job_id TEXT,
+                segment_id TEXT,
+                translation TEXT,
+                due_at REAL,
+                PRIMARY KEY (job_id, segment_id)
+            );
+        """)
+        # Summary columns so job listings need not decode the JSON body
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in self._SUMMARY_COLUMNS:
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        self.conn.commit()
+    
+    _SUMMARY_COLUMNS = (
+        ("total_segments", "INTEGER"),
+        ("completed_segments", "INTEGER"),
+        ("average_confidence", "REAL"),
+        ("average_quality_score", "REAL"),
+        ("version", "INTEGER"),
+    )
+    
+    def _job_to_dict(self, job: TranslationJob) -> Dict:
+        """Convert a job to its serializable format"""
+        return {
+            "job_id": job.job_id,
+            "file_id": job.file_id,
+            "segments": [
+                {
+                    "segment_id": s.segment_id,
+                    "original_text": s.original_text,
+                    "translated_text": s.translated_text,
+                    "llm_translation": s.llm_translation,
+                    "confidence_score": s.confidence_score,
+                    "quality_metrics": s.quality_metrics,
+                    "translation_time": s.translation_time,
+                    "is_edited": s.is_edited,
+                    "edited_at": s.edited_at
+                } for s in job.segments
+            ],
+            "status": job.status,
+            "created_at": job.created_at.isoformat(),
+            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+            "total_segments": job.total_segments,
+            "completed_segments": job.completed_segments,
+            "average_confidence": job.average_confidence,
+            "average_quality_score": job.average_quality_score,
+            "version": job.version
+        }
+    
+    def _job_from_dict(self, job_data: Dict) -> TranslationJob:
+        """Convert serialized job data back to a TranslationJob"""
+        job = TranslationJob(
+            job_id=job_data["job_id"],
+            file_id=job_data["file_id"],
+            segments=[TranslationSegment(**seg_data) for seg_data in job_data["segments"]],
+            status=job_data["status"],
+            created_at=datetime.fromisoformat(job_data["created_at"]),
+            completed_at=datetime.fromisoformat(job_data["completed_at"]) if job_data["completed_at"] else None,
+            total_segments=job_data["total_segments"],
+            completed_segments=job_data["completed_segments"],
+            average_confidence=job_data["average_confidence"],
+            average_quality_score=job_data["average_quality_score"],
+            version=job_data.get("version", 0)
+        )
+        job.init_running_sums()
+        return job
+    
+    def _write_job(self, job: TranslationJob):
+        """Upsert a job row and its segment rows (caller holds the lock and transaction)"""
+        job_data = self._job_to_dict(job)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO jobs (job_id, file_id, status, created_at, completed_at, json, total_segments, "
+            "completed_segments, average_confidence, average_quality_score, version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job.job_id, job.file_id, job.status, job_data["created_at"], job_data["completed_at"],
+             json.dumps(job_data, ensure_ascii=False), job.total_segments, job.completed_segments,
+             job.average_confidence, job.average_quality_score, job.version)
+        )
+        self.conn.execute("DELETE FROM segments WHERE job_id = ?", (job.job_id,))
+        self.conn.executemany(
+            "INSERT INTO segments (job_id, idx, confidence, quality, t, translated) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (job.job_id, i, s.confidence_score,
+                 (s.quality_metrics or {}).get("overall_quality_score"),
+                 s.translation_time, s.llm_translation)
+                for i, s in enumerate(job.segments)
+            ]
+        )
+    
+    def save_job(self, job: TranslationJob, expected_version: Optional[int] = None) -> bool:
+        """Save a single job
+        
+        With ``expected_version`` this is a compare-and-swap: the job is only
+        written if the stored row is missing or still at that version, and
+        False is returned otherwise.
+        """
+        with self.lock, self.conn:
+            # Take the write lock before reading the version so no other worker can slip in between
+            self.conn.execute("BEGIN IMMEDIATE")
+            if expected_version is not None:
+                row = self.conn.execute("SELECT version FROM jobs WHERE job_id = ?", (job.job_id,)).fetchone()
+                if row is not None and (row[0] or 0) != expected_version:
+                    return False
+            self._write_job(job)
+        return True
     
     def save_jobs(self, jobs: Dict[str, TranslationJob]):
-        """Save jobs to JSON file"""
+        """Save all jobs in one transaction"""
         try:
-            # Convert jobs to serializable format
-            jobs_data = {}
-            for job_id, job in jobs.items():
-                jobs_data[job_id] = {
-                    "job_id": job.job_id,
-                    "file_id": job.file_id,
-                    "segments": [
-                        {
-                            "segment_id": s.segment_id,
-                            "original_text": s.original_text,
-                            "translated_text": s.translated_text,
-                            "llm_translation": s.llm_translation,
-                            "confidence_score": s.confidence_score,
-                            "quality_metrics": s.quality_metrics,
-                            "translation_time": s.translation_time,
-                            "is_edited": s.is_edited,
-                            "edited_at": s.edited_at
-                        } for s in job.segments
-                    ],
-                    "status": job.status,
-                    "created_at": job.created_at.isoformat(),
-                    "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-                    "total_segments": job.total_segments,
-                    "completed_segments": job.completed_segments,
-                    "average_confidence": job.average_confidence,
-                    "average_quality_score": job.average_quality_score
-                }
-            
-            with open(self.jobs_file, 'w', encoding='utf-8') as f:
-                json.dump(jobs_data, f, ensure_ascii=False, indent=2)
+            with self.lock, self.conn:
+                for job in list(jobs.values()):
+                    self._write_job(job)
             
-            print(f"Saved {len(jobs)} translation jobs to {self.jobs_file}")
+            logger.info("Saved %d translation jobs to %s", len(jobs), self.db_file)
+        except Exception as e:
+            logger.error("Error saving jobs: %s", e)
+    
+    def import_legacy_jobs(self):
+        """Import the legacy JSON job file into an empty database"""
+        try:
+            with self.lock:
+                empty = not self.conn.execute("SELECT 1 FROM jobs LIMIT 1").fetchone()
+            if empty and os.path.exists(self.legacy_jobs_file):
+                with open(self.legacy_jobs_file, 'r', encoding='utf-8') as f:
+                    jobs_data = json.load(f)
+                legacy_jobs = {job_id: self._job_from_dict(job_data) for job_id, job_data in jobs_data.items()}
+                self.save_jobs(legacy_jobs)
+                logger.info("Imported %d translation jobs from %s", len(legacy_jobs), self.legacy_jobs_file)
         except Exception as e:
-            print(f"Error saving jobs: {e}")
+            logger.error("Error importing legacy jobs: %s", e)
     
     def load_jobs(self) -> Dict[str, TranslationJob]:
-        """Load jobs from JSON file"""
+        """Load all jobs from the database"""
         jobs = {}
         try:
-            if os.path.exists(self.jobs_file):
-                with open(self.jobs_file, 'r', encoding='utf-8') as f:
-                    jobs_data = json.load(f)
-                
-                for job_id, job_data in jobs_data.items():
-                    # Convert segments back to TranslationSegment objects
-                    segments = []
-                    for seg_data in job_data["segments"]:
-                        segments.append(TranslationSegment(**seg_data))
-                    
-                    # Create TranslationJob object
-                    job = TranslationJob(
-                        job_id=job_data["job_id"],
-                        file_id=job_data["file_id"],
-                        segments=segments,
-                        status=job_data["status"],
-                        created_at=datetime.fromisoformat(job_data["created_at"]),
-                        completed_at=datetime.fromisoformat(job_data["completed_at"]) if job_data["completed_at"] else None,
-                        total_segments=job_data["total_segments"],
-                        completed_segments=job_data["completed_segments"],
-                        average_confidence=job_data["average_confidence"],
-                        average_quality_score=job_data["average_quality_score"]
-                    )
-                    jobs[job_id] = job
-                
-                print(f"Loaded {len(jobs)} translation jobs from {self.jobs_file}")
-            else:
-                print(f"No existing jobs file found at {self.jobs_file}")
+            with self.lock:
+                rows = self.conn.execute("SELECT json FROM jobs").fetchall()
+            for (job_json,) in rows:
+                job = self._job_from_dict(json.loads(job_json))
+                jobs[job.job_id] = job
         except Exception as e:
-            print(f"Error loading jobs: {e}")
+            logger.error("Error loading jobs: %s", e)
         
         return jobs
+    
+    def load_summaries(self, statuses: Optional[Tuple[str, ...]] = None) -> Dict[str, JobSummary]:
+        """Load the job-level fields of every job (optionally only these statuses) from the summary columns"""
+        query = (
+            "SELECT job_id, file_id, status, total_segments, completed_segments, average_confidence, "
+            "average_quality_score, created_at, completed_at, version FROM jobs"
+        )
+        params: Tuple[str, ...] = ()
+        if statuses is not None:
+            # Served from the status index
+            query += f" WHERE status IN ({', '.join('?' * len(statuses))})"
+            params = statuses
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        summaries = {}
+        for row in rows:
+            if row[3] is None:
+                # Row written before the summary columns existed
+                job = self.load_job(row[0])
+                if job is not None:
+                    summaries[row[0]] = JobSummary.from_job(job)
+                continue
+            summaries[row[0]] = JobSummary(
+                row[0], row[1], row[2], row[3], row[4], row[5], row[6],
+                datetime.fromisoformat(row[7]), datetime.fromisoformat(row[8]) if row[8] else None, row[9] or 0
+            )
+        return summaries
+    
+    def load_job(self, job_id: str) -> Optional[TranslationJob]:
+        """Load a single job by ID"""
+        with self.lock:
+            row = self.conn.execute("SELECT json FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._job_from_dict(json.loads(row[0])) if row else None
+    
+    def job_version(self, job_id: str) -> Optional[int]:
+        """Version of a stored job without decoding it; None if there is no such job"""
+        with self.lock:
+            row = self.conn.execute("SELECT version FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return (row[0] or 0) if row else None
+    
+    def job_exists(self, job_id: str) -> bool:
+        """Check for a job without decoding it"""
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone() is not None
+    
+    def put_pending_edit(self, job_id: str, segment_id: str, translation: str, due_at: float):
+        """Record a debounced segment edit, replacing any earlier one for the segment"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pending_edits (job_id, segment_id, translation, due_at) VALUES (?, ?, ?, ?)",
+                (job_id, segment_id, translation, due_at)
+            )
+    
+    def pending_edits(self, job_id: str) -> Dict[str, str]:
+        """Debounced edits of a job not applied yet, by segment ID"""
+        with self.lock:
+            return dict(self.conn.execute(
+                "SELECT segment_id, translation FROM pending_edits WHERE job_id = ?", (job_id,)
+            ).fetchall())
+    
+    def take_pending_edit(self, job_id: str, segment_id: str, due_at: float) -> Optional[str]:
+        """Remove and return an edit, unless a newer edit (another due_at) replaced it"""
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT translation FROM pending_edits WHERE job_id = ? AND segment_id = ? AND due_at = ?",
+                (job_id, segment_id, due_at)
+            ).fetchone()
+            if row:
+                self.conn.execute("DELETE FROM pending_edits WHERE job_id = ? AND segment_id = ?", (job_id, segment_id))
+        return row[0] if row else None
+    
+    def take_pending_edits(self, job_id: str) -> Dict[str, str]:
+        """Remove and return every pending edit of a job"""
+        with self.lock, self.conn:
+            edits = dict(self.conn.execute(
+                "SELECT segment_id, translation FROM pending_edits WHERE job_id = ?", (job_id,)
+            ).fetchall())
+            self.conn.execute("DELETE FROM pending_edits WHERE job_id = ?", (job_id,))
+        return edits
+    
+    def status_counts(self) -> Dict[str, int]:
+        """Count jobs by status (served from the status index)"""
+        with self.lock:
+            return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+    
+    def completed_segment_totals(self) -> Tuple[int, float, float, int, float]:
+        """Aggregate segments of completed jobs in a single SQL scan
+        
+        Returns (segment_count, confidence_sum, quality_sum) over successful
+        segments, then (timed_count, time_sum) over every segment with a
+        non-zero translation time.
+        """
+        with self.lock:
+            return self.conn.execute("""
+                SELECT COALESCE(SUM(ok), 0),
+                       COALESCE(SUM(CASE WHEN ok THEN confidence END), 0),
+                       COALESCE(SUM(CASE WHEN ok THEN quality END), 0),
+                       COALESCE(SUM(t > 0), 0),
+                       COALESCE(SUM(CASE WHEN t > 0 THEN t END), 0)
+                FROM (
+                    SELECT s.confidence, s.quality, s.t,
+                           s.translated IS NOT NULL AND s.translated != ''
+                           AND s.translated NOT LIKE '[Translation failed:%'
+                           AND s.confidence IS NOT NULL AS ok
+                    FROM segments s JOIN jobs j ON j.job_id = s.job_id
+                    WHERE j.status IN ('completed', 'approved')
+                )
+            """).fetchone()
+
+
+class JobStore:
+    """Worker-agnostic access to translation jobs
+    
+    Jobs this worker is still translating are served from the translator's
+    in-memory map; everything else is read from the shared SQLite database, so
+    several uvicorn workers see the same jobs. Writes to a job this worker owns
+    go through its background writer; other jobs are saved with a version
+    compare-and-swap, so a concurrent save elsewhere is never overwritten.
+    """
+    
+    def __init__(self, translator: "LangChainTranslator"):
+        self.translator = translator
+        self.storage = translator.storage
+    
+    async def get(self, job_id: str) -> Optional[TranslationJob]:
+        job = self.translator.translation_jobs.get(job_id)
+        if job is None:
+            job = await asyncio.to_thread(self.storage.load_job, job_id)
+        return job
+    
+    async def version(self, job_id: str) -> Optional[int]:
+        """Current version of a job, read without loading its segments"""
+        job = self.translator.translation_jobs.get(job_id)
+        if job is not None:
+            return job.version
+        return await asyncio.to_thread(self.storage.job_version, job_id)
+    
+    async def exists(self, job_id: str) -> bool:
+        return job_id in self.translator.translation_jobs or await asyncio.to_thread(self.storage.job_exists, job_id)
+    
+    async def put(self, job: TranslationJob):
+        """Persist a changed job; raises JobVersionConflict if it was saved elsewhere since it was loaded"""
+        if self.translator.translation_jobs.get(job.job_id) is job:
+            self.translator._schedule_save(job.job_id)
+            return
+        expected = job.version
+        job.version += 1
+        if not await asyncio.to_thread(self.storage.save_job, job, expected):
+            job.version = expected
+            raise JobVersionConflict(f"Job {job.job_id} was modified concurrently")
+    
+    async def values(self) -> List[TranslationJob]:
+        jobs = await asyncio.to_thread(self.storage.load_jobs)
+        jobs.update(self.translator.translation_jobs)
+        return list(jobs.values())
+    
+    async def summaries(self, statuses: Optional[Tuple[str, ...]] = None) -> List[JobSummary]:
+        summaries = await asyncio.to_thread(self.storage.load_summaries, statuses)
+        # In-memory jobs are newer than their stored rows, including their status
+        for job_id, job in list(self.translator.translation_jobs.items()):
+            if statuses is None or job.status in statuses:
+                summaries[job_id] = JobSummary.from_job(job)
+            else:
+                summaries.pop(job_id, None)
+        return list(summaries.values())
+    
+    # Debounced edits live in the shared database so every worker sees and flushes them
+    async def pending_edits(self, job_id: str) -> Dict[str, str]:
+        return await asyncio.to_thread(self.storage.pending_edits, job_id)
+    
+    async def put_pending_edit(self, job_id: str, segment_id: str, translation: str, due_at: float):
+        await asyncio.to_thread(self.storage.put_pending_edit, job_id, segment_id, translation, due_at)
+    
+    async def take_pending_edit(self, job_id: str, segment_id: str, due_at: float) -> Optional[str]:
+        return await asyncio.to_thread(self.storage.take_pending_edit, job_id, segment_id, due_at)
+    
+    async def take_pending_edits(self, job_id: str) -> Dict[str, str]:
+        return await asyncio.to_thread(self.storage.take_pending_edits, job_id)
+    
+    async def update_segment(self, job: TranslationJob, segment_id: str, translation: str, attempts: int = 3) -> bool:
+        """Replace one segment's translation and persist the job; False if the segment is unknown
+        
+        If another worker saved the job in the meantime, the edit is redone on a
+        fresh copy, up to ``attempts`` times.
+        """
+        for attempt in range(attempts):
+            if attempt:
+                job = await self.get(job.job_id)
+                if job is None or job.status == "approved":
+                    return False
+            try:
+                return await self._edit_segment(job, segment_id, translation)
+            except JobVersionConflict:
+                if attempt == attempts - 1:
+                    raise
+        return False
+    
+    async def _edit_segment(self, job: TranslationJob, segment_id: str, translation: str) -> bool:
+        segment = job.get_segment(segment_id)
+        if segment is None:
+            return False
+        
+        # Store original translation and scores for comparison
+        original_translation = segment.llm_translation
+        old_conf = segment.confidence_score or 0
+        old_qual = (segment.quality_metrics or {}).get("overall_quality_score", 0)
+        segment.llm_translation = translation
+        # Don't update translation_time for manual edits - keep original
+        
+        # Mark segment as edited if translation changed
+        if original_translation != translation:
+            segment.is_edited = True
+            segment.edited_at = datetime.utcnow().isoformat()
+        
+        # Update job metrics from the running sums
+        job.apply_score_change(
+            old_conf, segment.confidence_score or 0,
+            old_qual, (segment.quality_metrics or {}).get("overall_quality_score", 0)
+        )
+        
+        await self.put(job)
+        return True
+
+class TranslationCache:
+    """Persistent cache of segment translations
+    
+    Entries are keyed by a namespace (provider, model and system prompt) plus the
+    Arabic text, so a configuration change never serves another setup's output.
+    Rows older than TRANSLATION_CACHE_TTL seconds are ignored and pruned on write.
+    """
+    
+    def __init__(self, storage_dir: str = DATA_DIR):
+        self.db_file = os.path.join(storage_dir, "translation_cache.db")
+        self.ttl = int(os.getenv("TRANSLATION_CACHE_TTL", str(30 * 24 * 3600)))  # seconds, 0 disables expiry
+        os.makedirs(storage_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(translations)")]
+        if columns and "ts" not in columns:
+            # Rows from before namespaced keys can never be hit again
+            self.conn.execute("DROP TABLE translations")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, translation TEXT NOT NULL, ts INT NOT NULL)")
+        self.conn.commit()
+    
+    @staticmethod
+    def namespace(provider: str, model: str, system_prompt: str) -> str:
+        """Identify the configuration that produced a translation"""
+        return hashlib.blake2b(f"{provider}\0{model}\0{system_prompt}".encode('utf-8'), digest_size=8).hexdigest()
+    
+    @staticmethod
+    def _key(namespace: str, arabic_text: str) -> str:
+        return namespace + hashlib.blake2b(arabic_text.encode('utf-8'), digest_size=8).hexdigest()
+    
+    def get_many(self, texts: List[str], namespace: str) -> Dict[str, str]:
+        """Return unexpired cached translations for the given Arabic texts, keyed by text"""
+        try:
+            keys = {self._key(namespace, text): text for text in texts}
+            placeholders = ",".join("?" * len(keys))
+            oldest = int(time.time()) - self.ttl if self.ttl else 0
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({placeholders}) AND ts >= ?",
+                    [*keys, oldest]
+                ).fetchall()
+            return {keys[key]: translation for key, translation in rows}
+        except Exception as e:
+            logger.warning("Error reading translation cache: %s", e)
+            return {}
+    
+    def put_many(self, items: List[Tuple[str, str]], namespace: str):
+        """Store (arabic_text, translation) pairs and drop expired rows"""
+        try:
+            now = int(time.time())
+            with self.lock, self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO translations (key, translation, ts) VALUES (?, ?, ?)",
+                    [(self._key(namespace, text), translation, now) for text, translation in items]
+                )
+                if self.ttl:
+                    self.conn.execute("DELETE FROM translations WHERE ts < ?", (now - self.ttl,))
+        except Exception as e:
+            logger.warning("Error writing translation cache: %s", e)
+
+
+class BatchCollector:
+    """Coalesces chunks from concurrent jobs into shared LLM calls
+    
+    Chunks queued within ``max_wait`` seconds of each other (up to ``max_batch``
+    of them) are merged into as few prompts as the prompt size limit allows.
+    """
+    
+    def __init__(self, translator: "LangChainTranslator", max_batch: int = 32, max_wait: float = 0.05):
+        self.translator = translator
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Running dispatches, referenced here so they are not garbage collected mid-flight
+        self._dispatches: Set[asyncio.Task] = set()
+    
+    def start(self):
+        """Start the collector on the running loop (idempotent)"""
+        if self._task is None:
+            self.queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+    
+    async def submit(self, chunk: List[TranslationSegment]):
+        """Queue a chunk and wait until its segments have been translated"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((chunk, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(items) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Dispatch without blocking the next collection window
+            task = asyncio.create_task(self._dispatch(items))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+    
+    async def _dispatch(self, items: List[Tuple[List[TranslationSegment], asyncio.Future]]):
+        """Merge queued chunks into prompts that fit the size limit and translate them"""
+        groups = []
+        current, current_items = [], []
+        for chunk, future in items:
+            if current and self.translator._estimate_prompt_size(current + chunk) > self.translator.max_prompt_tokens:
+                groups.append((current, current_items))
+                current, current_items = [], []
+            current = current + chunk
+            current_items.append(future)
+        groups.append((current, current_items))
+        
+        async def run_group(index: int, segments: List[TranslationSegment], futures: List[asyncio.Future]):
+            try:
+                await self.translator._process_single_chunk(segments, None, index)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for future in futures:
+                    if not future.done():
+                        future.set_result(None)
+        
+        await asyncio.gather(*[run_group(i, segments, futures) for i, (segments, futures) in enumerate(groups)])
 
 
 class LangChainTranslator:
@@ -160,9 +836,11 @@ class LangChainTranslator:
         """Initialize the LangChain translator"""
         # Initialize persistent storage
         self.storage = PersistentJobStorage()
+        self.cache = TranslationCache()
         
-        # Load existing jobs from storage
-        self.translation_jobs: Dict[str, TranslationJob] = self.storage.load_jobs()
+        # Jobs this worker is translating; finished jobs are read back from storage
+        self.storage.import_legacy_jobs()
+        self.translation_jobs: Dict[str, TranslationJob] = {}
         
         # Initialize with default configuration
         self._initialize_llm()
@@ -170,9 +848,85 @@ class LangChainTranslator:
         # Rate limiting configuration
         self.max_requests_per_minute = 5
         self.request_timestamps = []
+        self._rate_limit_lock = asyncio.Lock()
         self.chunk_size = 3  # Optimal chunk size based on testing
         self.max_prompt_tokens = 4000  # Conservative token limit
         self.retry_delay = 60  # Seconds to wait on rate limit
+        
+        # Chunks from concurrent jobs are merged into shared LLM calls
+        self.batch_collector = BatchCollector(
+            self,
+            max_batch=int(os.getenv("BATCH_MAX_SIZE", "32")),
+            max_wait=float(os.getenv("BATCH_MAX_WAIT_MS", "50")) / 1000
+        )
+        
+        # Jobs past this many wait as "pending" instead of piling more requests onto the provider
+        self.max_inflight_jobs = int(os.getenv("LLM_MAX_INFLIGHT", "16"))
+        self.job_slots = asyncio.Semaphore(self.max_inflight_jobs)
+        self.inflight_jobs = 0
+        # Admission tasks, referenced here so a waiting job is not garbage collected
+        self._admissions: Set[asyncio.Task] = set()
+        
+        # Background writer that coalesces job saves (started lazily on the running loop);
+        # _stored_versions is the version this worker last wrote for each job it owns
+        self._dirty = set()
+        self._stored_versions: Dict[str, int] = {}
+        self._save_event: Optional[asyncio.Event] = None
+        self._save_task: Optional[asyncio.Task] = None
+        
+        # Called once a finished job has been persisted (e.g. to invalidate cached metrics)
+        self.on_job_finished: Optional[Callable[[TranslationJob], None]] = None
+    
+    def _schedule_save(self, job_id: str):
+        """Mark a job as dirty; the background writer persists it within about a second"""
+        self.translation_jobs[job_id].version += 1
+        if self._save_task is None:
+            self._save_event = asyncio.Event()
+            self._save_task = asyncio.create_task(self._save_writer())
+        self._dirty.add(job_id)
+        self._save_event.set()
+    
+    async def _save_writer(self):
+        """Drain dirty jobs, writing each off the event loop"""
+        while True:
+            await self._save_event.wait()
+            self._save_event.clear()
+            job_ids, self._dirty = self._dirty, set()
+            for job_id in job_ids:
+                job = self.translation_jobs.get(job_id)
+                if job is None:
+                    continue
+                try:
+                    written = await self._write_owned_job(job)
+                except Exception as e:
+                    logger.error("Error saving job %s: %s", job_id, e)
+                    written = False
+                if not written:
+                    # Retry on the next round
+                    self._dirty.add(job_id)
+                    self._save_event.set()
+                    continue
+                # Finished jobs are served from storage from now on
+                if job.status in ("completed", "approved", "failed") and job_id not in self._dirty:
+                    self.translation_jobs.pop(job_id, None)
+                    self._stored_versions.pop(job_id, None)
+                    if self.on_job_finished:
+                        self.on_job_finished(job)
+            await asyncio.sleep(1.0)
+    
+    async def _write_owned_job(self, job: TranslationJob) -> bool:
+        """Write a job this worker owns without losing edits other workers saved to it"""
+        if not await asyncio.to_thread(self.storage.save_job, job, self._stored_versions.get(job.job_id)):
+            # Someone edited the stored job since our last write: keep their edits and write on top
+            stored = await asyncio.to_thread(self.storage.load_job, job.job_id)
+            if stored is None:
+                return False
+            job.merge_edits(stored)
+            job.version = max(job.version, stored.version) + 1
+            if not await asyncio.to_thread(self.storage.save_job, job, stored.version):
+                return False
+        self._stored_versions[job.job_id] = job.version
+        return True
     
     def _get_current_config(self) -> Dict:
         """Get the current LLM configuration from the main service"""
@@ -180,7 +934,7 @@ class LangChainTranslator:
             # Import here to avoid circular imports
             from main import llm_config
             config = llm_config.get("current_config", {})
-            print(f"DEBUG: Loaded config: {config}")  # Debug line
+            logger.debug("Loaded config: %s", config)
             return config
         except ImportError:
             # Fallback to environment variables
@@ -197,7 +951,10 @@ class LangChainTranslator:
         try:
             from main import llm_config
             provider_config = llm_config.get("api_providers", {}).get(provider_id, {})
-            print(f"DEBUG: Provider config for {provider_id}: {provider_config}")  # Debug line
+            # Normalize Pydantic objects so callers only ever see a dict
+            if isinstance(provider_config, BaseModel):
+                provider_config = provider_config.model_dump()
+            logger.debug("Loaded provider config for %s", provider_id)
             return provider_config
         except ImportError:
             return {}
@@ -206,7 +963,10 @@ class LangChainTranslator:
         """Get model configuration"""
         try:
             from main import llm_config
-            return llm_config.get("models", {}).get(model_id, {})
+            model_config = llm_config.get("models", {}).get(model_id, {})
+            if isinstance(model_config, BaseModel):
+                model_config = model_config.model_dump()
+            return model_config
         except ImportError:
             return {}
     
@@ -218,6 +978,12 @@ class LangChainTranslator:
         temperature = config.get("temperature", 0.1)
         max_tokens = config.get("max_tokens", 1000)
         
+        # Caps concurrent LLM calls; in-flight calls finish on the previous limiter
+        max_parallel = int(config.get("max_parallel_requests") or (os.cpu_count() or 1) * 5)
+        if getattr(self, "max_parallel_requests", None) != max_parallel:
+            self.max_parallel_requests = max_parallel
+            self.llm_semaphore = asyncio.Semaphore(max_parallel)
+        
         # Get provider configuration
         provider_config = self._get_provider_config(provider_id)
         model_config = self._get_model_config(model_id)
@@ -228,22 +994,12 @@ class LangChainTranslator:
             max_tokens = model_config.get("max_tokens", max_tokens)
         
         # Initialize the appropriate LLM based on provider
-        if provider_id.lower() == "openai":
-            # Handle both Pydantic objects and dictionaries
-            if hasattr(provider_config, 'api_key'):
-                api_key = provider_config.api_key
-                base_url = getattr(provider_config, 'base_url', None)
-            elif isinstance(provider_config, dict):
-                api_key = provider_config.get("api_key", "")
-                base_url = provider_config.get("base_url", None)
-            else:
-                api_key = ""
-                base_url = None
-            
-            api_key = api_key or os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise ValueError(f"OpenAI API key not found for provider {provider_id}")
-            
+        is_openai = provider_id.lower() == "openai"
+        api_key = provider_config.get("api_key") or os.getenv("OPENAI_API_KEY" if is_openai else "ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError(f"{'OpenAI' if is_openai else 'Anthropic'} API key not found for provider {provider_id}")
+        
+        if is_openai:
             # Initialize ChatOpenAI with base_url if provided (for Azure OpenAI)
             model_kwargs = {
                 "model": model_id,
@@ -252,23 +1008,12 @@ class LangChainTranslator:
                 "temperature": temperature
             }
             
+            base_url = provider_config.get("base_url")
             if base_url:
                 model_kwargs["base_url"] = base_url
             
             self.model = ChatOpenAI(**model_kwargs)
         else:  # Default to Anthropic
-            # Handle both Pydantic objects and dictionaries
-            if hasattr(provider_config, 'api_key'):
-                api_key = provider_config.api_key
-            elif isinstance(provider_config, dict):
-                api_key = provider_config.get("api_key", "")
-            else:
-                api_key = ""
-            
-            api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
-            if not api_key:
-                raise ValueError(f"Anthropic API key not found for provider {provider_id}")
-            
             self.model = ChatAnthropic(
                 model=model_id,
                 anthropic_api_key=api_key,
@@ -282,15 +1027,14 @@ class LangChainTranslator:
             return_messages=True
         )
         
-        # Create the system prompt template with current configuration
-        self.system_prompt = ChatPromptTemplate.from_messages([
-            ("system", self._get_system_prompt()),
-            MessagesPlaceholder(variable_name="translation_history"),
-            ("human", "{user_input}")
-        ])
+        # Batch calls must answer through the emit tool
+        self.batch_model = self.model.bind_tools([_EMIT_TOOL], tool_choice="emit")
         
-        # Create the translation chain
-        self.translation_chain = self.system_prompt | self.model | TranslationOutputParser()
+        # Render the system prompt once per configuration instead of per call
+        system_prompt = self._get_system_prompt()
+        self._system_msg = SystemMessage(content=system_prompt)
+        self._cache_namespace = TranslationCache.namespace(provider_id, model_id, system_prompt)
+        self.output_parser = TranslationOutputParser()
     
     def _get_system_prompt(self) -> str:
         """Get the system prompt from current configuration"""
@@ -369,10 +1113,12 @@ Remember: Your goal is to produce translations that are not only accurate but al
             translation_history = history.get("translation_history", [])
             
             # Execute translation
-            result = await self.translation_chain.ainvoke({
-                "user_input": user_input,
-                "translation_history": translation_history
-            })
+            response = await self.model.ainvoke([
+                self._system_msg,
+                *translation_history,
+                HumanMessage(content=user_input)
+            ])
+            result = self.output_parser.parse(response.content)
             
             # Update memory with this translation
             self.memory.save_context(
@@ -400,59 +1146,11 @@ Remember: Your goal is to produce translations that are not only accurate but al
     
     def _calculate_confidence_score(self, arabic_text: str, urdu_text: str) -> float:
         """Calculate confidence score for translation quality"""
-        score = 0.5  # Base score
-        
-        # Length similarity
-        arabic_length = len(arabic_text)
-        urdu_length = len(urdu_text)
-        if arabic_length > 0 and urdu_length > 0:
-            length_ratio = min(arabic_length, urdu_length) / max(arabic_length, urdu_length)
-            score += length_ratio * 0.2
-        
-        # Check for Urdu script
-        if any('\u0600' <= char <= '\u06FF' or '\u0750' <= char <= '\u077F' for char in urdu_text):
-            score += 0.2
-        
-        # Check for common Urdu words
-        urdu_indicators = ['ہے', 'ہیں', 'کیا', 'کا', 'کی', 'میں', 'پر', 'سے', 'کو', 'کے']
-        if any(word in urdu_text for word in urdu_indicators):
-            score += 0.1
-        
-        # Check for proper formatting
-        if urdu_text.strip() and not urdu_text.isspace():
-            score += 0.1
-        
-        return min(score, 1.0)
+        return calculate_confidence_score(arabic_text, urdu_text)
     
     def _calculate_quality_metrics(self, arabic_text: str, urdu_text: str) -> Dict:
         """Calculate detailed quality metrics"""
-        metrics = {
-            "length_ratio": len(urdu_text) / max(len(arabic_text), 1),
-            "has_urdu_script": any('\u0600' <= char <= '\u06FF' or '\u0750' <= char <= '\u077F' for char in urdu_text),
-            "has_numbers": any(char.isdigit() for char in urdu_text),
-            "has_punctuation": any(char in '،۔!؟' for char in urdu_text),
-            "word_count": len(urdu_text.split()),
-            "character_count": len(urdu_text),
-            "is_not_empty": bool(urdu_text.strip()),
-            "has_arabic_numerals": any(char in '٠١٢٣٤٥٦٧٨٩' for char in urdu_text)
-        }
-        
-        # Calculate overall quality score
-        quality_score = 0.0
-        if metrics["has_urdu_script"]:
-            quality_score += 0.3
-        if 0.5 <= metrics["length_ratio"] <= 2.0:
-            quality_score += 0.2
-        if metrics["has_punctuation"]:
-            quality_score += 0.1
-        if metrics["is_not_empty"]:
-            quality_score += 0.2
-        if metrics["word_count"] > 0:
-            quality_score += 0.2
-        
-        metrics["overall_quality_score"] = min(quality_score, 1.0)
-        
-        return metrics
+        return calculate_quality_metrics(arabic_text, urdu_text)
     
     async def translate_file(self, file_id: str, segments: List[Dict], use_existing_translations: bool = False) -> TranslationJob:
         """Translate a file using LLM with intelligent chunking"""
@@ -485,7 +1183,7 @@ Remember: Your goal is to produce translations that are not only accurate but al
         
         # Store job
         self.translation_jobs[job_id] = job
-        self.storage.save_jobs(self.translation_jobs)
+        self._schedule_save(job.job_id)
         
         # If using existing translations, populate segments and mark as completed
         if use_existing_translations:
@@ -501,37 +1199,48 @@ Remember: Your goal is to produce translations that are not only accurate but al
             job.completed_at = datetime.utcnow()
             job.average_confidence = 1.0
             job.average_quality_score = 1.0
+            job.init_running_sums()
             
             # Save updated job
-            self.storage.save_jobs(self.translation_jobs)
+            self._schedule_save(job.job_id)
             return job
         
         # Start background processing
-        asyncio.create_task(self._process_chunks(job))
+        task = asyncio.create_task(self._admit_job(job))
+        self._admissions.add(task)
+        task.add_done_callback(self._admissions.discard)
         
         return job
 
+    async def _admit_job(self, job: TranslationJob):
+        """Process a job once one of the in-flight job slots is free; inflight_jobs counts the holders"""
+        async with self.job_slots:
+            self.inflight_jobs += 1
+            try:
+                await self._process_chunks(job)
+            finally:
+                self.inflight_jobs -= 1
+    
     async def _process_chunks(self, job: TranslationJob):
         """Process translation chunks with intelligent batching"""
         try:
             job.status = "in_progress"
-            self.storage.save_jobs(self.translation_jobs)
+            self._schedule_save(job.job_id)
             
             # Create optimal chunks
             chunks = self._create_chunks(job.segments, chunk_size=3)
             
-            print(f"Processing {len(chunks)} chunks for job {job.job_id}")
-            
-            # Track if any chunks failed
-            any_chunks_failed = False
+            logger.info("Processing %d chunks for job %s", len(chunks), job.job_id)
             
-            # Process each chunk
-            for chunk_index, chunk in enumerate(chunks):
+            # Chunks are submitted concurrently; llm_semaphore bounds the calls in flight
+            async def run_chunk(chunk_index: int, chunk: List[TranslationSegment]) -> bool:
+                await self._check_rate_limit()
                 try:
-                    await self._process_single_chunk(chunk, job, chunk_index)
+                    await self.batch_collector.submit(chunk)
+                    ok = True
                 except Exception as e:
-                    print(f"Chunk {chunk_index + 1} failed: {str(e)}")
-                    any_chunks_failed = True
+                    logger.warning("Chunk %d failed: %s", chunk_index + 1, e)
+                    ok = False
                     # Mark segments in this chunk as failed
                     for segment in chunk:
                         segment.llm_translation = f"[Translation failed: {str(e)}]"
@@ -539,12 +1248,13 @@ Remember: Your goal is to produce translations that are not only accurate but al
                         segment.quality_metrics = {"overall_quality_score": 0.0}
                         segment.translation_time = 0.0
                 
-                # Update progress and save
-                job.completed_segments = sum(1 for s in job.segments if s.llm_translation is not None)
-                self.storage.save_jobs(self.translation_jobs)
-                
-                # Rate limiting
-                await self._check_rate_limit()
+                # Update progress and save; chunks are disjoint, so each counts once
+                job.completed_segments += len(chunk)
+                self._schedule_save(job.job_id)
+                return ok
+            
+            results = await asyncio.gather(*[run_chunk(i, chunk) for i, chunk in enumerate(chunks)])
+            any_chunks_failed = not all(results)
             
             # Calculate final metrics
             completed_segments = [s for s in job.segments if s.llm_translation is not None and not s.llm_translation.startswith("[Translation failed:")]
@@ -555,19 +1265,20 @@ Remember: Your goal is to produce translations that are not only accurate but al
             # Set final status based on whether any chunks failed
             if any_chunks_failed:
                 job.status = "failed"
-                print(f"Job {job.job_id} failed due to chunk processing errors")
+                logger.warning("Job %s failed due to chunk processing errors", job.job_id)
             else:
                 job.status = "completed"
-                print(f"Job {job.job_id} completed successfully")
+                logger.info("Job %s completed successfully", job.job_id)
             
             job.completed_at = datetime.utcnow()
-            self.storage.save_jobs(self.translation_jobs)
+            job.init_running_sums()
+            self._schedule_save(job.job_id)
             
         except Exception as e:
             job.status = "failed"
             job.completed_at = datetime.utcnow()
-            self.storage.save_jobs(self.translation_jobs)
-            print(f"Job {job.job_id} failed: {str(e)}")
+            self._schedule_save(job.job_id)
+            logger.error("Job %s failed: %s", job.job_id, e)
             raise
 
     def _create_chunks(self, segments: List[TranslationSegment], chunk_size: int) -> List[List[TranslationSegment]]:
@@ -593,8 +1304,7 @@ Remember: Your goal is to produce translations that are not only accurate but al
         total_chars = 0
         
         # System prompt size (approximate)
-        system_prompt = self._get_system_prompt()
-        total_chars += len(system_prompt)
+        total_chars += len(self._system_msg.content)
         
         # Batch prompt size
         batch_prompt = self._create_batch_prompt(segments)
@@ -614,39 +1324,69 @@ Remember: Your goal is to produce translations that are not only accurate but al
         mid = len(chunk) // 2
         return [chunk[:mid], chunk[mid:]]
 
-    async def _process_single_chunk(self, chunk: List[TranslationSegment], job: TranslationJob, chunk_index: int):
+    async def _process_single_chunk(self, chunk: List[TranslationSegment], job: Optional[TranslationJob], chunk_index: int):
         """Process a single chunk of segments with improved batch processing"""
         try:
-            print(f"Processing chunk {chunk_index + 1} with {len(chunk)} segments")
+            logger.debug("Processing chunk %d with %d segments", chunk_index + 1, len(chunk))
+            cache_namespace = self._cache_namespace
+            
+            # Serve repeated segments from the translation cache, only the rest go to the LLM
+            cached = await asyncio.to_thread(self.cache.get_many, [s.original_text for s in chunk], cache_namespace)
+            if cached:
+                hits = [s for s in chunk if s.original_text in cached]
+                pairs = [(s.original_text, cached[s.original_text]) for s in hits]
+                for segment, (confidence, metrics) in zip(hits, score_batch(pairs)):
+                    segment.llm_translation = cached[segment.original_text]
+                    segment.confidence_score = confidence
+                    segment.quality_metrics = metrics
+                    segment.translation_time = 0.0
+                logger.debug("%d segments served from translation cache", len(hits))
+                
+                chunk = [s for s in chunk if s.original_text not in cached]
+                if not chunk:
+                    return
             
             # Create batch prompt for this chunk
             batch_prompt = self._create_batch_prompt(chunk)
             
             # Make API call with retry logic
             start_time = datetime.now()
-            result = await self._translate_batch_with_retry(batch_prompt)
+            items = await self._translate_batch_with_retry(batch_prompt)
             end_time = datetime.now()
             
-            # Parse results with improved logic
-            translations = self._parse_batch_results_improved(result, chunk)
+            # Place each returned item by its id; missing ids stay empty
+            translations = [""] * len(chunk)
+            for item in items:
+                index = int(item.get("id", 0)) - 1
+                if 0 <= index < len(chunk):
+                    translations[index] = str(item.get("text", "")).strip()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Expected %d segments, received %d translation items", len(chunk), len(items))
             
             total_time = (end_time - start_time).total_seconds()
             time_per_segment = total_time / len(chunk)
             
+            # Scoring a chunk takes microseconds, cheaper inline than a process pool round trip
+            pairs = [(segment.original_text, translation) for segment, translation in zip(chunk, translations)]
+            scores = score_batch(pairs)
+            
             # Update segments in the job
-            for i, (segment, translation) in enumerate(zip(chunk, translations)):
+            for segment, translation, score in zip(chunk, translations, scores):
                 segment.llm_translation = translation
-                segment.confidence_score = self._calculate_confidence_score(segment.original_text, translation)
-                segment.quality_metrics = self._calculate_quality_metrics(segment.original_text, translation)
+                segment.confidence_score, segment.quality_metrics = score
                 segment.translation_time = time_per_segment
                 
-                print(f"Segment {segment.segment_id} translated: {translation[:50]}...")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Segment %s translated: %s...", segment.segment_id, translation[:50])
             
-            # Record successful request
-            self._record_request()
+            await asyncio.to_thread(
+                self.cache.put_many,
+                [(s.original_text, s.llm_translation) for s in chunk if s.llm_translation],
+                cache_namespace
+            )
             
         except Exception as e:
-            print(f"Chunk processing failed: {str(e)}")
+            logger.warning("Chunk processing failed: %s", e)
             # Mark segments as failed
             for segment in chunk:
                 segment.llm_translation = f"[Translation failed: {str(e)}]"
@@ -656,22 +1396,25 @@ Remember: Your goal is to produce translations that are not only accurate but al
             # Re-raise the exception to trigger any_chunks_failed
             raise e
 
-    async def _translate_batch_with_retry(self, batch_prompt: str, max_retries: int = 3) -> str:
-        """Translate batch with intelligent retry logic for rate limiting"""
+    async def _translate_batch_with_retry(self, batch_prompt: str, max_retries: int = 3) -> List[Dict]:
+        """Translate batch with intelligent retry logic for rate limiting
+        
+        Returns the ``{"id", "text"}`` items from the model's emit tool call.
+        """
         for attempt in range(max_retries):
             try:
-                response = await asyncio.to_thread(
-                    self.model.invoke,
-                    batch_prompt
-                )
-                return response.content
+                async with self.llm_semaphore:
+                    response = await self.batch_model.ainvoke(batch_prompt)
+                if not response.tool_calls:
+                    raise Exception("Model did not return structured translations")
+                return response.tool_calls[0]["args"].get("translations", [])
                 
             except Exception as e:
                 error_str = str(e)
                 if "rate_limit_error" in error_str or "429" in error_str:
                     if attempt < max_retries - 1:
                         wait_time = self.retry_delay * (attempt + 1)  # Exponential backoff
-                        print(f"Rate limit hit, waiting {wait_time} seconds before retry {attempt + 1}")
+                        logger.warning("Rate limit hit, waiting %s seconds before retry %d", wait_time, attempt + 1)
                         await asyncio.sleep(wait_time)
                         continue
                     else:
@@ -680,22 +1423,24 @@ Remember: Your goal is to produce translations that are not only accurate but al
                     raise e
 
     async def _check_rate_limit(self):
-        """Check if we're approaching rate limits and wait if necessary"""
-        current_time = time.time()
+        """Wait for room under the per-minute limit and record the request
         
-        # Remove timestamps older than 1 minute
-        self.request_timestamps = [ts for ts in self.request_timestamps if current_time - ts < 60]
-        
-        # If we've made too many requests recently, wait
-        if len(self.request_timestamps) >= self.max_requests_per_minute:
-            wait_time = 60 - (current_time - self.request_timestamps[0])
-            if wait_time > 0:
-                print(f"Rate limit approaching, waiting {wait_time:.1f} seconds")
+        Check and record happen under one lock, so concurrent chunks cannot all
+        see the same free slot.
+        """
+        async with self._rate_limit_lock:
+            while True:
+                current_time = time.time()
+                
+                # Remove timestamps older than 1 minute
+                self.request_timestamps = [ts for ts in self.request_timestamps if current_time - ts < 60]
+                if len(self.request_timestamps) < self.max_requests_per_minute:
+                    break
+                
+                wait_time = 60 - (current_time - self.request_timestamps[0])
+                logger.info("Rate limit approaching, waiting %.1f seconds", wait_time)
                 await asyncio.sleep(wait_time)
-
-    def _record_request(self):
-        """Record a successful API request for rate limiting"""
-        self.request_timestamps.append(time.time())
+            self.request_timestamps.append(current_time)
 
     def _create_batch_prompt(self, segments: List[TranslationSegment]) -> str:
         """Create an optimized batch prompt for segments"""
@@ -703,169 +1448,47 @@ Remember: Your goal is to produce translations that are not only accurate but al
             # Single segment - use detailed prompt
             return f"""Please translate the following Arabic text to Urdu:
 
-Arabic text: {segments[0].original_text}
-
-Provide only the Urdu translation:"""
-        
-        else:
-            # Multiple segments - use compact format
-            prompt = "Translate these Arabic texts to Urdu. Provide each translation on a new line:\n\n"
-            
-            for i, segment in enumerate(segments, 1):
-                prompt += f"{i}. {segment.original_text}\n"
-            
-            prompt += "\nTranslations:"
-            return prompt
-    
-    def _parse_batch_results(self, result: str, segments: List[TranslationSegment]) -> List[str]:
-        """Parse the batch translation results with improved error handling"""
-        lines = [line.strip() for line in result.strip().split('\n') if line.strip()]
-        translations = []
-        
-        # Filter out non-translation lines (like explanations, notes, etc.)
-        translation_lines = []
-        for line in lines:
-            # Skip lines that are clearly not translations
-            if any(skip_word in line.lower() for skip_word in ['translation', 'note', 'explanation', 'comment']):
-                continue
-            # Skip lines that are just numbers or punctuation
-            if line.isdigit() or line in ['', '.', ',', ';', ':']:
-                continue
-            translation_lines.append(line)
-        
-        print(f"Parsing {len(segments)} segments from {len(translation_lines)} translation lines")
-        print(f"Translation lines: {translation_lines}")
-        
-        for i, segment in enumerate(segments):
-            if i < len(translation_lines):
-                # Extract translation from line (remove numbering if present)
-                line = translation_lines[i]
-                if line and line[0].isdigit() and '.' in line:
-                    # Remove "1. " format
-                    translation = line.split('.', 1)[1].strip()
-                else:
-                    translation = line
-                translations.append(translation)
-            else:
-                # Fallback if not enough lines
-                print(f"Warning: No translation line found for segment {i+1}")
-                translations.append("")
-        
-        return translations
+1. {segments[0].original_text}
 
-    def _parse_batch_results_improved(self, result: str, segments: List[TranslationSegment]) -> List[str]:
-        """Improved batch parsing with better alignment and fallback logic"""
-        lines = [line.strip() for line in result.strip().split('\n') if line.strip()]
-        translations = []
+Return the Urdu translation with the emit tool, using id 1."""
         
-        print(f"Raw result lines: {lines}")
-        
-        # Filter out non-translation lines
-        translation_lines = []
-        for line in lines:
-            # Skip lines that are clearly not translations
-            if any(skip_word in line.lower() for skip_word in ['translation', 'note', 'explanation', 'comment', 'arabic', 'urdu']):
-                continue
-            # Skip lines that are just numbers or punctuation
-            if line.isdigit() or line in ['', '.', ',', ';', ':']:
-                continue
-            # Skip empty lines
-            if not line:
-                continue
-            translation_lines.append(line)
-        
-        print(f"Filtered translation lines: {translation_lines}")
-        print(f"Expected {len(segments)} segments, found {len(translation_lines)} translation lines")
-        
-        # If we have the right number of lines, use them directly
-        if len(translation_lines) == len(segments):
-            for i, line in enumerate(translation_lines):
-                # Remove numbering if present
-                if line and line[0].isdigit() and '.' in line:
-                    translation = line.split('.', 1)[1].strip()
-                else:
-                    translation = line
-                translations.append(translation)
-                print(f"Segment {i+1}: {translation[:50]}...")
-        
-        # If we have more lines than segments, try to match them intelligently
-        elif len(translation_lines) > len(segments):
-            print(f"More translation lines than segments, using first {len(segments)}")
-            for i in range(len(segments)):
-                if i < len(translation_lines):
-                    line = translation_lines[i]
-                    if line and line[0].isdigit() and '.' in line:
-                        translation = line.split('.', 1)[1].strip()
-                    else:
-                        translation = line
-                    translations.append(translation)
-                else:
-                    translations.append("")
-        
-        # If we have fewer lines than segments, fill the rest with empty strings
         else:
-            print(f"Fewer translation lines than segments, filling missing ones")
-            for i in range(len(segments)):
-                if i < len(translation_lines):
-                    line = translation_lines[i]
-                    if line and line[0].isdigit() and '.' in line:
-                        translation = line.split('.', 1)[1].strip()
-                    else:
-                        translation = line
-                    translations.append(translation)
-                else:
-                    print(f"Warning: No translation for segment {i+1}")
-                    translations.append("")
-        
-        return translations
+            # Multiple segments - use compact format, built with a single join
+            parts = ["Translate these Arabic texts to Urdu. Return every translation with the emit tool, using each text's number as its id:\n"]
+            parts.extend(f"{i}. {segment.original_text}" for i, segment in enumerate(segments, 1))
+            return "\n".join(parts)
     
     def get_job(self, job_id: str) -> Optional[TranslationJob]:
         """Get a translation job by ID"""
-        return self.translation_jobs.get(job_id)
+        job = self.translation_jobs.get(job_id)
+        if job is None:
+            job = self.storage.load_job(job_id)
+        return job
     
     def list_jobs(self) -> List[TranslationJob]:
         """List all translation jobs"""
-        return list(self.translation_jobs.values())
+        jobs = self.storage.load_jobs()
+        jobs.update(self.translation_jobs)
+        return list(jobs.values())
     
     def get_metrics(self) -> Dict:
         """Get translation metrics"""
-        jobs = self.list_jobs()
-        completed_jobs = [j for j in jobs if j.status in ["completed", "approved"]]
-        failed_jobs = [j for j in jobs if j.status == "failed"]
-        
-        # Calculate metrics only from successful segments
-        total_segments_translated = 0
-        total_confidence = 0
-        total_quality_score = 0
-        total_translation_time = 0
-        successful_segments_count = 0
-        
-        for job in completed_jobs:
-            for segment in job.segments:
-                # Only count segments that were successfully translated (not failed)
-                if (segment.llm_translation and 
-                    not segment.llm_translation.startswith("[Translation failed:") and
-                    segment.confidence_score is not None):
-                    total_segments_translated += 1
-                    total_confidence += segment.confidence_score
-                    if segment.quality_metrics and segment.quality_metrics.get("overall_quality_score"):
-                        total_quality_score += segment.quality_metrics["overall_quality_score"]
-                    if segment.translation_time:
-                        total_translation_time += segment.translation_time
-                    successful_segments_count += 1
-        
-        # Calculate averages
-        average_confidence = total_confidence / successful_segments_count if successful_segments_count > 0 else 0
-        average_quality_score = total_quality_score / successful_segments_count if successful_segments_count > 0 else 0
-        average_translation_time = total_translation_time / successful_segments_count if successful_segments_count > 0 else 0
+        # Counts and sums are aggregated in SQL so every worker reports the same numbers
+        status_counts = self.storage.status_counts()
+        successful_segments_count, confidence_sum, quality_sum, timed_count, time_sum = self.storage.completed_segment_totals()
+        
+        total_segments_translated = successful_segments_count
+        average_confidence = confidence_sum / successful_segments_count if successful_segments_count > 0 else 0
+        average_quality_score = quality_sum / successful_segments_count if successful_segments_count > 0 else 0
+        average_translation_time = time_sum / timed_count if timed_count > 0 else 0
         
         return {
-            "total_jobs": len(jobs),
-            "completed_jobs": len(completed_jobs),
-            "failed_jobs": len(failed_jobs),
+            "total_jobs": sum(status_counts.values()),
+            "completed_jobs": status_counts.get("completed", 0) + status_counts.get("approved", 0),
+            "failed_jobs": status_counts.get("failed", 0),
             "total_segments_translated": total_segments_translated,
             "average_confidence": average_confidence,
             "average_quality_score": average_quality_score,
             "average_translation_time": average_translation_time,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         } 
\ No newline at end of file
@@ -1,41 +1,55 @@
 import os
+import re
+import sys
 import asyncio
 import json
-from typing import List, Dict, Optional
+import logging
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import anthropic
+import httpx
 from pydantic import BaseModel
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
-class TranslationSegment(BaseModel):
-    segment_id: str
-    original_text: str
-    translated_text: Optional[str] = None
-    llm_translation: Optional[str] = None
-    confidence_score: Optional[float] = None
-    quality_metrics: Optional[Dict] = None
-    translation_time: Optional[float] = None
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; json is fast enough for small responses
+    _json_loads = json.loads
 
-class TranslationJob(BaseModel):
-    job_id: str
-    file_id: str
-    segments: List[TranslationSegment]
-    status: str = "pending"  # pending, in_progress, completed, failed
-    created_at: datetime
-    completed_at: Optional[datetime] = None
-    total_segments: int
-    completed_segments: int = 0
-    average_confidence: Optional[float] = None
-    average_quality_score: Optional[float] = None
+logger = logging.getLogger(__name__)
 
-class LLMTranslator:
-    def __init__(self):
-        self.client = anthropic.Anthropic(
-            api_key=os.getenv("ANTHROPIC_API_KEY")
-        )
-        self.model = "claude-3-haiku-20240307"
-        self.system_prompt = os.getenv(
-            "CLAUDE_SYSTEM_PROMPT", 
-            """You are a highly skilled translator specializing in Arabic to Urdu translation. Your task is to translate the given Arabic text into Urdu with 100% accuracy. This requires careful attention to detail, cultural nuances, and linguistic precision.
+_URDU_RE = re.compile(r"[\u0600-\u06FF\u0750-\u077F]")
+_DIGIT_RE = re.compile(r"\d")
+_PUNCT_SET = frozenset("،۔!؟")
+_NUM_PREFIX_RE = re.compile(r"^\s*(?:\d+[.):-]|-)\s*")
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+def _empty_result() -> Dict:
+    """Zero-cost result for an empty or whitespace-only segment (e.g. a silent ASR gap)"""
+    return {
+        "translated_text": "",
+        "confidence_score": 0.0,
+        "quality_metrics": {
+            "length_ratio": 0.0,
+            "has_urdu_script": False,
+            "has_numbers": False,
+            "has_punctuation": False,
+            "word_count": 0,
+            "character_count": 0,
+            "overall_quality_score": 0.0
+        },
+        "translation_time": 0.0
+    }
+
+_DEFAULT_SYSTEM_PROMPT = sys.intern("""You are a highly skilled translator specializing in Arabic to Urdu translation. Your task is to translate the given Arabic text into Urdu with 100% accuracy. This requires careful attention to detail, cultural nuances, and linguistic precision.
 
 To ensure 100% accuracy in your translation, follow these steps:
 
@@ -55,13 +69,130 @@ After completing your translation, review it once more for accuracy and naturaln
 
 Present your final Urdu translation within <urdu_translation> tags. If you have any notes or explanations about specific translation choices, include them after the translation within <translation_notes> tags.
 
-Remember, the goal is 100% accuracy in translating from Arabic to Urdu. Take your time and be as precise as possible in your translation."""
+Remember, the goal is 100% accuracy in translating from Arabic to Urdu. Take your time and be as precise as possible in your translation.""")
+
+class TranslationSegmentModel(BaseModel):
+    segment_id: str
+    original_text: str
+    translated_text: Optional[str] = None
+    llm_translation: Optional[str] = None
+    confidence_score: Optional[float] = None
+    quality_metrics: Optional[Dict] = None
+    translation_time: Optional[float] = None
+
+class TranslationJobModel(BaseModel):
+    job_id: str
+    file_id: str
+    segments: List[TranslationSegmentModel]
+    status: str = "pending"  # pending, in_progress, completed, failed
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    total_segments: int
+    completed_segments: int = 0
+    average_confidence: Optional[float] = None
+    average_quality_score: Optional[float] = None
+
+# Jobs are built once per file and mutated per segment, so the working objects are
+# slotted dataclasses; the Pydantic models above are only used at the HTTP boundary
+@dataclass(slots=True)
+class TranslationSegment:
+    segment_id: str
+    original_text: str
+    translated_text: Optional[str] = None
+    llm_translation: Optional[str] = None
+    confidence_score: Optional[float] = None
+    quality_metrics: Optional[Dict] = None
+    translation_time: Optional[float] = None
+    
+    def to_pydantic(self) -> TranslationSegmentModel:
+        return TranslationSegmentModel(
+            segment_id=self.segment_id,
+            original_text=self.original_text,
+            translated_text=self.translated_text,
+            llm_translation=self.llm_translation,
+            confidence_score=self.confidence_score,
+            quality_metrics=self.quality_metrics,
+            translation_time=self.translation_time
+        )
+
+@dataclass(slots=True)
+class TranslationJob:
+    job_id: str
+    file_id: str
+    segments: List[TranslationSegment]
+    created_at: datetime
+    total_segments: int
+    status: str = "pending"  # pending, in_progress, completed, failed
+    completed_at: Optional[datetime] = None
+    completed_segments: int = 0
+    average_confidence: Optional[float] = None
+    average_quality_score: Optional[float] = None
+    
+    def to_pydantic(self) -> TranslationJobModel:
+        return TranslationJobModel(
+            job_id=self.job_id,
+            file_id=self.file_id,
+            segments=[segment.to_pydantic() for segment in self.segments],
+            status=self.status,
+            created_at=self.created_at,
+            completed_at=self.completed_at,
+            total_segments=self.total_segments,
+            completed_segments=self.completed_segments,
+            average_confidence=self.average_confidence,
+            average_quality_score=self.average_quality_score
         )
+
+class LLMTranslator:
+    model = "claude-3-haiku-20240307"
+    max_tokens = 1000
+    
+    def __init__(self):
+        max_connections = int(os.getenv("CLAUDE_MAX_CONNECTIONS", "64"))
+        self.client = anthropic.AsyncAnthropic(
+            api_key=os.getenv("ANTHROPIC_API_KEY"),
+            max_retries=3,
+            timeout=60,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+            )
+        )
+        # Caps in-flight Claude requests. CLAUDE_MAX_CONCURRENCY is the hard cap; the
+        # effective limit follows the rate-limit headers and is checked before each request
+        self.max_concurrency = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "8"))
+        self.ratelimit_safety_margin = int(os.getenv("CLAUDE_RATELIMIT_SAFETY_MARGIN", "2"))
+        self._concurrency_target = self.max_concurrency
+        self._in_flight = 0
+        self._slot_available = asyncio.Condition()
+        self.system_prompt = os.getenv("CLAUDE_SYSTEM_PROMPT", _DEFAULT_SYSTEM_PROMPT)
         
-    async def translate_segment(self, arabic_text: str) -> Dict:
-        """Translate a single segment from Arabic to Urdu using Claude"""
+        # Translation cache: in-memory LRU in front of a persistent SQLite table
+        # (stored at, result) by key; queued rows are written within a second
+        self._cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._cache_max_size = int(os.getenv("TRANSLATION_CACHE_SIZE", "10000"))
+        self._cache_ttl = int(os.getenv("TRANSLATION_CACHE_TTL", str(30 * 24 * 3600)))  # seconds, 0 disables expiry
+        self._pending_cache_writes: List[tuple] = []
+        self._cache_flush_task: Optional[asyncio.Task] = None
+        cache_db = os.getenv("TRANSLATION_CACHE_DB", os.path.join(os.getenv("DATA_DIR", "/app/data"), "llm_translation_cache.db"))
+        os.makedirs(os.path.dirname(cache_db), exist_ok=True)
+        self._cache_lock = threading.Lock()
+        self._cache_db = sqlite3.connect(cache_db, check_same_thread=False)
+        self._cache_db.execute("PRAGMA journal_mode=WAL")
+        self._cache_db.execute("CREATE TABLE IF NOT EXISTS translation_cache (key BLOB PRIMARY KEY, json TEXT, ts INT)")
+        self._cache_db.commit()
+        
+        # Pack several short segments into one request (~800 Arabic chars is ~600 tokens)
+        self.use_packed_prompts = os.getenv("USE_PACKED_PROMPTS", "false").lower() == "true"
+        self.pack_max_chars = int(os.getenv("PACK_MAX_CHARS", "800"))
+        self.pack_max_items = int(os.getenv("PACK_MAX_ITEMS", "20"))
         
-        user_prompt = f"""Please translate the following Arabic text to Urdu. The translation should be:
+        # Message Batches API for large files (half price, provider-side scheduling)
+        self.use_batch_api = os.getenv("USE_BATCH_API", "false").lower() == "true"
+        self.batch_api_min_segments = int(os.getenv("BATCH_API_MIN_SEGMENTS", "50"))
+        self.batch_poll_interval = float(os.getenv("BATCH_POLL_INTERVAL", "30"))
+    
+    def _build_user_prompt(self, arabic_text: str) -> str:
+        """Build the user prompt for a single segment"""
+        return f"""Please translate the following Arabic text to Urdu. The translation should be:
         1. Accurate and faithful to the original meaning
         2. Natural and fluent in Urdu
         3. Appropriate for broadcast media
@@ -70,96 +201,345 @@ Remember, the goal is 100% accuracy in translating from Arabic to Urdu. Take you
         Arabic text: {arabic_text}
         
         Please provide your translation in Urdu script. Only provide the translation, no explanations."""
+    
+    def _cache_key(self, arabic_text: str) -> str:
+        """Key a translation by model and system prompt as well as the text"""
+        h = hashlib.blake2b(digest_size=16)
+        for part in (self.model, self.system_prompt, arabic_text):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+    
+    def _is_expired(self, stored_at: float) -> bool:
+        return bool(self._cache_ttl) and time.time() - stored_at > self._cache_ttl
+    
+    def _cache_get_memory(self, key: str) -> Optional[Dict]:
+        """Look up a cached translation result in the in-memory LRU"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if self._is_expired(entry[0]):
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return dict(entry[1])
+    
+    def _cache_load(self, keys: List[str]) -> Dict[str, Tuple[float, Dict]]:
+        """Read unexpired cache rows from SQLite (runs in a worker thread)"""
+        placeholders = ",".join("?" * len(keys))
+        oldest = time.time() - self._cache_ttl if self._cache_ttl else 0
+        with self._cache_lock:
+            rows = self._cache_db.execute(
+                f"SELECT key, json, ts FROM translation_cache WHERE key IN ({placeholders}) AND ts >= ?",
+                [*keys, oldest]
+            ).fetchall()
+        return {key: (ts, json.loads(data)) for key, data, ts in rows}
+    
+    async def _cache_get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Look up cached translation results, memory first then SQLite"""
+        found = {}
+        misses = []
+        for key in keys:
+            cached = self._cache_get_memory(key)
+            if cached is not None:
+                found[key] = cached
+            else:
+                misses.append(key)
+        if misses:
+            for key, (stored_at, result) in (await asyncio.to_thread(self._cache_load, misses)).items():
+                self._cache_put(key, result, persist=False, stored_at=stored_at)
+                found[key] = dict(result)
+        return found
+    
+    def _cache_put(self, key: str, result: Dict, persist: bool = True, stored_at: Optional[float] = None):
+        """Insert into the in-memory LRU and queue the row for the next flush"""
+        stored_at = time.time() if stored_at is None else stored_at
+        self._cache[key] = (stored_at, result)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_max_size:
+            self._cache.popitem(last=False)
+        if persist:
+            self._pending_cache_writes.append((key, json.dumps(result, ensure_ascii=False), int(stored_at)))
+            if self._cache_flush_task is None or self._cache_flush_task.done():
+                self._cache_flush_task = asyncio.create_task(self._flush_cache_later())
+    
+    async def _flush_cache_later(self):
+        """Write queued cache rows after a short delay so nearby puts share one commit"""
+        await asyncio.sleep(1.0)
+        await asyncio.to_thread(self._flush_cache)
+    
+    async def aclose(self):
+        """Write queued cache rows, then close the HTTP client and the cache database"""
+        if self._cache_flush_task is not None:
+            self._cache_flush_task.cancel()
+            self._cache_flush_task = None
+        await asyncio.to_thread(self._flush_cache)
+        await self.client.close()
+        with self._cache_lock:
+            self._cache_db.close()
+    
+    def _flush_cache(self):
+        """Persist queued cache rows in a single batch"""
+        rows, self._pending_cache_writes = self._pending_cache_writes, []
+        if not rows:
+            return
+        try:
+            with self._cache_lock:
+                self._cache_db.executemany(
+                    "INSERT OR REPLACE INTO translation_cache (key, json, ts) VALUES (?, ?, ?)",
+                    rows
+                )
+                if self._cache_ttl:
+                    self._cache_db.execute("DELETE FROM translation_cache WHERE ts < ?", (int(time.time()) - self._cache_ttl,))
+                self._cache_db.commit()
+        except Exception as e:
+            logger.warning("Error writing translation cache: %s", e)
+    
+    async def translate_segment(self, arabic_text: str) -> Dict:
+        """Translate a single segment from Arabic to Urdu using Claude"""
+        
+        if not arabic_text or arabic_text.isspace():
+            return _empty_result()
+        
+        key = self._cache_key(arabic_text)
+        cached = (await self._cache_get_many([key])).get(key)
+        if cached is not None:
+            return cached
+        
+        user_prompt = self._build_user_prompt(arabic_text)
         
         try:
-            start_time = datetime.now()
+            start_time = time.perf_counter()
             
-            response = await asyncio.to_thread(
-                self.client.messages.create,
+            response = await self._create_message(
                 model=self.model,
-                max_tokens=1000,
+                max_tokens=self.max_tokens,
                 system=self.system_prompt,
                 messages=[
                     {"role": "user", "content": user_prompt}
                 ]
             )
             
-            end_time = datetime.now()
-            translation_time = (end_time - start_time).total_seconds()
+            translation_time = time.perf_counter() - start_time
             
             translated_text = response.content[0].text.strip()
             
-            # Calculate confidence score (simplified - in production you'd use more sophisticated metrics)
-            confidence_score = self._calculate_confidence_score(arabic_text, translated_text)
+            # Calculate confidence score and quality metrics
+            confidence_score, quality_metrics = self._score_and_metrics(arabic_text, translated_text)
             
-            # Calculate quality metrics
-            quality_metrics = self._calculate_quality_metrics(arabic_text, translated_text)
-            
-            return {
+            result = {
                 "translated_text": translated_text,
                 "confidence_score": confidence_score,
                 "quality_metrics": quality_metrics,
                 "translation_time": translation_time
             }
+            self._cache_put(key, result)
+            return dict(result)
             
         except Exception as e:
             raise Exception(f"Translation failed: {str(e)}")
     
-    def _calculate_confidence_score(self, arabic_text: str, urdu_text: str) -> float:
-        """Calculate confidence score for translation quality"""
-        # Simple heuristic-based confidence scoring
-        # In production, you'd use more sophisticated NLP metrics
+    def _build_packed_prompt(self, texts: List[str]) -> str:
+        """Build the user prompt for several segments answered as one JSON object"""
+        items = json.dumps([{"id": i, "ar": text} for i, text in enumerate(texts)], ensure_ascii=False)
+        return (
+            "Translate each item from Arabic to Urdu. Return only JSON of the form "
+            '{"items":[{"id":0,"urdu":"..."}, ...]} with one entry per item, no explanations.\n'
+            + items
+        )
+    
+    def _parse_packed_response(self, text: str, count: int) -> List[str]:
+        """Extract per-item translations, falling back to one translation per line"""
+        translations = [""] * count
+        try:
+            match = _JSON_OBJECT_RE.search(text)
+            for item in _json_loads(match.group(0) if match else text)["items"]:
+                item_id = int(item["id"])
+                if 0 <= item_id < count:
+                    translations[item_id] = str(item["urdu"]).strip()
+            return translations
+        except (ValueError, KeyError, TypeError):
+            logger.debug("Packed response was not valid JSON, parsing lines instead")
+        
+        lines = [_NUM_PREFIX_RE.sub("", line).strip() for line in text.splitlines()]
+        lines = [line for line in lines if line]
+        for i, line in enumerate(lines[:count]):
+            translations[i] = line
+        return translations
+    
+    def _pack(self, texts: List[str]) -> List[List[int]]:
+        """Group text indices into packs bounded by character budget and item count"""
+        packs: List[List[int]] = []
+        current: List[int] = []
+        chars = 0
+        for i, text in enumerate(texts):
+            if current and (chars + len(text) > self.pack_max_chars or len(current) >= self.pack_max_items):
+                packs.append(current)
+                current, chars = [], 0
+            current.append(i)
+            chars += len(text)
+        if current:
+            packs.append(current)
+        return packs
+    
+    async def _translate_pack(self, texts: List[str]) -> List[Dict]:
+        """Translate one pack of segments with a single Claude call"""
+        start_time = time.perf_counter()
+        response = await self._create_message(
+            model=self.model,
+            max_tokens=4000,
+            system=self.system_prompt,
+            messages=[
+                {"role": "user", "content": self._build_packed_prompt(texts)}
+            ]
+        )
+        elapsed = time.perf_counter() - start_time
+        # One request serves the whole pack, so spread its time across the items
+        translation_time = elapsed / len(texts)
         
-        score = 0.5  # Base score
+        results = []
+        for arabic_text, translated_text in zip(texts, self._parse_packed_response(response.content[0].text, len(texts))):
+            confidence_score, quality_metrics = self._score_and_metrics(arabic_text, translated_text)
+            results.append({
+                "translated_text": translated_text,
+                "confidence_score": confidence_score,
+                "quality_metrics": quality_metrics,
+                "translation_time": translation_time
+            })
+        return results
+    
+    async def translate_segments_packed(self, texts: List[str]) -> List:
+        """Translate many segments, packing several per Claude call
         
-        # Length similarity
-        arabic_length = len(arabic_text)
-        urdu_length = len(urdu_text)
-        if arabic_length > 0 and urdu_length > 0:
-            length_ratio = min(arabic_length, urdu_length) / max(arabic_length, urdu_length)
-            score += length_ratio * 0.2
+        Returns one entry per text: a result dict as from translate_segment, or
+        the exception raised for the pack that contained it.
+        """
+        results: List = [None] * len(texts)
+        keys = [self._cache_key(text) for text in texts]
+        cached = await self._cache_get_many(keys)
+        pending = []
+        for i, key in enumerate(keys):
+            if not texts[i] or texts[i].isspace():
+                results[i] = _empty_result()
+            elif key in cached:
+                results[i] = dict(cached[key])
+            else:
+                pending.append(i)
         
-        # Check for common translation patterns
-        if any(word in urdu_text.lower() for word in ['ہے', 'ہیں', 'کیا', 'کا', 'کی']):
-            score += 0.1
+        pending_texts = [texts[i] for i in pending]
+        packs = [[pending[j] for j in pack] for pack in self._pack(pending_texts)]
+        pack_results = await asyncio.gather(
+            *[self._translate_pack([texts[i] for i in pack]) for pack in packs],
+            return_exceptions=True
+        )
         
-        # Check for Arabic numerals or common patterns
-        if any(char.isdigit() for char in urdu_text):
-            score += 0.1
+        for pack, pack_result in zip(packs, pack_results):
+            for offset, i in enumerate(pack):
+                if isinstance(pack_result, Exception):
+                    results[i] = Exception(f"Translation failed: {str(pack_result)}")
+                    continue
+                result = pack_result[offset]
+                if result["translated_text"]:
+                    self._cache_put(keys[i], result)
+                results[i] = dict(result)
         
-        return min(score, 1.0)
+        return results
     
-    def _calculate_quality_metrics(self, arabic_text: str, urdu_text: str) -> Dict:
-        """Calculate detailed quality metrics"""
-        metrics = {
-            "length_ratio": len(urdu_text) / max(len(arabic_text), 1),
-            "has_urdu_script": any('\u0600' <= char <= '\u06FF' or '\u0750' <= char <= '\u077F' for char in urdu_text),
-            "has_numbers": any(char.isdigit() for char in urdu_text),
-            "has_punctuation": any(char in '،۔!؟' for char in urdu_text),
-            "word_count": len(urdu_text.split()),
-            "character_count": len(urdu_text)
-        }
+    @retry(
+        retry=retry_if_exception_type(anthropic.RateLimitError),
+        wait=wait_exponential(multiplier=1, max=30),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def _create_message(self, **kwargs):
+        """Call the Claude messages API, retrying on rate limit errors
         
-        # Calculate overall quality score
+        The slot is held only for the request itself, so backoff sleeps do not
+        count against the concurrency limit. The client's own retries are off
+        here, tenacity is the single retry layer for rate limits.
+        """
+        async with self._request_slot():
+            try:
+                raw = await self.client.with_options(max_retries=0).messages.with_raw_response.create(**kwargs)
+            except anthropic.RateLimitError:
+                self._concurrency_target = max(1, self._concurrency_target // 2)
+                raise
+        self._observe_rate_limit(raw.headers)
+        return raw.parse()
+    
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Wait until fewer than _concurrency_target requests are in flight"""
+        async with self._slot_available:
+            await self._slot_available.wait_for(lambda: self._in_flight < self._concurrency_target)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._slot_available:
+                self._in_flight -= 1
+                self._slot_available.notify_all()
+    
+    def _observe_rate_limit(self, headers):
+        """Derive the concurrency target from the remaining request budget"""
+        remaining = headers.get("anthropic-ratelimit-requests-remaining")
+        if remaining is None:
+            return
+        try:
+            target = int(remaining) // self.ratelimit_safety_margin
+        except ValueError:
+            return
+        # Waiters re-check the new target when the next request releases its slot
+        self._concurrency_target = max(1, min(self.max_concurrency, target))
+    
+    def _score_and_metrics(self, arabic_text: str, urdu_text: str) -> Tuple[float, Dict]:
+        """Calculate the confidence score and detailed quality metrics in one pass"""
+        # Simple heuristic-based scoring
+        # In production, you'd use more sophisticated NLP metrics
+        arabic_length = len(arabic_text)
+        urdu_length = len(urdu_text)
+        word_count = len(urdu_text.split())
+        has_urdu_script = _URDU_RE.search(urdu_text) is not None
+        has_numbers = _DIGIT_RE.search(urdu_text) is not None
+        has_punctuation = not _PUNCT_SET.isdisjoint(urdu_text)
+        length_ratio = urdu_length / max(arabic_length, 1)
+        
+        # Confidence: base score plus length similarity and common translation patterns
+        confidence = 0.5
+        if arabic_length > 0 and urdu_length > 0:
+            confidence += min(arabic_length, urdu_length) / max(arabic_length, urdu_length) * 0.2
+        if any(word in urdu_text.lower() for word in ['ہے', 'ہیں', 'کیا', 'کا', 'کی']):
+            confidence += 0.1
+        if has_numbers:
+            confidence += 0.1
+        
+        # Overall quality score
         quality_score = 0.0
-        if metrics["has_urdu_script"]:
+        if has_urdu_script:
             quality_score += 0.3
-        if 0.5 <= metrics["length_ratio"] <= 2.0:
+        if 0.5 <= length_ratio <= 2.0:
             quality_score += 0.2
-        if metrics["has_punctuation"]:
+        if has_punctuation:
             quality_score += 0.1
-        if metrics["word_count"] > 0:
+        if word_count > 0:
             quality_score += 0.2
-        if metrics["has_numbers"]:
+        if has_numbers:
             quality_score += 0.1
         
-        metrics["overall_quality_score"] = min(quality_score, 1.0)
+        metrics = {
+            "length_ratio": length_ratio,
+            "has_urdu_script": has_urdu_script,
+            "has_numbers": has_numbers,
+            "has_punctuation": has_punctuation,
+            "word_count": word_count,
+            "character_count": urdu_length,
+            "overall_quality_score": min(quality_score, 1.0)
+        }
         
-        return metrics
+        return min(confidence, 1.0), metrics
     
-    async def translate_file(self, file_id: str, segments: List[Dict]) -> TranslationJob:
-        """Translate an entire file with multiple segments"""
-        
+    def _create_job(self, file_id: str, segments: List[Dict]) -> TranslationJob:
+        """Create an in-progress job for the given segments"""
         job_id = f"llm_job_{file_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         translation_segments = []
@@ -176,37 +556,128 @@ Remember, the goal is 100% accuracy in translating from Arabic to Urdu. Take you
             total_segments=len(translation_segments),
             created_at=datetime.now()
         )
+        job.status = "in_progress"
+        return job
+    
+    def _complete_job(self, job: TranslationJob) -> TranslationJob:
+        """Calculate job-level metrics and mark the job completed"""
+        if job.completed_segments > 0:
+            job.average_confidence = sum(s.confidence_score or 0 for s in job.segments) / job.completed_segments
+            job.average_quality_score = sum(s.quality_metrics.get("overall_quality_score", 0) for s in job.segments) / job.completed_segments
+        
+        job.status = "completed"
+        job.completed_at = datetime.now()
+        
+        return job
+    
+    async def translate_file(self, file_id: str, segments: List[Dict]) -> TranslationJob:
+        """Translate an entire file with multiple segments"""
+        
+        if self.use_batch_api and len(segments) >= self.batch_api_min_segments:
+            return await self.translate_file_batch(file_id, segments)
+        
+        job = self._create_job(file_id, segments)
         
         # Process segments
-        job.status = "in_progress"
+        if self.use_packed_prompts:
+            results = await self.translate_segments_packed([segment.original_text for segment in job.segments])
+        else:
+            results = await asyncio.gather(
+                *[self.translate_segment(segment.original_text) for segment in job.segments],
+                return_exceptions=True
+            )
+        await asyncio.to_thread(self._flush_cache)
         
-        for i, segment in enumerate(job.segments):
-            try:
-                result = await self.translate_segment(segment.original_text)
-                
+        for i, (segment, result) in enumerate(zip(job.segments, results)):
+            if isinstance(result, Exception):
+                logger.warning("Error translating segment %d: %s", i, result)
+                continue
+            
+            segment.llm_translation = result["translated_text"]
+            segment.confidence_score = result["confidence_score"]
+            segment.quality_metrics = result["quality_metrics"]
+            segment.translation_time = result["translation_time"]
+            
+            job.completed_segments += 1
+        
+        return self._complete_job(job)
+    
+    async def translate_file_batch(self, file_id: str, segments: List[Dict]) -> TranslationJob:
+        """Translate an entire file as a single Anthropic Message Batches job"""
+        
+        job = self._create_job(file_id, segments)
+        start_time = time.perf_counter()
+        
+        # Empty segments need no request, resolve them up front
+        for segment in job.segments:
+            if not segment.original_text or segment.original_text.isspace():
+                result = _empty_result()
                 segment.llm_translation = result["translated_text"]
                 segment.confidence_score = result["confidence_score"]
                 segment.quality_metrics = result["quality_metrics"]
                 segment.translation_time = result["translation_time"]
-                
                 job.completed_segments += 1
-                
-                # Update progress
-                await asyncio.sleep(0.1)  # Small delay to prevent rate limiting
-                
-            except Exception as e:
-                print(f"Error translating segment {i}: {e}")
-                continue
         
-        # Calculate job-level metrics
-        if job.completed_segments > 0:
-            job.average_confidence = sum(s.confidence_score or 0 for s in job.segments) / job.completed_segments
-            job.average_quality_score = sum(s.quality_metrics.get("overall_quality_score", 0) for s in job.segments) / job.completed_segments
+        if job.completed_segments == len(job.segments):
+            return self._complete_job(job)
         
-        job.status = "completed"
-        job.completed_at = datetime.now()
+        # Segment IDs are not guaranteed unique, so map results back by position
+        batch = await self.client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": f"seg_{i}",
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": self.max_tokens,
+                        "system": self.system_prompt,
+                        "messages": [
+                            {"role": "user", "content": self._build_user_prompt(segment.original_text)}
+                        ]
+                    }
+                }
+                for i, segment in enumerate(job.segments)
+                if segment.original_text and not segment.original_text.isspace()
+            ]
+        )
         
-        return job
+        while batch.processing_status != "ended":
+            await asyncio.sleep(self.batch_poll_interval)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+        
+        results = [entry async for entry in await self.client.messages.batches.results(batch.id)]
+        
+        # The batch gives no per-request timing, so spread the wall time evenly
+        translation_time = (time.perf_counter() - start_time) / max(len(job.segments), 1)
+        
+        for entry in results:
+            segment = job.segments[int(entry.custom_id.split("_", 1)[1])]
+            if entry.result.type != "succeeded":
+                logger.warning("Error translating segment %s: %s", segment.segment_id, entry.result.type)
+                continue
+            
+            translated_text = entry.result.message.content[0].text.strip()
+            segment.llm_translation = translated_text
+            segment.confidence_score, segment.quality_metrics = self._score_and_metrics(segment.original_text, translated_text)
+            segment.translation_time = translation_time
+            
+            job.completed_segments += 1
+        
+        return self._complete_job(job)
+
+# Shared translator, built on first use so importing this module opens no files or connections
+_llm_translator: Optional[LLMTranslator] = None
+
+def get_llm_translator() -> LLMTranslator:
+    """The shared translator, created on first call"""
+    global _llm_translator
+    if _llm_translator is None:
+        _llm_translator = LLMTranslator()
+    return _llm_translator
 
-# Global translator instance
-llm_translator = LLMTranslator() 
\ No newline at end of file
+async def close_llm_translator():
+    """Close the shared translator if it was ever created"""
+    global _llm_translator
+    if _llm_translator is not None:
+        await _llm_translator.aclose()
+        _llm_translator = None
+ 
\ No newline at end of file
@@ -1,22 +1,68 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Sequence, Set, Tuple
 import os
+import asyncio
 import uuid
+import zlib
+from collections import deque
+from itertools import islice
 import json
 import logging
+import logging.handlers
+import queue
+import sqlite3
+import threading
+import time
+import httpx
+import orjson
 
 from models import TranslationReviewRequest, ReviewResponse, ReviewStatus
 from translator import ReviewEngine
-from langchain_translator import LangChainTranslator
-from pydantic import BaseModel
+from langchain_translator import LangChainTranslator, JobStore, JobSummary, JobVersionConflict, TranslationSegment, JOB_STATUS_GROUPS
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from cachetools import LRUCache, TTLCache
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: handlers only enqueue records, a listener thread formats and writes them
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+_log_listener.start()
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)])
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Translation Review Service", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background tasks and shared clients, and tear them down on shutdown"""
+    # Job, config and metrics I/O all goes through asyncio.to_thread, sized here
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=int(os.getenv("THREAD_POOL_SIZE", "32")))
+    )
+    start_clock()
+    start_batch_collector()
+    open_storage_client(app)
+    start_metrics_refresher()
+    review_engine.start_workers()
+    yield
+    await review_engine.stop()
+    await stop_clock()
+    await stop_metrics_refresher()
+    await flush_pending_updates()
+    await app.state.http.aclose()
+    _log_listener.stop()
+
+app = FastAPI(
+    title="Translation Review Service",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 # CORS middleware
 app.add_middleware(
@@ -28,16 +74,54 @@ app.add_middleware(
 )
 
 # Configuration
+STORAGE_SERVICE_URL = os.getenv("STORAGE_SERVICE_URL", "http://storage-service:8004")
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/translation.db")
 MODEL_PATH = os.getenv("MODEL_PATH", "./models")
-CONFIG_FILE = "/app/data/llm_config.json"
+DATA_DIR = os.getenv("DATA_DIR", "/app/data")
+CONFIG_FILE = os.path.join(DATA_DIR, "llm_config.json")  # legacy location, imported once into SQLite
+LLM_CONFIG_LOG_CAP = int(os.getenv("LLM_CONFIG_LOG_CAP", "1000"))  # config change logs kept
 
 # Ensure directories exist
 os.makedirs("./data", exist_ok=True)
 os.makedirs(MODEL_PATH, exist_ok=True)
 
-def load_llm_config() -> Dict:
-    """Load LLM configuration from persistent storage"""
+# LLM configuration lives in the translation SQLite database (WAL mode) so it
+# survives restarts and is shared by every uvicorn worker. Each save bumps a
+# generation counter; a worker whose copy is older reloads before using it, and
+# saves only write the entries that changed, so workers never revert each other.
+CONFIG_DB_FILE = os.getenv("CONFIG_DB_FILE", os.path.join(DATA_DIR, "translation_jobs.db"))
+_CONFIG_SECTIONS = ("api_providers", "models", "system_prompts")
+_config_lock = threading.Lock()
+
+def _open_config_db() -> sqlite3.Connection:
+    """Open the config database and create its tables"""
+    os.makedirs(os.path.dirname(CONFIG_DB_FILE), exist_ok=True)
+    conn = sqlite3.connect(CONFIG_DB_FILE, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS current_config (key TEXT PRIMARY KEY, json TEXT);
+        CREATE TABLE IF NOT EXISTS api_providers (id TEXT PRIMARY KEY, json TEXT);
+        CREATE TABLE IF NOT EXISTS models (id TEXT PRIMARY KEY, json TEXT);
+        CREATE TABLE IF NOT EXISTS system_prompts (id TEXT PRIMARY KEY, json TEXT);
+        CREATE TABLE IF NOT EXISTS config_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, json TEXT);
+        CREATE TABLE IF NOT EXISTS config_meta (key TEXT PRIMARY KEY, value INTEGER);
+    """)
+    return conn
+
+_config_conn = _open_config_db()
+
+def _config_generation_locked() -> int:
+    row = _config_conn.execute("SELECT value FROM config_meta WHERE key = 'generation'").fetchone()
+    return row[0] if row else 0
+
+def read_config_generation() -> int:
+    """Generation of the stored configuration, bumped by every save"""
+    with _config_lock:
+        return _config_generation_locked()
+
+def _load_legacy_config_file() -> Optional[Dict]:
+    """Read the configuration from the old JSON file, if there is one"""
     try:
         if os.path.exists(CONFIG_FILE):
             with open(CONFIG_FILE, 'r') as f:
@@ -46,119 +130,104 @@ def load_llm_config() -> Dict:
                 # Convert string timestamps back to datetime objects and create Pydantic objects
                 for provider_id, provider in config.get("api_providers", {}).items():
                     if isinstance(provider, dict):
-                        # Convert datetime strings back to datetime objects
-                        if isinstance(provider.get("created_at"), str):
-                            provider["created_at"] = datetime.fromisoformat(provider["created_at"])
-                        if isinstance(provider.get("updated_at"), str):
-                            provider["updated_at"] = datetime.fromisoformat(provider["updated_at"])
-                        # Convert to APIProvider object
                         config["api_providers"][provider_id] = APIProvider(**provider)
                 
                 for model_id, model in config.get("models", {}).items():
                     if isinstance(model, dict):
-                        # Convert datetime strings back to datetime objects
-                        if isinstance(model.get("created_at"), str):
-                            model["created_at"] = datetime.fromisoformat(model["created_at"])
-                        if isinstance(model.get("updated_at"), str):
-                            model["updated_at"] = datetime.fromisoformat(model["updated_at"])
-                        # Convert to LLMModel object
                         config["models"][model_id] = LLMModel(**model)
                 
                 for prompt_name, prompt in config.get("system_prompts", {}).items():
                     if isinstance(prompt, dict):
-                        # Convert datetime strings back to datetime objects
-                        if isinstance(prompt.get("created_at"), str):
-                            prompt["created_at"] = datetime.fromisoformat(prompt["created_at"])
-                        if isinstance(prompt.get("updated_at"), str):
-                            prompt["updated_at"] = datetime.fromisoformat(prompt["updated_at"])
-                        # Convert to SystemPrompt object
                         config["system_prompts"][prompt_name] = SystemPrompt(**prompt)
                 
-                # Convert logs
-                logs = []
-                for log in config.get("logs", []):
-                    if isinstance(log, dict):
-                        # Convert datetime strings back to datetime objects
-                        if isinstance(log.get("timestamp"), str):
-                            log["timestamp"] = datetime.fromisoformat(log["timestamp"])
-                        # Convert to LLMConfigLog object
-                        logs.append(LLMConfigLog(**log))
-                config["logs"] = logs
-                
+                config["logs"] = deque(
+                    (LLMConfigLog(**log) for log in config.get("logs", []) if isinstance(log, dict)),
+                    maxlen=LLM_CONFIG_LOG_CAP
+                )
                 return config
     except Exception as e:
-        logger.warning(f"Failed to load config from {CONFIG_FILE}: {e}")
+        logger.warning("Failed to load config from %s: %s", CONFIG_FILE, e)
+    return None
+
+def load_llm_config() -> Dict:
+    """Load LLM configuration from persistent storage"""
+    try:
+        with _config_lock:
+            current = {key: json.loads(value) for key, value in _config_conn.execute("SELECT key, json FROM current_config")}
+            if current:
+                sections = {
+                    section: dict(_config_conn.execute(f"SELECT id, json FROM {section}").fetchall())
+                    for section in _CONFIG_SECTIONS
+                }
+                logs = [row[0] for row in _config_conn.execute("SELECT json FROM config_logs ORDER BY id DESC LIMIT ?", (LLM_CONFIG_LOG_CAP,))]
+                return {
+                    "current_config": current,
+                    "api_providers": {k: APIProvider.model_validate_json(v) for k, v in sections["api_providers"].items()},
+                    "models": {k: LLMModel.model_validate_json(v) for k, v in sections["models"].items()},
+                    "system_prompts": {k: SystemPrompt.model_validate_json(v) for k, v in sections["system_prompts"].items()},
+                    "logs": deque((LLMConfigLog.model_validate_json(log) for log in reversed(logs)), maxlen=LLM_CONFIG_LOG_CAP)
+                }
+    except Exception as e:
+        logger.warning("Failed to load config from %s: %s", CONFIG_DB_FILE, e)
+        return get_default_config()
     
-    # Return default config if file doesn't exist or fails to load
-    return get_default_config()
+    # First start on this database: migrate the JSON file or fall back to defaults
+    config = _load_legacy_config_file() or get_default_config()
+    save_llm_config(config)
+    return config
 
-def save_llm_config(config: Dict):
-    """Save LLM configuration to persistent storage"""
+def save_llm_config(
+    config: Dict,
+    dirty: Optional[Dict[str, Set[str]]] = None,
+    new_logs: Sequence["LLMConfigLog"] = ()
+) -> Optional[Tuple[int, int]]:
+    """Save LLM configuration to persistent storage
+    
+    With ``dirty`` (keys per section, including ``current_config``) only those
+    entries and ``new_logs`` are written, leaving entries saved by other
+    workers alone; without it the whole config is written. Logs are trimmed
+    to the in-memory cap. Returns the (previous, new) generation, or None if
+    the save failed.
+    """
     try:
-        # Create a serializable copy of the config
-        config_copy = {}
-        
-        # Copy current_config
-        if "current_config" in config:
-            config_copy["current_config"] = config["current_config"]
-        
-        # Copy api_providers
-        config_copy["api_providers"] = {}
-        for provider_id, provider in config.get("api_providers", {}).items():
-            if hasattr(provider, 'dict'):
-                provider_dict = provider.dict()
-                # Convert datetime objects to strings
-                for key, value in provider_dict.items():
-                    if isinstance(value, datetime):
-                        provider_dict[key] = value.isoformat()
-                config_copy["api_providers"][provider_id] = provider_dict
-            else:
-                config_copy["api_providers"][provider_id] = provider
-        
-        # Copy models
-        config_copy["models"] = {}
-        for model_id, model in config.get("models", {}).items():
-            if hasattr(model, 'dict'):
-                model_dict = model.dict()
-                # Convert datetime objects to strings
-                for key, value in model_dict.items():
-                    if isinstance(value, datetime):
-                        model_dict[key] = value.isoformat()
-                config_copy["models"][model_id] = model_dict
-            else:
-                config_copy["models"][model_id] = model
-        
-        # Copy system_prompts
-        config_copy["system_prompts"] = {}
-        for prompt_name, prompt in config.get("system_prompts", {}).items():
-            if hasattr(prompt, 'dict'):
-                prompt_dict = prompt.dict()
-                # Convert datetime objects to strings
-                for key, value in prompt_dict.items():
-                    if isinstance(value, datetime):
-                        prompt_dict[key] = value.isoformat()
-                config_copy["system_prompts"][prompt_name] = prompt_dict
-            else:
-                config_copy["system_prompts"][prompt_name] = prompt
-        
-        # Copy logs
-        config_copy["logs"] = []
-        for log in config.get("logs", []):
-            if hasattr(log, 'dict'):
-                log_dict = log.dict()
-                # Convert datetime objects to strings
-                for key, value in log_dict.items():
-                    if isinstance(value, datetime):
-                        log_dict[key] = value.isoformat()
-                config_copy["logs"].append(log_dict)
-            else:
-                config_copy["logs"].append(log)
-        
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config_copy, f, indent=2)
-        logger.info(f"LLM configuration saved to {CONFIG_FILE}")
+        with _config_lock:
+            _config_conn.execute("BEGIN IMMEDIATE")
+            try:
+                previous = _config_generation_locked()
+                current = config.get("current_config", {})
+                current_keys = current.keys() if dirty is None else dirty.get("current_config", ())
+                _config_conn.executemany(
+                    "INSERT OR REPLACE INTO current_config (key, json) VALUES (?, ?)",
+                    [(key, json.dumps(current[key])) for key in current_keys]
+                )
+                for section in _CONFIG_SECTIONS:
+                    entries = config.get(section, {})
+                    keys = entries.keys() if dirty is None else dirty.get(section, ())
+                    _config_conn.executemany(
+                        f"INSERT OR REPLACE INTO {section} (id, json) VALUES (?, ?)",
+                        [(key, entries[key].model_dump_json()) for key in keys]
+                    )
+                if dirty is None:
+                    last = _config_conn.execute("SELECT json FROM config_logs ORDER BY id DESC LIMIT 1").fetchone()
+                    last_timestamp = LLMConfigLog.model_validate_json(last[0]).timestamp if last else None
+                    new_logs = [log for log in config.get("logs", ()) if last_timestamp is None or log.timestamp > last_timestamp]
+                _config_conn.executemany("INSERT INTO config_logs (json) VALUES (?)", [(log.model_dump_json(),) for log in new_logs])
+                _config_conn.execute(
+                    "DELETE FROM config_logs WHERE id <= (SELECT MAX(id) FROM config_logs) - ?",
+                    (LLM_CONFIG_LOG_CAP,)
+                )
+                _config_conn.execute(
+                    "INSERT OR REPLACE INTO config_meta (key, value) VALUES ('generation', ?)", (previous + 1,)
+                )
+                _config_conn.execute("COMMIT")
+            except Exception:
+                _config_conn.execute("ROLLBACK")
+                raise
+        logger.info("LLM configuration saved to %s", CONFIG_DB_FILE)
+        return previous, previous + 1
     except Exception as e:
-        logger.error(f"Failed to save config to {CONFIG_FILE}: {e}")
+        logger.error("Failed to save config to %s: %s", CONFIG_DB_FILE, e)
+        return None
 
 def get_default_config() -> Dict:
     """Get default LLM configuration"""
@@ -271,9 +340,10 @@ def get_default_config() -> Dict:
             "model": "claude-3-sonnet-20240229",
             "system_prompt": "You are an expert Arabic to Urdu translator. Provide accurate, natural translations that maintain the original meaning and tone.",
             "temperature": 0.1,
-            "max_tokens": 1000
+            "max_tokens": 1000,
+            "max_parallel_requests": (os.cpu_count() or 1) * 5
         },
-        "logs": []
+        "logs": deque(maxlen=LLM_CONFIG_LOG_CAP)
     }
 
 # LLM Configuration Models
@@ -310,8 +380,77 @@ class LLMConfigLog(BaseModel):
     details: Dict
     timestamp: datetime
 
+# Request Models
+class SegmentIn(BaseModel):
+    segment_id: Optional[str] = None
+    original_text: str
+    translated_text: Optional[str] = None
+
+class StartLLMRequest(BaseModel):
+    file_id: str = Field(min_length=1)
+    segments: List[SegmentIn] = Field(min_length=1)
+    use_existing_translations: bool = False
+
+class SegmentUpdateRequest(BaseModel):
+    segment_id: str = Field(min_length=1)
+    translation: Optional[str] = None
+    updated_translation: Optional[str] = None
+    final: bool = False
+
+class ApprovalRequest(BaseModel):
+    approved_by: str = "admin"
+    notes: str = ""
+
+class ProviderPatch(BaseModel):
+    user: str = "admin"
+    name: Optional[str] = None
+    api_key: Optional[str] = None
+    base_url: Optional[str] = None
+    is_active: Optional[bool] = None
+
+class ModelPatch(BaseModel):
+    user: str = "admin"
+    name: Optional[str] = None
+    description: Optional[str] = None
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    is_active: Optional[bool] = None
+
+class PromptPatch(BaseModel):
+    user: str = "admin"
+    content: Optional[str] = None
+    description: Optional[str] = None
+    is_default: Optional[bool] = None
+
+class LLMConfigUpdate(BaseModel):
+    user: str = "admin"
+    current_config: Optional[Dict[str, Any]] = None
+    api_providers: Optional[Dict[str, Dict[str, Any]]] = None
+    new_api_providers: Optional[List[Dict[str, Any]]] = None
+    models: Optional[Dict[str, Dict[str, Any]]] = None
+    new_models: Optional[List[Dict[str, Any]]] = None
+    system_prompts: Optional[Dict[str, Dict[str, Any]]] = None
+    new_system_prompts: Optional[List[Dict[str, Any]]] = None
+
+def _fetch_config() -> Tuple[Dict, int]:
+    """Stored configuration and its generation
+    
+    The generation is read first, so it is never newer than the config; at
+    worst the next sync reloads once more than needed.
+    """
+    generation = read_config_generation()
+    return load_llm_config(), generation
+
 # Load LLM configuration from persistent storage
-llm_config = load_llm_config()
+llm_config, _loaded_generation = _fetch_config()
+
+# Generation this worker's llm_config reflects (None forces a reload), and the
+# entries and logs changed here since the last save
+_config_state: Dict[str, Optional[int]] = {"generation": _loaded_generation}
+_dirty_config: Dict[str, Set[str]] = {section: set() for section in ("current_config",) + _CONFIG_SECTIONS}
+_pending_logs: List[LLMConfigLog] = []
+# Held across sync, mutation and save so one worker's config requests never interleave
+_config_sync_lock = asyncio.Lock()
 
 # Initialize review engine
 review_engine = ReviewEngine()
@@ -319,12 +458,28 @@ review_engine = ReviewEngine()
 # Initialize LangChain translator
 langchain_translator = LangChainTranslator()
 
-# In-memory storage for LLM translation jobs (now managed by LangChain translator)
-llm_jobs = langchain_translator.translation_jobs
+# LLM translation jobs live in the translator's shared SQLite store, so any worker can serve them
+job_store = JobStore(langchain_translator)
+
+# Metrics are aggregated over every stored segment, so cache them briefly and
+# drop the cached value whenever a job finishes, is edited or is approved
+_metrics_cache = TTLCache(maxsize=1, ttl=int(os.getenv("METRICS_CACHE_TTL", "30")))
+langchain_translator.on_job_finished = lambda job: _metrics_cache.clear()
+
+# Segment edits are applied after a short quiet period so rapid successive edits
+# to the same segment collapse into one write. The edits themselves are kept in
+# the shared job database, so any worker can show or flush them; this worker's
+# timers are keyed by (job_id, segment_id)
+UPDATE_DEBOUNCE_SECONDS = float(os.getenv("UPDATE_DEBOUNCE_SECONDS", "1.0"))
+pending_updates: Dict[Tuple[str, str], asyncio.Task] = {}
 
 def initialize_default_config():
-    """Initialize default LLM configuration"""
+    """Initialize default LLM configuration; entries added here are marked for saving"""
     now = datetime.utcnow()
+    existing = {section: set(llm_config[section]) for section in _dirty_config}
+    
+    # Configs saved before the setting existed get the default concurrency limit
+    llm_config["current_config"].setdefault("max_parallel_requests", (os.cpu_count() or 1) * 5)
     
     # Default API providers
     if "anthropic" not in llm_config["api_providers"]:
@@ -425,6 +580,9 @@ def initialize_default_config():
                 created_at=now,
                 updated_at=now
             )
+    
+    for section, keys in existing.items():
+        _dirty_config[section].update(set(llm_config[section]) - keys)
 
 def log_config_change(action: str, user: str, details: Dict):
     """Log configuration changes"""
@@ -435,44 +593,179 @@ def log_config_change(action: str, user: str, details: Dict):
         timestamp=datetime.utcnow()
     )
     llm_config["logs"].append(log_entry)
-    logger.info(f"LLM Config Change: {action} by {user} - {details}")
+    _pending_logs.append(log_entry)
+    _serialized_cache["logs"].append(log_entry.model_dump(mode="json"))
+    logger.info("LLM Config Change: %s by %s - %s", action, user, details)
+
+# The config is read far more often than it changes, so each provider, model,
+# prompt and log entry is serialized once and refreshed only when it is mutated
+_PROVIDER_FIELDS = {"name", "is_active", "created_at", "updated_at"}
+_serialized_cache: Dict[str, Any] = {
+    "api_providers": {}, "models": {}, "system_prompts": {}, "logs": deque(maxlen=LLM_CONFIG_LOG_CAP)
+}
+
+def _refresh_serialized(section: str, key: str):
+    """Re-serialize one config entry after it was added or changed"""
+    obj = llm_config[section][key]
+    if section == "api_providers":
+        entry = obj.model_dump(mode="json", include=_PROVIDER_FIELDS)
+        entry["has_api_key"] = bool(obj.api_key)
+    else:
+        entry = obj.model_dump(mode="json")
+    _serialized_cache[section][key] = entry
+
+def _touch(section: str, key: str):
+    """Mark a changed config entry for saving and re-serialize it"""
+    _dirty_config[section].add(key)
+    _refresh_serialized(section, key)
+
+def _persist_config_changes():
+    """Save the entries changed in this worker since the last save (blocking)"""
+    dirty = {section: set(keys) for section, keys in _dirty_config.items() if keys}
+    new_logs = list(_pending_logs)
+    for keys in _dirty_config.values():
+        keys.clear()
+    _pending_logs.clear()
+    if not dirty and not new_logs:
+        return
+    expected = _config_state["generation"]
+    saved = save_llm_config(llm_config, dirty, new_logs)
+    # If another worker saved in between, this copy lacks its changes: reload on the next sync
+    _config_state["generation"] = saved[1] if saved and saved[0] == expected else None
+
+async def _sync_config():
+    """Reload the configuration if another worker saved a newer one; caller holds _config_sync_lock"""
+    generation = await asyncio.to_thread(read_config_generation)
+    if generation == _config_state["generation"]:
+        return
+    config, generation = await asyncio.to_thread(_fetch_config)
+    llm_config.clear()
+    llm_config.update(config)
+    _config_state["generation"] = generation
+    _rebuild_serialized_cache()
+    try:
+        langchain_translator.refresh_configuration()
+    except Exception as e:
+        logger.warning("Failed to refresh translator configuration: %s", e)
+
+async def fresh_config():
+    """Make sure llm_config reflects the latest saved configuration before reading it"""
+    async with _config_sync_lock:
+        await _sync_config()
+
+def _tail(logs: deque, n: int) -> List:
+    """Last n entries of a log deque, without copying the rest"""
+    tail = list(islice(reversed(logs), n))
+    tail.reverse()
+    return tail
+
+def _rebuild_serialized_cache():
+    """Serialize the whole config, e.g. after it was loaded"""
+    for section in ("api_providers", "models", "system_prompts"):
+        _serialized_cache[section].clear()
+        for key in llm_config[section]:
+            _refresh_serialized(section, key)
+    _serialized_cache["logs"] = deque((log.model_dump(mode="json") for log in llm_config["logs"]), maxlen=LLM_CONFIG_LOG_CAP)
 
 # Initialize default configuration
 initialize_default_config()
+_persist_config_changes()
+_rebuild_serialized_cache()
+
+# Cosmetic response timestamps only need sub-second accuracy, so one ISO string is
+# shared and refreshed by a background task instead of formatted per response.
+# It lags by up to one tick, so never store it: persisted times use datetime.utcnow()
+_now_iso: str = datetime.utcnow().isoformat()
+
+async def _tick():
+    global _now_iso
+    while True:
+        _now_iso = datetime.utcnow().isoformat()
+        await asyncio.sleep(0.25)
+
+_clock_task: Optional[asyncio.Task] = None
+
+def start_clock():
+    """Start refreshing the shared response timestamp"""
+    global _clock_task
+    _clock_task = asyncio.create_task(_tick())
+
+async def _cancel_task(task: Optional[asyncio.Task]):
+    """Cancel a background task and wait for it to unwind"""
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+async def stop_clock():
+    """Stop refreshing the shared response timestamp"""
+    global _clock_task
+    await _cancel_task(_clock_task)
+    _clock_task = None
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response when the client already holds this ETag"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+def start_batch_collector():
+    """Start coalescing translation chunks across concurrent jobs"""
+    langchain_translator.batch_collector.start()
+
+def open_storage_client(app: FastAPI):
+    """Open the pooled storage-service client, shared by all requests via app.state.http"""
+    app.state.http = httpx.AsyncClient(
+        base_url=STORAGE_SERVICE_URL,
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+
+async def flush_pending_updates():
+    """Apply debounced segment edits that are still waiting"""
+    await asyncio.gather(*pending_updates.values(), return_exceptions=True)
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint
+    
+    Never queries the job database: the job count is the last one the metrics
+    refresher computed, or None before its first run.
+    """
     return {
         "status": "healthy",
         "service": "translation-review-service",
         "review_tools_loaded": review_engine.reviewer.review_loaded,
         "active_reviews": len(review_engine.active_reviews),
-        "llm_jobs_count": len(llm_jobs),
-        "timestamp": datetime.utcnow().isoformat()
+        "llm_jobs_count": _last_metrics["total_jobs"] if _last_metrics else None,
+        "llm_jobs_inflight": langchain_translator.inflight_jobs,
+        "timestamp": _now_iso
     }
 
 # LLM Translation Endpoints
 @app.post("/translate/llm")
-async def start_llm_translation(background_tasks: BackgroundTasks, request: Dict):
+async def start_llm_translation(background_tasks: BackgroundTasks, request: StartLLMRequest):
     """Start LLM-based translation job"""
     try:
-        file_id = request.get("file_id")
-        segments = request.get("segments", [])
-        use_existing_translations = request.get("use_existing_translations", False)
+        file_id = request.file_id
+        segments = [segment.model_dump(exclude_none=True) for segment in request.segments]
+        use_existing_translations = request.use_existing_translations
         
-        print(f"Starting LLM translation for file_id: {file_id}, segments count: {len(segments)}, use_existing: {use_existing_translations}")
+        logger.info("Starting LLM translation for file_id: %s, segments count: %d, use_existing: %s",
+                    file_id, len(segments), use_existing_translations)
         
-        if not file_id or not segments:
-            raise HTTPException(status_code=400, detail="file_id and segments are required")
+        # Translate with the latest saved provider/model settings, wherever they were changed
+        await fresh_config()
         
         # Create translation job
         job = await langchain_translator.translate_file(file_id, segments, use_existing_translations)
         
-        # Store job
-        llm_jobs[job.job_id] = job
-        
-        print(f"LLM translation job created successfully: {job.job_id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LLM translation job created successfully: %s", job.job_id)
         
         return {
             "job_id": job.job_id,
@@ -482,69 +775,100 @@ async def start_llm_translation(background_tasks: BackgroundTasks, request: Dict
         }
         
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"LLM translation error: {str(e)}")
-        print(f"Error details: {error_details}")
+        logger.exception("LLM translation error: %s", e)
         raise HTTPException(status_code=500, detail=f"LLM translation failed: {str(e)}")
 
+# Compiled serializers for the job list and the segments of a job status response
+_summaries_adapter = TypeAdapter(List[JobSummary])
+_segments_adapter = TypeAdapter(List[TranslationSegment])
+_SEGMENT_FIELDS = {"segment_id", "original_text", "llm_translation", "confidence_score", "quality_metrics", "translation_time"}
+
 @app.get("/translate/llm")
-async def list_llm_translations():
-    """List all LLM translation jobs"""
+async def list_llm_translations(request: Request, status: str = "all"):
+    """List LLM translation jobs
+    
+    ``status`` narrows the list to one bucket: active, completed, archived or all.
+    """
+    if status != "all" and status not in JOB_STATUS_GROUPS:
+        raise HTTPException(status_code=400, detail=f"status must be one of: all, {', '.join(JOB_STATUS_GROUPS)}")
     try:
-        return [
-            {
-                "job_id": job.job_id,
-                "file_id": job.file_id,
-                "status": job.status,
-                "total_segments": job.total_segments,
-                "completed_segments": job.completed_segments,
-                "average_confidence": job.average_confidence,
-                "average_quality_score": job.average_quality_score,
-                "created_at": job.created_at.isoformat(),
-                "completed_at": job.completed_at.isoformat() if job.completed_at else None
-            }
-            for job in llm_jobs.values()
-        ]
+        jobs = await job_store.summaries(JOB_STATUS_GROUPS.get(status))
+        
+        # The list changes whenever a job is added or any job's version moves
+        etag = f'W/"jobs-{status}-{len(jobs)}-{sum(job.version for job in jobs)}"'
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+        
+        # Encoded straight to JSON bytes by pydantic-core
+        body = _summaries_adapter.dump_json(jobs, exclude={"__all__": {"version"}})
+        return Response(body, media_type="application/json", headers={"ETag": etag})
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list translations: {str(e)}")
 
+def _aggregate_metrics() -> Dict:
+    """Aggregate translation metrics (blocking SQL, run off the event loop)"""
+    # Use LangChain translator's built-in metrics
+    metrics = langchain_translator.get_metrics()
+    
+    # Ensure we have default values if no jobs exist
+    default_metrics = {
+        "total_jobs": 0,
+        "completed_jobs": 0,
+        "total_segments_translated": 0,
+        "average_confidence": 0.0,
+        "average_quality_score": 0.0,
+        "average_translation_time": 0.0
+    }
+    
+    return {
+        **default_metrics,
+        **metrics,
+        "average_translation_time": round(metrics["average_translation_time"], 2),
+        "timestamp": _now_iso
+    }
+
+# Last metrics computed, kept past cache expiry and invalidation for /health
+_last_metrics: Optional[Dict] = None
+
+async def _compute_metrics() -> Dict:
+    """Recompute the metrics in a worker thread and cache them"""
+    global _last_metrics
+    _metrics_cache["v"] = _last_metrics = await asyncio.to_thread(_aggregate_metrics)
+    return _last_metrics
+
+async def _metrics_refresher():
+    """Recompute metrics shortly before the cached value expires so requests never see a cold cache"""
+    interval = max(_metrics_cache.ttl - 5, 1)
+    while True:
+        try:
+            await _compute_metrics()
+        except Exception as e:
+            logger.warning("Metrics refresh failed: %s", e)
+        await asyncio.sleep(interval)
+
+_metrics_refresher_task: Optional[asyncio.Task] = None
+
+def start_metrics_refresher():
+    """Warm the metrics cache and keep it warm"""
+    global _metrics_refresher_task
+    _metrics_refresher_task = asyncio.create_task(_metrics_refresher())
+
+async def stop_metrics_refresher():
+    """Stop the metrics refresher"""
+    global _metrics_refresher_task
+    await _cancel_task(_metrics_refresher_task)
+    _metrics_refresher_task = None
+
 @app.get("/translate/llm/metrics")
 async def get_llm_translation_metrics():
     """Get LLM translation metrics and benchmarks"""
+    if "v" in _metrics_cache:
+        return _metrics_cache["v"]
+    
     try:
-        # Use LangChain translator's built-in metrics
-        metrics = langchain_translator.get_metrics()
-        
-        # Add additional metrics
-        completed_jobs = [job for job in llm_jobs.values() if job.status in ["completed", "approved"]]
-        
-        # Calculate average translation time
-        all_translation_times = []
-        for job in completed_jobs:
-            for segment in job.segments:
-                if segment.translation_time:
-                    all_translation_times.append(segment.translation_time)
-        
-        avg_translation_time = sum(all_translation_times) / len(all_translation_times) if all_translation_times else 0
-        
-        # Ensure we have default values if no jobs exist
-        default_metrics = {
-            "total_jobs": 0,
-            "completed_jobs": 0,
-            "total_segments_translated": 0,
-            "average_confidence": 0.0,
-            "average_quality_score": 0.0,
-            "average_translation_time": 0.0
-        }
-        
-        return {
-            **default_metrics,
-            **metrics,
-            "average_translation_time": round(avg_translation_time, 2),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        return await _compute_metrics()
         
     except Exception as e:
         # Return default metrics on error instead of throwing exception
@@ -555,40 +879,98 @@ async def get_llm_translation_metrics():
             "average_confidence": 0.0,
             "average_quality_score": 0.0,
             "average_translation_time": 0.0,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso
         }
 
+def _job_header(job) -> Dict:
+    """Job-level fields of the job status response"""
+    return {
+        "job_id": job.job_id,
+        "file_id": job.file_id,
+        "status": job.status,
+        "total_segments": job.total_segments,
+        "completed_segments": job.completed_segments,
+        "average_confidence": job.average_confidence,
+        "average_quality_score": job.average_quality_score,
+        "created_at": job.created_at,
+        "completed_at": job.completed_at
+    }
+
+def _segment_dict(s, pending: Dict[str, str]) -> Dict:
+    """One segment of the job status response"""
+    return {
+        "segment_id": s.segment_id,
+        "original_text": s.original_text,
+        "llm_translation": pending.get(s.segment_id, s.llm_translation),
+        "confidence_score": s.confidence_score,
+        "quality_metrics": s.quality_metrics,
+        "translation_time": s.translation_time
+    }
+
+def _segment_dicts(segments, pending: Dict[str, str]) -> List[Dict]:
+    """All segments of the job status response, dumped in one pass"""
+    dumped = _segments_adapter.dump_python(segments, include={"__all__": _SEGMENT_FIELDS})
+    if pending:
+        for d in dumped:
+            if d["segment_id"] in pending:
+                d["llm_translation"] = pending[d["segment_id"]]
+    return dumped
+
+# Encoded job status bodies keyed by job_id, reused while the job version is unchanged
+_job_body_cache: LRUCache = LRUCache(maxsize=int(os.getenv("JOB_BODY_CACHE_SIZE", "128")))
+
+async def _stream_job(job, pending: Dict[str, str]):
+    """Yield the job header, then one segment per line"""
+    yield orjson.dumps(_job_header(job)) + b"\n"
+    for i, s in enumerate(job.segments, 1):
+        yield orjson.dumps(_segment_dict(s, pending)) + b"\n"
+        if i % 256 == 0:
+            await asyncio.sleep(0)
+
 @app.get("/translate/llm/job/{job_id}")
-async def get_llm_translation_status(job_id: str):
-    """Get LLM translation job status and results"""
+async def get_llm_translation_status(job_id: str, request: Request, format: str = "json"):
+    """Get LLM translation job status and results
+    
+    ``format=ndjson`` streams the job header followed by one segment per line.
+    """
     try:
-        if job_id not in llm_jobs:
+        # Show edits that are still inside their debounce window
+        pending = await job_store.pending_edits(job_id)
+        
+        # Revalidation and cache hits only need the version, not the decoded job
+        version = await job_store.version(job_id)
+        if version is None:
             raise HTTPException(status_code=404, detail="Translation job not found")
         
-        job = llm_jobs[job_id]
+        # Pending edits are not reflected in the version, so they disable the ETag
+        if not pending:
+            etag = f'W/"{job_id}-{version}-{format}"'
+            not_modified = _not_modified(request, etag)
+            if not_modified:
+                return not_modified
+            if format != "ndjson":
+                cached = _job_body_cache.get(job_id)
+                if cached and cached[0] == version:
+                    return Response(cached[1], media_type="application/json", headers={"ETag": etag})
         
-        return {
-            "job_id": job.job_id,
-            "file_id": job.file_id,
-            "status": job.status,
-            "total_segments": job.total_segments,
-            "completed_segments": job.completed_segments,
-            "average_confidence": job.average_confidence,
-            "average_quality_score": job.average_quality_score,
-            "created_at": job.created_at.isoformat(),
-            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-            "segments": [
-                {
-                    "segment_id": s.segment_id,
-                    "original_text": s.original_text,
-                    "llm_translation": s.llm_translation,
-                    "confidence_score": s.confidence_score,
-                    "quality_metrics": s.quality_metrics,
-                    "translation_time": s.translation_time
-                }
-                for s in job.segments
-            ]
-        }
+        job = await job_store.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Translation job not found")
+        
+        # The job may have moved on since the version was read, so tag what is actually sent
+        headers = {} if pending else {"ETag": f'W/"{job_id}-{job.version}-{format}"'}
+        
+        if format == "ndjson":
+            return StreamingResponse(_stream_job(job, pending), media_type="application/x-ndjson", headers=headers)
+        
+        # Encoded directly with orjson (datetimes included), skipping jsonable_encoder
+        body = orjson.dumps({
+            **_job_header(job),
+            "segments": _segment_dicts(job.segments, pending)
+        })
+        if not pending:
+            _job_body_cache[job_id] = (job.version, body)
+        return Response(body, media_type="application/json", headers=headers)
         
     except HTTPException:
         raise
@@ -596,229 +978,294 @@ async def get_llm_translation_status(job_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to get translation status: {str(e)}")
 
 @app.post("/translate/llm/{job_id}/update")
-async def update_llm_translation(job_id: str, request: Dict):
+async def update_llm_translation(job_id: str, request: SegmentUpdateRequest):
     """Update a specific segment translation"""
     try:
-        if job_id not in llm_jobs:
-            raise HTTPException(status_code=404, detail="Translation job not found")
-        
-        job = llm_jobs[job_id]
-        segment_id = request.get("segment_id")
-        updated_translation = request.get("translation")
+        segment_id = request.segment_id
+        updated_translation = request.translation or request.updated_translation
         
-        if not segment_id or not updated_translation:
+        if not updated_translation:
             raise HTTPException(status_code=400, detail="segment_id and translation are required")
         
-        # Find and update segment
-        for segment in job.segments:
-            if segment.segment_id == segment_id:
-                # Store original translation for comparison
-                original_translation = segment.llm_translation
-                segment.llm_translation = updated_translation
-                # Don't update translation_time for manual edits - keep original
-                
-                # Mark segment as edited if translation changed
-                if original_translation != updated_translation:
-                    segment.is_edited = True
-                    segment.edited_at = datetime.utcnow().isoformat()
-                
-                # Recalculate job metrics
-                if job.completed_segments > 0:
-                    job.average_confidence = sum(s.confidence_score or 0 for s in job.segments) / job.completed_segments
-                    job.average_quality_score = sum(s.quality_metrics.get("overall_quality_score", 0) for s in job.segments) / job.completed_segments
-                
+        job = await job_store.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Translation job not found")
+        if job.status == "approved":
+            raise HTTPException(status_code=409, detail="Approved jobs can no longer be edited")
+        if job.get_segment(segment_id) is None:
+            raise HTTPException(status_code=404, detail="Segment not found")
+        
+        key = (job_id, segment_id)
+        if key in pending_updates:
+            pending_updates.pop(key).cancel()
+        
+        # A final edit is applied right away, replacing any edit still pending on another worker
+        due_at = time.time() + (0 if request.final else UPDATE_DEBOUNCE_SECONDS)
+        await job_store.put_pending_edit(job_id, segment_id, updated_translation, due_at)
+        if request.final:
+            if await _apply_pending_edit(job_id, segment_id, due_at):
                 return {"message": "Translation updated successfully"}
+            raise HTTPException(status_code=409, detail="Approved jobs can no longer be edited")
         
-        raise HTTPException(status_code=404, detail="Segment not found")
+        pending_updates[key] = asyncio.create_task(_apply_after(UPDATE_DEBOUNCE_SECONDS, job_id, segment_id, due_at))
+        return ORJSONResponse({"message": "Translation update accepted"}, status_code=202)
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update translation: {str(e)}")
 
+async def _apply_segment_update(job_id: str, segment_id: str, translation: str) -> bool:
+    """Write one segment edit to the job store; False if the job is gone, approved or lacks the segment"""
+    job = await job_store.get(job_id)
+    if job is None or job.status == "approved" or not await job_store.update_segment(job, segment_id, translation):
+        return False
+    _metrics_cache.clear()
+    return True
+
+async def _apply_pending_edit(job_id: str, segment_id: str, due_at: float) -> bool:
+    """Apply a pending edit unless a newer edit replaced it (that one is applied by its own timer)"""
+    translation = await job_store.take_pending_edit(job_id, segment_id, due_at)
+    if translation is None:
+        return True
+    return await _apply_segment_update(job_id, segment_id, translation)
+
+async def _apply_after(delay: float, job_id: str, segment_id: str, due_at: float):
+    """Apply a debounced segment edit once no newer edit has arrived"""
+    await asyncio.sleep(delay)
+    pending_updates.pop((job_id, segment_id), None)
+    try:
+        if not await _apply_pending_edit(job_id, segment_id, due_at):
+            logger.warning("Dropped edit of segment %s in job %s: job approved or gone", segment_id, job_id)
+    except Exception as e:
+        logger.error("Failed to update segment %s in job %s: %s", segment_id, job_id, e)
+
+async def _flush_job_updates(job_id: str):
+    """Apply a job's pending edits immediately, whichever worker accepted them"""
+    for key in [key for key in pending_updates if key[0] == job_id]:
+        pending_updates.pop(key).cancel()
+    for segment_id, translation in (await job_store.take_pending_edits(job_id)).items():
+        await _apply_segment_update(job_id, segment_id, translation)
+
 @app.get("/translate/llm/config")
 async def get_llm_config():
     """Get current LLM configuration"""
     try:
+        await fresh_config()
         return {
             "current_config": llm_config["current_config"],
-            "api_providers": {
-                k: {
-                    "name": v.name,
-                    "is_active": v.is_active,
-                    "created_at": v.created_at.isoformat(),
-                    "updated_at": v.updated_at.isoformat()
-                } for k, v in llm_config["api_providers"].items()
-            },
-            "models": {
-                k: {
-                    "provider": v.provider,
-                    "model_id": v.model_id,
-                    "name": v.name,
-                    "description": v.description,
-                    "max_tokens": v.max_tokens,
-                    "temperature": v.temperature,
-                    "is_active": v.is_active,
-                    "created_at": v.created_at.isoformat(),
-                    "updated_at": v.updated_at.isoformat()
-                } for k, v in llm_config["models"].items()
-            },
-            "system_prompts": {
-                k: {
-                    "name": v.name,
-                    "content": v.content,
-                    "description": v.description,
-                    "is_default": v.is_default,
-                    "created_at": v.created_at.isoformat(),
-                    "updated_at": v.updated_at.isoformat()
-                } for k, v in llm_config["system_prompts"].items()
-            },
-            "logs": [
-                {
-                    "action": log.action,
-                    "user": log.user,
-                    "details": log.details,
-                    "timestamp": log.timestamp.isoformat()
-                } for log in llm_config["logs"][-10:]  # Last 10 logs
-            ],
-            "timestamp": datetime.utcnow().isoformat()
+            "api_providers": _serialized_cache["api_providers"],
+            "models": _serialized_cache["models"],
+            "system_prompts": _serialized_cache["system_prompts"],
+            "logs": _tail(_serialized_cache["logs"], 10),  # Last 10 logs
+            "timestamp": _now_iso
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get config: {str(e)}")
 
 @app.post("/translate/llm/config")
-async def update_llm_config(request: Dict):
+async def update_llm_config(request: LLMConfigUpdate):
     """Update LLM configuration"""
     try:
-        user = request.get("user", "admin")
-        changes = []
-        
-        # Update current configuration
-        if "current_config" in request:
-            current_config = request["current_config"]
-            old_config = llm_config["current_config"].copy()
-            
-            for key, value in current_config.items():
-                if key in llm_config["current_config"] and llm_config["current_config"][key] != value:
-                    llm_config["current_config"][key] = value
-                    changes.append(f"Updated {key}: {old_config[key]} -> {value}")
-        
-        # Update API providers
-        if "api_providers" in request:
-            for provider_id, provider_data in request["api_providers"].items():
-                if provider_id in llm_config["api_providers"]:
-                    old_provider = llm_config["api_providers"][provider_id]
-                    llm_config["api_providers"][provider_id].api_key = provider_data.get("api_key", old_provider.api_key)
-                    llm_config["api_providers"][provider_id].is_active = provider_data.get("is_active", old_provider.is_active)
-                    llm_config["api_providers"][provider_id].updated_at = datetime.utcnow()
-                    changes.append(f"Updated API provider: {provider_id}")
-        
-        # Add new API providers
-        if "new_api_providers" in request:
-            for provider_data in request["new_api_providers"]:
-                provider_id = provider_data["id"]
-                if provider_id not in llm_config["api_providers"]:
-                    llm_config["api_providers"][provider_id] = APIProvider(
-                        name=provider_data["name"],
-                        api_key=provider_data["api_key"],
-                        base_url=provider_data.get("base_url"),
-                        is_active=provider_data.get("is_active", True),
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    changes.append(f"Added API provider: {provider_id}")
-        
-        # Update models
-        if "models" in request:
-            for model_key, model_data in request["models"].items():
-                if model_key in llm_config["models"]:
-                    old_model = llm_config["models"][model_key]
-                    for key, value in model_data.items():
-                        if hasattr(old_model, key) and getattr(old_model, key) != value:
-                            setattr(llm_config["models"][model_key], key, value)
-                    llm_config["models"][model_key].updated_at = datetime.utcnow()
-                    changes.append(f"Updated model: {model_key}")
-        
-        # Add new models
-        if "new_models" in request:
-            for model_data in request["new_models"]:
-                model_key = f"{model_data['provider']}_{model_data['model_id']}"
-                if model_key not in llm_config["models"]:
-                    llm_config["models"][model_key] = LLMModel(
-                        provider=model_data["provider"],
-                        model_id=model_data["model_id"],
-                        name=model_data["name"],
-                        description=model_data["description"],
-                        max_tokens=model_data["max_tokens"],
-                        temperature=model_data["temperature"],
-                        is_active=model_data.get("is_active", True),
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    changes.append(f"Added model: {model_key}")
-        
-        # Update system prompts
-        if "system_prompts" in request:
-            for prompt_name, prompt_data in request["system_prompts"].items():
-                if prompt_name in llm_config["system_prompts"]:
-                    old_prompt = llm_config["system_prompts"][prompt_name]
-                    llm_config["system_prompts"][prompt_name].content = prompt_data.get("content", old_prompt.content)
-                    llm_config["system_prompts"][prompt_name].description = prompt_data.get("description", old_prompt.description)
-                    llm_config["system_prompts"][prompt_name].is_default = prompt_data.get("is_default", old_prompt.is_default)
-                    llm_config["system_prompts"][prompt_name].updated_at = datetime.utcnow()
-                    changes.append(f"Updated system prompt: {prompt_name}")
-        
-        # Add new system prompts
-        if "new_system_prompts" in request:
-            for prompt_data in request["new_system_prompts"]:
-                prompt_name = prompt_data["name"]
-                if prompt_name not in llm_config["system_prompts"]:
-                    llm_config["system_prompts"][prompt_name] = SystemPrompt(
-                        name=prompt_data["name"],
-                        content=prompt_data["content"],
-                        description=prompt_data["description"],
-                        is_default=prompt_data.get("is_default", False),
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    changes.append(f"Added system prompt: {prompt_name}")
-        
-        # Log changes if any
-        if changes:
-            log_config_change("configuration_updated", user, {"changes": changes})
-            
-            # Save configuration to persistent storage
-            save_llm_config(llm_config)
-            
-            # Refresh the translator configuration if any changes were made
-            try:
-                langchain_translator.refresh_configuration()
-            except Exception as e:
-                logger.warning(f"Failed to refresh translator configuration: {e}")
-        
-        return {
-            "message": "Configuration updated successfully",
-            "changes": changes,
-            "current_config": llm_config["current_config"]
-        }
+        async with _config_sync_lock:
+            await _sync_config()
+            return await _apply_config_update(request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update config: {str(e)}")
 
+async def _apply_config_update(request: LLMConfigUpdate) -> Dict:
+    """Apply a config update to this worker's (freshly synced) config and save the changed entries"""
+    user = request.user
+    
+    # Only known keys whose value actually differs count as changes
+    current_config = llm_config["current_config"]
+    config_diff = {
+        key: value for key, value in (request.current_config or {}).items()
+        if key in current_config and current_config[key] != value
+    }
+    
+    # A re-save of unchanged settings returns without touching anything or logging a change
+    if not config_diff and not any((
+        request.api_providers, request.new_api_providers, request.models,
+        request.new_models, request.system_prompts, request.new_system_prompts
+    )):
+        return {"message": "No changes", "changes": [], "current_config": current_config}
+    
+    now = datetime.utcnow()  # one timestamp for every entry touched by this request
+    
+    # Update current configuration
+    changes = [f"Updated {key}: {current_config[key]} -> {value}" for key, value in config_diff.items()]
+    current_config.update(config_diff)
+    _dirty_config["current_config"].update(config_diff)
+    
+    # Update API providers
+    if request.api_providers is not None:
+        for provider_id, provider_data in request.api_providers.items():
+            if provider_id in llm_config["api_providers"]:
+                old_provider = llm_config["api_providers"][provider_id]
+                llm_config["api_providers"][provider_id].api_key = provider_data.get("api_key", old_provider.api_key)
+                llm_config["api_providers"][provider_id].is_active = provider_data.get("is_active", old_provider.is_active)
+                llm_config["api_providers"][provider_id].updated_at = now
+                _touch("api_providers", provider_id)
+                changes.append(f"Updated API provider: {provider_id}")
+    
+    # Add new API providers
+    if request.new_api_providers is not None:
+        for provider_data in request.new_api_providers:
+            provider_id = provider_data["id"]
+            if provider_id not in llm_config["api_providers"]:
+                llm_config["api_providers"][provider_id] = APIProvider(
+                    name=provider_data["name"],
+                    api_key=provider_data["api_key"],
+                    base_url=provider_data.get("base_url"),
+                    is_active=provider_data.get("is_active", True),
+                    created_at=now,
+                    updated_at=now
+                )
+                _touch("api_providers", provider_id)
+                changes.append(f"Added API provider: {provider_id}")
+    
+    # Update models
+    if request.models is not None:
+        for model_key, model_data in request.models.items():
+            if model_key in llm_config["models"]:
+                # Merge onto the stored fields and only rebuild the model if something differs
+                old_dump = llm_config["models"][model_key].model_dump()
+                merged = {**old_dump, **{k: v for k, v in model_data.items() if k in old_dump}}
+                if merged != old_dump:
+                    llm_config["models"][model_key] = LLMModel(**{**merged, "updated_at": now})
+                    _touch("models", model_key)
+                    changes.append(f"Updated model: {model_key}")
+    
+    # Add new models
+    if request.new_models is not None:
+        for model_data in request.new_models:
+            model_key = f"{model_data['provider']}_{model_data['model_id']}"
+            if model_key not in llm_config["models"]:
+                llm_config["models"][model_key] = LLMModel(
+                    provider=model_data["provider"],
+                    model_id=model_data["model_id"],
+                    name=model_data["name"],
+                    description=model_data["description"],
+                    max_tokens=model_data["max_tokens"],
+                    temperature=model_data["temperature"],
+                    is_active=model_data.get("is_active", True),
+                    created_at=now,
+                    updated_at=now
+                )
+                _touch("models", model_key)
+                changes.append(f"Added model: {model_key}")
+    
+    # Update system prompts
+    if request.system_prompts is not None:
+        for prompt_name, prompt_data in request.system_prompts.items():
+            if prompt_name in llm_config["system_prompts"]:
+                old_prompt = llm_config["system_prompts"][prompt_name]
+                llm_config["system_prompts"][prompt_name].content = prompt_data.get("content", old_prompt.content)
+                llm_config["system_prompts"][prompt_name].description = prompt_data.get("description", old_prompt.description)
+                llm_config["system_prompts"][prompt_name].is_default = prompt_data.get("is_default", old_prompt.is_default)
+                llm_config["system_prompts"][prompt_name].updated_at = now
+                _touch("system_prompts", prompt_name)
+                changes.append(f"Updated system prompt: {prompt_name}")
+    
+    # Add new system prompts
+    if request.new_system_prompts is not None:
+        for prompt_data in request.new_system_prompts:
+            prompt_name = prompt_data["name"]
+            if prompt_name not in llm_config["system_prompts"]:
+                llm_config["system_prompts"][prompt_name] = SystemPrompt(
+                    name=prompt_data["name"],
+                    content=prompt_data["content"],
+                    description=prompt_data["description"],
+                    is_default=prompt_data.get("is_default", False),
+                    created_at=now,
+                    updated_at=now
+                )
+                _touch("system_prompts", prompt_name)
+                changes.append(f"Added system prompt: {prompt_name}")
+    
+    await _commit_config_changes(user, changes)
+    
+    return {
+        "message": "Configuration updated successfully",
+        "changes": changes,
+        "current_config": llm_config["current_config"]
+    }
+
+async def _commit_config_changes(user: str, changes: List[str]):
+    """Log, persist and apply configuration changes (no-op when nothing changed)"""
+    if not changes:
+        return
+    log_config_change("configuration_updated", user, {"changes": changes})
+    
+    # Save the changed entries to persistent storage (one transaction, off the event loop)
+    await asyncio.to_thread(_persist_config_changes)
+    
+    # Refresh the translator configuration if any changes were made
+    try:
+        langchain_translator.refresh_configuration()
+    except Exception as e:
+        logger.warning("Failed to refresh translator configuration: %s", e)
+
+def _config_etag(section: str, key: str) -> str:
+    """ETag of one config entry, derived from its serialized form"""
+    return f'"{zlib.crc32(orjson.dumps(_serialized_cache[section][key], option=orjson.OPT_SORT_KEYS)):08x}"'
+
+async def _patch_config_entry(section: str, key: str, patch: BaseModel, label: str, request: Request) -> Response:
+    """Apply the fields set in a patch to one provider, model or prompt
+    
+    An ``If-Match`` header must match the entry's current ETag, so two editors
+    cannot silently overwrite each other.
+    """
+    title = label[:1].upper() + label[1:]
+    async with _config_sync_lock:
+        await _sync_config()
+        return await _patch_synced_entry(section, key, patch, label, title, request)
+
+async def _patch_synced_entry(section: str, key: str, patch: BaseModel, label: str, title: str, request: Request) -> Response:
+    if key not in llm_config[section]:
+        raise HTTPException(status_code=404, detail=f"{title} not found")
+    
+    if_match = request.headers.get("if-match")
+    if if_match and if_match != _config_etag(section, key):
+        raise HTTPException(status_code=412, detail=f"{title} was modified by someone else")
+    
+    current = llm_config[section][key]
+    updates = {k: v for k, v in patch.model_dump(exclude_unset=True, exclude={"user"}).items() if getattr(current, k) != v}
+    if updates:
+        # Validate the patched entry as a whole, so an explicit null for a required
+        # field is rejected here instead of breaking the next config reload
+        try:
+            updated = type(current).model_validate({**current.model_dump(), **updates, "updated_at": datetime.utcnow()})
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors()))
+        llm_config[section][key] = updated
+        _touch(section, key)
+        await _commit_config_changes(patch.user, [f"Updated {label}: {key}"])
+    
+    return ORJSONResponse(_serialized_cache[section][key], headers={"ETag": _config_etag(section, key)})
+
+@app.patch("/translate/llm/config/providers/{provider_id}")
+async def patch_api_provider(provider_id: str, patch: ProviderPatch, request: Request):
+    """Update selected fields of one API provider"""
+    return await _patch_config_entry("api_providers", provider_id, patch, "API provider", request)
+
+@app.patch("/translate/llm/config/models/{model_key}")
+async def patch_model(model_key: str, patch: ModelPatch, request: Request):
+    """Update selected fields of one model"""
+    return await _patch_config_entry("models", model_key, patch, "model", request)
+
+@app.patch("/translate/llm/config/prompts/{prompt_name}")
+async def patch_system_prompt(prompt_name: str, patch: PromptPatch, request: Request):
+    """Update selected fields of one system prompt"""
+    return await _patch_config_entry("system_prompts", prompt_name, patch, "system prompt", request)
+
 @app.get("/translate/llm/config/providers")
 async def get_api_providers():
     """Get all available API providers"""
     try:
-        return {
-            "providers": {
-                k: {
-                    "name": v.name,
-                    "is_active": v.is_active,
-                    "has_api_key": bool(v.api_key),
-                    "created_at": v.created_at.isoformat(),
-                    "updated_at": v.updated_at.isoformat()
-                } for k, v in llm_config["api_providers"].items()
-            }
-        }
+        await fresh_config()
+        return {"providers": _serialized_cache["api_providers"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get providers: {str(e)}")
 
@@ -826,6 +1273,7 @@ async def get_api_providers():
 async def get_provider_details(provider_id: str):
     """Get detailed provider information including API key for editing"""
     try:
+        await fresh_config()
         if provider_id not in llm_config["api_providers"]:
             raise HTTPException(status_code=404, detail="Provider not found")
         
@@ -836,8 +1284,8 @@ async def get_provider_details(provider_id: str):
             "api_key": provider.api_key,
             "base_url": provider.base_url,
             "is_active": provider.is_active,
-            "created_at": provider.created_at.isoformat(),
-            "updated_at": provider.updated_at.isoformat()
+            "created_at": provider.created_at,
+            "updated_at": provider.updated_at
         }
     except HTTPException:
         raise
@@ -848,21 +1296,8 @@ async def get_provider_details(provider_id: str):
 async def get_models():
     """Get all available models"""
     try:
-        return {
-            "models": {
-                k: {
-                    "provider": v.provider,
-                    "model_id": v.model_id,
-                    "name": v.name,
-                    "description": v.description,
-                    "max_tokens": v.max_tokens,
-                    "temperature": v.temperature,
-                    "is_active": v.is_active,
-                    "created_at": v.created_at.isoformat(),
-                    "updated_at": v.updated_at.isoformat()
-                } for k, v in llm_config["models"].items()
-            }
-        }
+        await fresh_config()
+        return {"models": _serialized_cache["models"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get models: {str(e)}")
 
@@ -870,18 +1305,8 @@ async def get_models():
 async def get_system_prompts():
     """Get all available system prompts"""
     try:
-        return {
-            "prompts": {
-                k: {
-                    "name": v.name,
-                    "content": v.content,
-                    "description": v.description,
-                    "is_default": v.is_default,
-                    "created_at": v.created_at.isoformat(),
-                    "updated_at": v.updated_at.isoformat()
-                } for k, v in llm_config["system_prompts"].items()
-            }
-        }
+        await fresh_config()
+        return {"prompts": _serialized_cache["system_prompts"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get prompts: {str(e)}")
 
@@ -889,86 +1314,81 @@ async def get_system_prompts():
 async def get_config_logs(limit: int = 50):
     """Get configuration change logs"""
     try:
-        logs = llm_config["logs"][-limit:] if limit > 0 else llm_config["logs"]
-        return {
-            "logs": [
-                {
-                    "action": log.action,
-                    "user": log.user,
-                    "details": log.details,
-                    "timestamp": log.timestamp.isoformat()
-                } for log in logs
-            ]
-        }
+        await fresh_config()
+        logs = _serialized_cache["logs"]
+        return {"logs": _tail(logs, limit) if limit > 0 else list(logs)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get logs: {str(e)}")
 
 @app.post("/translate/llm/{job_id}/approve")
-async def approve_llm_translation(job_id: str, request: Dict):
+async def approve_llm_translation(job_id: str, request: ApprovalRequest):
     """Approve LLM translation job and move to ground truth"""
     try:
-        if job_id not in llm_jobs:
+        await _flush_job_updates(job_id)
+        job = await job_store.get(job_id)
+        if job is None:
             raise HTTPException(status_code=404, detail="Translation job not found")
         
-        job = llm_jobs[job_id]
-        
         if job.status != "completed":
             raise HTTPException(status_code=400, detail="Only completed jobs can be approved")
         
         # Get approval details
-        approved_by = request.get("approved_by", "admin")
-        notes = request.get("notes", "")
+        approved_by = request.approved_by
+        notes = request.notes
         
-        # Prepare ground truth data
-        ground_truth_data = {
-            "file_id": job.file_id,
-            "evaluation_id": f"llm_approval_{job_id}",
-            "segments": []
-        }
+        evaluation_id = f"llm_approval_{job_id}"
         
-        # Convert segments to ground truth format
-        for segment in job.segments:
-            # Determine status based on whether segment was edited
-            segment_status = "edited" if getattr(segment, 'is_edited', False) else "approved"
-            
-            ground_truth_segment = {
-                "segment_id": segment.segment_id,
-                "start_time": "00:00:00.000",  # Default timing for LLM translations
-                "end_time": "00:00:00.000",
-                "original_text": segment.original_text,
-                "translated_text": segment.llm_translation or "",
-                "approved_translation": segment.llm_translation or "",
-                "status": segment_status,
-                "edited_by": approved_by,
-                "edited_at": getattr(segment, 'edited_at', None) or datetime.utcnow().isoformat(),
-                "confidence": segment.confidence_score,
-                "notes": notes
-            }
-            ground_truth_data["segments"].append(ground_truth_segment)
+        # Fields shared by every ground truth segment are built once
+        template = {
+            "start_time": "00:00:00.000",  # Default timing for LLM translations
+            "end_time": "00:00:00.000",
+            "edited_by": approved_by,
+            "notes": notes
+        }
+        # Persisted, so read the real clock rather than the cached response timestamp
+        approved_at = datetime.utcnow().isoformat()
         
-        # Save to storage service
-        import httpx
-        storage_service_url = os.getenv("STORAGE_SERVICE_URL", "http://storage-service:8004")
+        async def ground_truth_lines():
+            """Header line, then one ground truth segment per line"""
+            yield orjson.dumps({"file_id": job.file_id, "evaluation_id": evaluation_id}) + b"\n"
+            for i, segment in enumerate(job.segments, 1):
+                yield orjson.dumps({
+                    **template,
+                    "segment_id": segment.segment_id,
+                    "original_text": segment.original_text,
+                    "translated_text": segment.llm_translation or "",
+                    "approved_translation": segment.llm_translation or "",
+                    # Status depends on whether the segment was edited
+                    "status": "edited" if segment.is_edited else "approved",
+                    "edited_at": segment.edited_at or approved_at,
+                    "confidence": segment.confidence_score
+                }) + b"\n"
+                if i % 256 == 0:
+                    await asyncio.sleep(0)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{storage_service_url}/ground-truth",
-                json=ground_truth_data,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=500, detail=f"Failed to save to ground truth: {response.text}")
+        # Stream to the storage service so neither side holds the whole payload
+        response = await app.state.http.post(
+            "/ground-truth/stream",
+            content=ground_truth_lines(),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        if response.status_code != 200:
+            raise HTTPException(status_code=500, detail=f"Failed to save to ground truth: {response.text}")
         
-        # Mark job as approved and save to persistent storage
+        # Mark job as approved and save to persistent storage; an edit saved while the
+        # ground truth was being written makes this fail instead of being lost
         job.status = "approved"
-        langchain_translator.storage.save_jobs(langchain_translator.translation_jobs)
+        try:
+            await job_store.put(job)
+        except JobVersionConflict:
+            raise HTTPException(status_code=409, detail="Translation job changed during approval, approve it again")
+        _metrics_cache.clear()
         
         return {
             "message": "Translation job approved and moved to ground truth",
             "job_id": job_id,
-            "evaluation_id": ground_truth_data["evaluation_id"],
-            "segments_approved": len(ground_truth_data["segments"])
+            "evaluation_id": evaluation_id,
+            "segments_approved": len(job.segments)
         }
         
     except HTTPException:
@@ -976,6 +1396,10 @@ async def approve_llm_translation(job_id: str, request: Dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to approve translation: {str(e)}")
 
+def _review_body(review: ReviewResponse) -> Dict[str, Any]:
+    """Python-mode dump of a review; orjson encodes its datetimes and enums natively"""
+    return review.model_dump()
+
 @app.post("/review", response_model=ReviewResponse)
 async def review_translations(request: TranslationReviewRequest):
     """Start a translation review job"""
@@ -987,35 +1411,52 @@ async def review_translations(request: TranslationReviewRequest):
         # Start review
         response = await review_engine.start_review(request)
         
-        return response
+        return ORJSONResponse(_review_body(response))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Review failed: {str(e)}")
 
 @app.get("/status/{review_id}", response_model=ReviewResponse)
 async def get_review_status(review_id: str):
-    """Get status of a review job"""
+    """Get status of a review job; its segments are paged from /reviews/{review_id}/segments"""
     try:
-        response = review_engine.get_review_status(review_id)
-        return response
+        response = await review_engine.get_review_status(review_id)
+        return ORJSONResponse(_review_body(response))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
 
 @app.get("/reviews", response_model=List[ReviewResponse])
-async def list_reviews():
-    """List all review jobs"""
+async def list_reviews(request: Request, limit: Optional[int] = Query(None, ge=1), offset: int = Query(0, ge=0)):
+    """List review jobs, optionally one page of ``limit`` reviews starting at ``offset``"""
     try:
-        return review_engine.get_all_reviews()
+        etag = f'W/"reviews-{review_engine.version}-{offset}-{limit}"'
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+        reviews = await review_engine.get_reviews_page(limit, offset)
+        return ORJSONResponse([_review_body(review) for review in reviews], headers={"ETag": etag})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list reviews: {str(e)}")
 
+@app.get("/reviews/{review_id}/segments")
+async def get_review_segments(review_id: str, limit: int = Query(100, ge=1), offset: int = Query(0, ge=0)):
+    """One page of a review's reviewed segments, in input order"""
+    segments = await review_engine.get_segments(review_id, limit, offset)
+    if segments is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+    # Lines are already encoded JSON objects, so the page is spliced rather than re-encoded
+    return Response(content=b"[" + b",".join(segments) + b"]", media_type="application/json")
+
 @app.delete("/reviews/{review_id}")
 async def cancel_review(review_id: str):
     """Cancel a review job"""
     try:
         if review_id not in review_engine.active_reviews:
+            # Finished reviews only live in storage
+            if await review_engine.get_review(review_id) is not None:
+                raise HTTPException(status_code=400, detail="Cannot cancel completed review")
             raise HTTPException(status_code=404, detail="Review not found")
         
         review_data = review_engine.active_reviews[review_id]
@@ -1030,8 +1471,8 @@ async def cancel_review(review_id: str):
             review_data["task"].cancel()
         
         # Update status
-        response.status = ReviewStatus.REJECTED
-        response.completed_at = datetime.utcnow()
+        review_engine.set_status(response, ReviewStatus.REJECTED)
+        await review_engine.finish(review_id)
         
         return {"message": "Review cancelled successfully"}
         
@@ -1040,14 +1481,20 @@ async def cancel_review(review_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to cancel review: {str(e)}")
 
+# Encoded /review-tools/status body, rebuilt at most once a second and dropped on reload
+_tools_status_cache = TTLCache(maxsize=1, ttl=float(os.getenv("TOOLS_STATUS_CACHE_TTL", "1")))
+
 @app.get("/review-tools/status")
 async def get_review_tools_status():
     """Get review tools status"""
-    return {
-        "review_tools_loaded": review_engine.reviewer.review_loaded,
-        "quality_thresholds": review_engine.reviewer.quality_thresholds,
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    body = _tools_status_cache.get("v")
+    if body is None:
+        body = _tools_status_cache["v"] = orjson.dumps({
+            "review_tools_loaded": review_engine.reviewer.review_loaded,
+            "quality_thresholds": review_engine.reviewer.quality_thresholds,
+            "timestamp": _now_iso
+        })
+    return Response(content=body, media_type="application/json")
 
 @app.post("/review-tools/reload")
 async def reload_review_tools():
@@ -1055,9 +1502,11 @@ async def reload_review_tools():
     try:
         # Reset review tools loaded status
         review_engine.reviewer.review_loaded = False
+        _tools_status_cache.clear()
         
         # Load review tools in background
         await review_engine.reviewer.load_review_tools()
+        _tools_status_cache.clear()
         
         return {"message": "Review tools reloaded successfully"}
         
@@ -1067,22 +1516,23 @@ async def reload_review_tools():
 @app.get("/stats")
 async def get_review_stats():
     """Get review service statistics"""
-    reviews = review_engine.get_all_reviews()
+    counts = review_engine.status_counts
     
     stats = {
-        "total_reviews": len(reviews),
-        "approved_reviews": len([r for r in reviews if r.status == ReviewStatus.APPROVED]),
-        "needs_revision_reviews": len([r for r in reviews if r.status == ReviewStatus.NEEDS_REVISION]),
-        "rejected_reviews": len([r for r in reviews if r.status == ReviewStatus.REJECTED]),
-        "pending_reviews": len([r for r in reviews if r.status == ReviewStatus.PENDING]),
-        "in_review_reviews": len([r for r in reviews if r.status == ReviewStatus.IN_REVIEW]),
-        "total_segments_reviewed": sum(r.reviewed_segments for r in reviews),
+        "total_reviews": review_engine.total_reviews,
+        "approved_reviews": counts[ReviewStatus.APPROVED],
+        "needs_revision_reviews": counts[ReviewStatus.NEEDS_REVISION],
+        "rejected_reviews": counts[ReviewStatus.REJECTED],
+        "pending_reviews": counts[ReviewStatus.PENDING],
+        "in_review_reviews": counts[ReviewStatus.IN_REVIEW],
+        "total_segments_reviewed": review_engine.total_segments_reviewed,
+        "queue_depth": review_engine.queue_depth,
         "average_review_time": None,  # Calculate if needed
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso
     }
     
     return stats
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8002, loop="uvloop", http="httptools") 
\ No newline at end of file
@@ -10,6 +10,13 @@ class ReviewStatus(str, Enum):
     NEEDS_REVISION = "needs_revision"
     REJECTED = "rejected"
 
+class InputSegment(BaseModel):
+    """One segment of a review request"""
+    start_time: str = Field("00:00:00.000", description="Start time in HH:MM:SS.mmm format")
+    end_time: str = Field("00:00:00.000", description="End time in HH:MM:SS.mmm format")
+    original_text: str = Field("", description="Original Arabic text")
+    translated_text: str = Field("", description="Existing Urdu translation")
+
 class TranslationReviewRequest(BaseModel):
     """Model for translation review request"""
     file_id: str = Field(..., description="ID of the file to review")
@@ -32,7 +39,7 @@ class ReviewResponse(BaseModel):
     review_id: str = Field(..., description="Unique review ID")
     file_id: str = Field(..., description="ID of the original file")
     status: ReviewStatus = Field(..., description="Review status")
-    segments: List[ReviewedSegment] = Field(default=[], description="Reviewed segments")
+    segments: Optional[List[ReviewedSegment]] = Field(None, description="Always null; page through /reviews/{review_id}/segments instead")
     total_segments: int = Field(..., description="Total number of segments")
     reviewed_segments: int = Field(default=0, description="Number of reviewed segments")
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Review creation time")
@@ -0,0 +1,33 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Every database, segment file and model directory the service creates goes
+# into a scratch directory, set before anything imports the service modules
+_scratch_dir = tempfile.mkdtemp(prefix="translation-service-tests-")
+os.environ["DATA_DIR"] = os.path.join(_scratch_dir, "data")
+os.environ["CONFIG_DB_FILE"] = os.path.join(_scratch_dir, "data", "translation_jobs.db")
+os.environ["TRANSLATION_CACHE_DB"] = os.path.join(_scratch_dir, "data", "llm_translation_cache.db")
+os.environ["MODEL_PATH"] = os.path.join(_scratch_dir, "models")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test-key")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main also creates ./data relative to the working directory
+os.chdir(_scratch_dir)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_scratch_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One app lifespan for the whole session; shutdown stops the shared log listener"""
+    import main
+    with TestClient(main.app) as client:
+        yield client
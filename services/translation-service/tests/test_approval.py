@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import httpx
+import orjson
+
+import main
+from langchain_translator import TranslationJob, TranslationSegment
+
+
+def _completed_job(job_id: str) -> TranslationJob:
+    return TranslationJob(
+        job_id=job_id,
+        file_id="file-1",
+        segments=[TranslationSegment(segment_id="s1", original_text="نص", llm_translation="متن")],
+        status="completed",
+        created_at=datetime.utcnow(),
+        total_segments=1,
+        completed_segments=1
+    )
+
+
+def test_approval_stamps_segments_with_the_real_clock(client, monkeypatch):
+    received = []
+
+    def storage_service(request: httpx.Request) -> httpx.Response:
+        received.extend(orjson.loads(line) for line in request.content.splitlines())
+        return httpx.Response(200, json={})
+
+    monkeypatch.setattr(main.app.state, "http", httpx.AsyncClient(
+        base_url="http://storage-service", transport=httpx.MockTransport(storage_service)
+    ))
+    monkeypatch.setattr(main, "_now_iso", "2000-01-01T00:00:00")
+    main.langchain_translator.storage.save_job(_completed_job("approve-1"))
+
+    before = datetime.utcnow().isoformat()
+    response = client.post("/translate/llm/approve-1/approve", json={"approved_by": "tester"})
+
+    assert response.status_code == 200
+    header, segment = received
+    assert header == {"file_id": "file-1", "evaluation_id": "llm_approval_approve-1"}
+    assert segment["edited_at"] >= before
+    assert main.langchain_translator.storage.load_job("approve-1").status == "approved"
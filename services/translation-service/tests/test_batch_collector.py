@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+
+from langchain_translator import BatchCollector, TranslationSegment
+
+
+def _chunk(*segment_ids: str):
+    return [TranslationSegment(segment_id=segment_id, original_text="نص") for segment_id in segment_ids]
+
+
+def _collector(max_prompt_tokens: int = 100, fail: bool = False, **kwargs) -> BatchCollector:
+    calls = []
+
+    async def process_single_chunk(segments, job, index):
+        calls.append([s.segment_id for s in segments])
+        if fail:
+            raise RuntimeError("provider down")
+
+    translator = SimpleNamespace(
+        calls=calls,
+        max_prompt_tokens=max_prompt_tokens,
+        _estimate_prompt_size=len,
+        _process_single_chunk=process_single_chunk
+    )
+    return BatchCollector(translator, **kwargs)
+
+
+async def _submit_all(collector: BatchCollector, *chunks):
+    try:
+        results = await asyncio.gather(*[collector.submit(chunk) for chunk in chunks], return_exceptions=True)
+        # Submitters are released before their dispatch task finishes
+        if collector._dispatches:
+            await asyncio.wait(set(collector._dispatches))
+        return results
+    finally:
+        collector._task.cancel()
+
+
+def test_concurrent_chunks_share_one_call():
+    collector = _collector()
+
+    asyncio.run(_submit_all(collector, _chunk("a1", "a2"), _chunk("b1"), _chunk("c1")))
+
+    assert collector.translator.calls == [["a1", "a2", "b1", "c1"]]
+    assert not collector._dispatches
+
+
+def test_chunks_are_split_at_the_prompt_size_limit():
+    collector = _collector(max_prompt_tokens=3)
+
+    asyncio.run(_submit_all(collector, _chunk("a1", "a2"), _chunk("b1"), _chunk("c1", "c2")))
+
+    assert collector.translator.calls == [["a1", "a2", "b1"], ["c1", "c2"]]
+
+
+def test_batches_are_capped_at_max_batch():
+    collector = _collector(max_batch=2)
+
+    asyncio.run(_submit_all(collector, _chunk("a"), _chunk("b"), _chunk("c")))
+
+    assert collector.translator.calls == [["a", "b"], ["c"]]
+
+
+def test_failures_reach_every_waiting_submitter():
+    collector = _collector(fail=True)
+
+    results = asyncio.run(_submit_all(collector, _chunk("a"), _chunk("b")))
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not collector._dispatches
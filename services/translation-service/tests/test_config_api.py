@@ -0,0 +1,85 @@
+import main
+
+PROMPT_URL = "/translate/llm/config/prompts/News Translation"
+MODEL_URL = "/translate/llm/config/models/anthropic_claude-3-haiku-20240307"
+PROVIDER_URL = "/translate/llm/config/providers/anthropic"
+
+
+def test_patch_round_trips_the_etag(client):
+    current = client.patch(PROMPT_URL, json={})
+    assert current.status_code == 200
+    etag = current.headers["ETag"]
+
+    updated = client.patch(PROMPT_URL, json={"description": "Edited in test"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()["description"] == "Edited in test"
+    assert updated.headers["ETag"] != etag
+
+    # Repeating the read returns the ETag the update handed out
+    assert client.patch(PROMPT_URL, json={}).headers["ETag"] == updated.headers["ETag"]
+
+
+def test_stale_if_match_is_rejected(client):
+    etag = client.patch(PROMPT_URL, json={}).headers["ETag"]
+    client.patch(PROMPT_URL, json={"description": "First editor"}, headers={"If-Match": etag})
+
+    stale = client.patch(PROMPT_URL, json={"description": "Second editor"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert client.get("/translate/llm/config/prompts").json()["prompts"]["News Translation"]["description"] == "First editor"
+
+
+def test_patch_of_unknown_entry_is_not_found(client):
+    assert client.patch("/translate/llm/config/prompts/missing", json={}).status_code == 404
+
+
+def test_null_for_a_required_field_is_rejected(client):
+    before = client.patch(MODEL_URL, json={})
+
+    response = client.patch(MODEL_URL, json={"name": None})
+    assert response.status_code == 422
+    assert client.patch(MODEL_URL, json={}).headers["ETag"] == before.headers["ETag"]
+    assert isinstance(main.llm_config["models"]["anthropic_claude-3-haiku-20240307"], main.LLMModel)
+
+
+def test_wrongly_typed_value_is_rejected(client):
+    assert client.patch(MODEL_URL, json={"max_tokens": "lots"}).status_code == 422
+
+
+def test_null_clears_an_optional_field(client):
+    client.patch(PROVIDER_URL, json={"base_url": "https://example.test"})
+
+    response = client.patch(PROVIDER_URL, json={"base_url": None})
+    assert response.status_code == 200
+    assert main.llm_config["api_providers"]["anthropic"].base_url is None
+
+
+def _save_from_another_worker(section: str, key: str, **updates):
+    config = main.load_llm_config()
+    config[section][key] = config[section][key].model_copy(update=updates)
+    assert main.save_llm_config(config, {section: {key}})
+
+
+def test_saves_by_other_workers_are_reloaded(client):
+    _save_from_another_worker("system_prompts", "News Translation", description="Other worker")
+
+    prompts = client.get("/translate/llm/config/prompts").json()["prompts"]
+    assert prompts["News Translation"]["description"] == "Other worker"
+    assert main._config_state["generation"] == main.read_config_generation()
+
+
+def test_local_saves_do_not_revert_other_workers(client):
+    client.get("/translate/llm/config/prompts")
+    model_key = "anthropic_claude-3-haiku-20240307"
+    _save_from_another_worker("models", model_key, name="Renamed elsewhere")
+
+    # This worker has not synced yet and saves only the entry it changed
+    prompt = main.llm_config["system_prompts"]["News Translation"]
+    main.llm_config["system_prompts"]["News Translation"] = prompt.model_copy(update={"description": "Local edit"})
+    main._touch("system_prompts", "News Translation")
+    main._persist_config_changes()
+    assert main._config_state["generation"] is None
+
+    stored = main.load_llm_config()
+    assert stored["models"][model_key].name == "Renamed elsewhere"
+    assert stored["system_prompts"]["News Translation"].description == "Local edit"
+    assert client.get("/translate/llm/config/models").json()["models"][model_key]["name"] == "Renamed elsewhere"
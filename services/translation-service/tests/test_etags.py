@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import main
+from langchain_translator import TranslationJob, TranslationSegment
+
+
+def _save_job(job_id: str) -> TranslationJob:
+    job = TranslationJob(
+        job_id=job_id,
+        file_id="file-1",
+        segments=[TranslationSegment(segment_id="s1", original_text="نص", llm_translation="متن")],
+        status="completed",
+        created_at=datetime.utcnow(),
+        total_segments=1,
+        completed_segments=1
+    )
+    main.langchain_translator.storage.save_job(job)
+    return job
+
+
+def test_unchanged_job_status_is_answered_with_304(client):
+    _save_job("etag-1")
+
+    first = client.get("/translate/llm/job/etag-1")
+    etag = first.headers["ETag"]
+    revalidated = client.get("/translate/llm/job/etag-1", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert not revalidated.content
+    # Each format has its own tag
+    assert client.get("/translate/llm/job/etag-1?format=ndjson", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_saved_change_invalidates_the_job_etag(client):
+    job = _save_job("etag-2")
+    etag = client.get("/translate/llm/job/etag-2").headers["ETag"]
+
+    job.version += 1
+    job.segments[0].llm_translation = "نیا"
+    main.langchain_translator.storage.save_job(job)
+    response = client.get("/translate/llm/job/etag-2", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["segments"][0]["llm_translation"] == "نیا"
+
+
+def test_revalidation_and_cache_hits_skip_decoding_the_job(client, monkeypatch):
+    _save_job("etag-3")
+    etag = client.get("/translate/llm/job/etag-3").headers["ETag"]
+
+    def load_job(job_id):
+        raise AssertionError("job decoded")
+    monkeypatch.setattr(main.langchain_translator.storage, "load_job", load_job)
+
+    assert client.get("/translate/llm/job/etag-3", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/translate/llm/job/etag-3").json()["job_id"] == "etag-3"
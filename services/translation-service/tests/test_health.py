@@ -0,0 +1,21 @@
+import main
+
+
+def test_health_does_not_query_metrics(client, monkeypatch):
+    def broken():
+        raise RuntimeError("database is locked")
+    monkeypatch.setattr(main, "_aggregate_metrics", broken)
+    monkeypatch.setattr(main, "_last_metrics", None)
+    main._metrics_cache.clear()
+
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert response.json()["llm_jobs_count"] is None
+
+
+def test_health_reports_the_last_computed_job_count(client, monkeypatch):
+    monkeypatch.setattr(main, "_last_metrics", {"total_jobs": 7})
+    main._metrics_cache.clear()
+
+    assert client.get("/health").json()["llm_jobs_count"] == 7
@@ -0,0 +1,29 @@
+import asyncio
+
+import main
+
+
+def test_admitted_jobs_are_counted_and_held(monkeypatch):
+    translator = main.langchain_translator
+    release = asyncio.Event()
+    monkeypatch.setattr(translator, "job_slots", asyncio.Semaphore(1))
+    monkeypatch.setattr(translator, "_schedule_save", lambda job_id: None)
+
+    async def process(job):
+        await release.wait()
+    monkeypatch.setattr(translator, "_process_chunks", process)
+
+    async def run():
+        segments = [{"segment_id": "s1", "original_text": "نص"}]
+        await translator.translate_file("admission-1", segments)
+        await translator.translate_file("admission-2", segments)
+        await asyncio.sleep(0)
+        assert translator.inflight_jobs == 1
+        assert len(translator._admissions) == 2
+
+        release.set()
+        await asyncio.gather(*translator._admissions)
+        assert translator.inflight_jobs == 0
+        assert not translator._admissions
+
+    asyncio.run(run())
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from langchain_translator import JobStore, JobVersionConflict, PersistentJobStorage, TranslationJob, TranslationSegment
+
+
+def _job(job_id: str = "job-1") -> TranslationJob:
+    return TranslationJob(
+        job_id=job_id,
+        file_id="file-1",
+        segments=[
+            TranslationSegment(segment_id=f"s{i}", original_text=f"نص {i}", llm_translation=f"متن {i}")
+            for i in range(3)
+        ],
+        status="completed",
+        created_at=datetime.utcnow(),
+        total_segments=3,
+        completed_segments=3
+    )
+
+
+def _edit(job: TranslationJob, segment_id: str, translation: str, edited_at: str):
+    segment = job.get_segment(segment_id)
+    segment.llm_translation = translation
+    segment.is_edited = True
+    segment.edited_at = edited_at
+
+
+def test_save_job_is_a_compare_and_swap_on_the_version(tmp_path):
+    storage = PersistentJobStorage(str(tmp_path))
+    job = _job()
+    assert storage.save_job(job, expected_version=0)
+
+    job.version = 1
+    assert storage.save_job(job, expected_version=0)
+    assert storage.job_version("job-1") == 1
+
+    stale = _job()
+    stale.version = 1
+    assert not storage.save_job(stale, expected_version=0)
+    assert storage.job_version("job-1") == 1
+
+
+def test_put_raises_on_a_concurrent_save(tmp_path):
+    storage = PersistentJobStorage(str(tmp_path))
+    storage.save_job(_job())
+    store = JobStore(SimpleNamespace(storage=storage, translation_jobs={}))
+
+    async def run():
+        mine, theirs = await store.get("job-1"), await store.get("job-1")
+        await store.put(theirs)
+        with pytest.raises(JobVersionConflict):
+            await store.put(mine)
+        assert mine.version == 0
+
+    asyncio.run(run())
+    assert storage.job_version("job-1") == 1
+
+
+def test_merge_edits_keeps_the_newer_edit_per_segment():
+    mine, theirs = _job(), _job()
+    _edit(mine, "s0", "میرا", "2024-01-02T00:00:00")
+    _edit(theirs, "s0", "ان کا", "2024-01-01T00:00:00")
+    _edit(theirs, "s1", "ان کا", "2024-01-01T00:00:00")
+
+    mine.merge_edits(theirs)
+
+    assert [s.llm_translation for s in mine.segments] == ["میرا", "ان کا", "متن 2"]
+    assert mine.get_segment("s1").is_edited
+
+
+def test_owned_job_write_keeps_edits_saved_by_other_workers(tmp_path, monkeypatch):
+    translator = main.langchain_translator
+    storage = PersistentJobStorage(str(tmp_path))
+    monkeypatch.setattr(translator, "storage", storage)
+    monkeypatch.setattr(translator, "_stored_versions", {})
+
+    owned = _job()
+    assert asyncio.run(translator._write_owned_job(owned))
+
+    other = storage.load_job("job-1")
+    _edit(other, "s2", "ترمیم", datetime.utcnow().isoformat())
+    other.version += 1
+    storage.save_job(other, expected_version=0)
+
+    assert asyncio.run(translator._write_owned_job(owned))
+
+    stored = storage.load_job("job-1")
+    assert stored.get_segment("s2").llm_translation == "ترمیم"
+    assert stored.version == 2
+    assert translator._stored_versions["job-1"] == 2
@@ -0,0 +1,73 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+import llm_translator
+from llm_translator import LLMTranslator
+
+
+@pytest.fixture(scope="module")
+def translator():
+    return LLMTranslator()
+
+
+def test_import_does_not_build_the_translator():
+    assert llm_translator._llm_translator is None
+
+
+def test_parse_packed_response_places_items_by_id(translator):
+    text = '{"items": [{"id": 1, "urdu": " دوسرا "}, {"id": 0, "urdu": "پہلا"}]}'
+    assert translator._parse_packed_response(text, 2) == ["پہلا", "دوسرا"]
+
+
+def test_parse_packed_response_ignores_surrounding_prose_and_bad_ids(translator):
+    text = 'Here you go:\n{"items": [{"id": 0, "urdu": "پہلا"}, {"id": 5, "urdu": "زائد"}]}\nDone.'
+    assert translator._parse_packed_response(text, 2) == ["پہلا", ""]
+
+
+def test_parse_packed_response_falls_back_to_numbered_lines(translator):
+    text = "1. پہلا\n\n2) دوسرا\n- تیسرا\n4: زائد"
+    assert translator._parse_packed_response(text, 3) == ["پہلا", "دوسرا", "تیسرا"]
+
+
+def test_cache_key_depends_on_model_and_prompt(translator, monkeypatch):
+    key = translator._cache_key("نص")
+    assert translator._cache_key("نص") == key
+    monkeypatch.setattr(translator, "model", "another-model")
+    assert translator._cache_key("نص") != key
+    monkeypatch.undo()
+    monkeypatch.setattr(translator, "system_prompt", "another prompt")
+    assert translator._cache_key("نص") != key
+
+
+def test_memory_hits_expire(translator, monkeypatch):
+    key = translator._cache_key("منتهي")
+    translator._cache_put(key, {"translated_text": "ختم"}, persist=False, stored_at=0)
+    assert translator._cache_get_memory(key) is None
+    assert key not in translator._cache
+
+    monkeypatch.setattr(translator, "_cache_ttl", 0)
+    translator._cache_put(key, {"translated_text": "ختم"}, persist=False, stored_at=0)
+    assert translator._cache_get_memory(key) == {"translated_text": "ختم"}
+
+
+def test_shared_translator_flushes_and_closes(monkeypatch, tmp_path):
+    cache_db = str(tmp_path / "cache.db")
+    monkeypatch.setenv("TRANSLATION_CACHE_DB", cache_db)
+
+    async def run():
+        shared = llm_translator.get_llm_translator()
+        assert llm_translator.get_llm_translator() is shared
+        key = shared._cache_key("نص")
+        shared._cache_put(key, {"translated_text": "متن"})
+        assert shared._pending_cache_writes
+
+        await llm_translator.close_llm_translator()
+        assert shared.client.is_closed()
+        assert llm_translator._llm_translator is None
+        return key
+
+    key = asyncio.run(run())
+    with sqlite3.connect(cache_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM translation_cache WHERE key = ?", (key,)).fetchone()[0] == 1
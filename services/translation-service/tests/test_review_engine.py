@@ -0,0 +1,108 @@
+import asyncio
+
+import orjson
+import pytest
+
+import translator
+from models import ReviewStatus, TranslationReviewRequest
+from translator import ReviewEngine, ReviewStorage
+
+
+@pytest.fixture
+def make_engine(tmp_path, monkeypatch):
+    """Engines built by this share one storage directory, like uvicorn workers do"""
+    monkeypatch.setattr(translator, "ReviewStorage", lambda: ReviewStorage(str(tmp_path)))
+    monkeypatch.setattr(translator, "MOCK_DELAY", 0)
+
+    def make_engine() -> ReviewEngine:
+        engine = ReviewEngine()
+        engine.reviewer.review_loaded = True
+        engine.reviewer.batch_size = 4
+        return engine
+    return make_engine
+
+
+def _request(count: int) -> TranslationReviewRequest:
+    return TranslationReviewRequest(
+        file_id="file-1",
+        segments=[
+            {"start_time": f"00:00:{i:02d}", "end_time": f"00:00:{i + 1:02d}", "original_text": f"نص {i}", "translated_text": f"متن {i}"}
+            for i in range(count)
+        ]
+    )
+
+
+async def _review(engine: ReviewEngine, count: int):
+    engine.start_workers()
+    try:
+        response = await engine.start_review(_request(count))
+        await engine.queue.join()
+        return response
+    finally:
+        await engine.stop()
+
+
+def test_queued_review_is_finished_and_persisted(make_engine):
+    engine = make_engine()
+    response = asyncio.run(_review(engine, 10))
+
+    assert response.review_id not in engine.active_reviews
+    assert engine.finished_reviews == 1
+    assert engine.total_segments_reviewed == 10
+    assert engine.status_counts[response.status] == 1
+
+    stored = engine.storage.load(response.review_id)
+    assert stored.status == response.status
+    assert stored.reviewed_segments == 10
+    assert stored.completed_at is not None
+
+
+def test_finished_review_outlives_the_memory_retention(make_engine):
+    engine = make_engine()
+    response = asyncio.run(_review(engine, 3))
+    assert asyncio.run(engine.get_review(response.review_id)) is response
+
+    engine.recent_reviews.clear()
+    asyncio.run(engine.evict_expired())
+
+    assert asyncio.run(engine.get_review(response.review_id)).status == response.status
+    assert engine.storage.read_segments(response.review_id) is not None
+
+
+def test_opt_in_disk_retention_deletes_reviews_and_segments(make_engine):
+    engine = make_engine()
+    response = asyncio.run(_review(engine, 3))
+
+    asyncio.run(engine.evict_expired(older_than=1e-6))
+
+    assert asyncio.run(engine.get_review(response.review_id)) is None
+    assert engine.storage.read_segments(response.review_id) is None
+    assert engine.finished_reviews == 0
+    assert sum(engine.status_counts.values()) == 0
+
+
+def test_cleanup_resyncs_counters_with_other_workers(make_engine):
+    first, second = make_engine(), make_engine()
+    asyncio.run(_review(first, 2))
+    asyncio.run(_review(second, 5))
+    assert first.finished_reviews == 1
+
+    asyncio.run(first.evict_expired())
+    assert first.finished_reviews == 2
+    assert first.total_segments_reviewed == 7
+
+    asyncio.run(second.evict_expired(keep=1))
+    asyncio.run(first.evict_expired())
+    assert first.finished_reviews == second.finished_reviews == 1
+
+
+def test_status_leaves_segments_to_the_paged_endpoint(make_engine):
+    engine = make_engine()
+    response = asyncio.run(_review(engine, 10))
+
+    status = asyncio.run(engine.get_review_status(response.review_id))
+    assert status.segments is None
+    assert status.model_dump()["segments"] is None
+
+    page = asyncio.run(engine.get_segments(response.review_id, 3, 8))
+    assert [orjson.loads(line)["original_text"] for line in page] == ["نص 8", "نص 9"]
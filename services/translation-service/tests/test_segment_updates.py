@@ -0,0 +1,58 @@
+import time
+from datetime import datetime
+
+import main
+from langchain_translator import TranslationJob, TranslationSegment
+
+
+def _save_job(job_id: str, status: str = "completed"):
+    main.langchain_translator.storage.save_job(TranslationJob(
+        job_id=job_id,
+        file_id="file-1",
+        segments=[TranslationSegment(segment_id="s1", original_text="نص", llm_translation="متن")],
+        status=status,
+        created_at=datetime.utcnow(),
+        total_segments=1,
+        completed_segments=1
+    ))
+
+
+def _stored_translation(job_id: str) -> str:
+    return main.langchain_translator.storage.load_job(job_id).get_segment("s1").llm_translation
+
+
+def test_rapid_edits_are_accepted_and_coalesced(client, monkeypatch):
+    monkeypatch.setattr(main, "UPDATE_DEBOUNCE_SECONDS", 0.05)
+    _save_job("debounce-1")
+
+    for translation in ("پہلا", "دوسرا"):
+        response = client.post("/translate/llm/debounce-1/update", json={"segment_id": "s1", "translation": translation})
+        assert response.status_code == 202
+
+    # Edits inside the debounce window are shown but not yet written
+    assert client.get("/translate/llm/job/debounce-1").json()["segments"][0]["llm_translation"] == "دوسرا"
+    assert _stored_translation("debounce-1") == "متن"
+
+    deadline = time.monotonic() + 5
+    while _stored_translation("debounce-1") == "متن" and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert _stored_translation("debounce-1") == "دوسرا"
+    assert main.langchain_translator.storage.job_version("debounce-1") == 1
+
+
+def test_final_edit_is_applied_right_away(client):
+    _save_job("debounce-2")
+
+    response = client.post("/translate/llm/debounce-2/update", json={"segment_id": "s1", "translation": "آخری", "final": True})
+
+    assert response.status_code == 200
+    assert _stored_translation("debounce-2") == "آخری"
+
+
+def test_edits_to_unknown_segments_and_approved_jobs_are_rejected(client):
+    _save_job("debounce-3")
+    _save_job("debounce-4", status="approved")
+
+    assert client.post("/translate/llm/debounce-3/update", json={"segment_id": "nope", "translation": "x"}).status_code == 404
+    assert client.post("/translate/llm/missing/update", json={"segment_id": "s1", "translation": "x"}).status_code == 404
+    assert client.post("/translate/llm/debounce-4/update", json={"segment_id": "s1", "translation": "x"}).status_code == 409
@@ -0,0 +1,40 @@
+from langchain_translator import TranslationCache
+
+
+def test_entries_are_keyed_by_namespace_and_text(tmp_path):
+    cache = TranslationCache(str(tmp_path))
+    anthropic = TranslationCache.namespace("anthropic", "claude-3-haiku-20240307", "prompt")
+    openai = TranslationCache.namespace("openai", "claude-3-haiku-20240307", "prompt")
+    other_prompt = TranslationCache.namespace("anthropic", "claude-3-haiku-20240307", "other prompt")
+
+    cache.put_many([("مرحبا", "خوش آمدید"), ("شكرا", "شکریہ")], anthropic)
+
+    assert cache.get_many(["مرحبا", "شكرا", "لا"], anthropic) == {"مرحبا": "خوش آمدید", "شكرا": "شکریہ"}
+    assert cache.get_many(["مرحبا"], openai) == {}
+    assert cache.get_many(["مرحبا"], other_prompt) == {}
+
+
+def test_expired_entries_are_ignored_and_pruned(tmp_path):
+    cache = TranslationCache(str(tmp_path))
+    cache.ttl = 60
+    namespace = TranslationCache.namespace("anthropic", "model", "prompt")
+    cache.put_many([("قديم", "پرانا")], namespace)
+    cache.conn.execute("UPDATE translations SET ts = ts - 120")
+    cache.conn.commit()
+
+    assert cache.get_many(["قديم"], namespace) == {}
+
+    cache.put_many([("جديد", "نیا")], namespace)
+    assert cache.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0] == 1
+
+
+def test_tables_from_the_old_key_scheme_are_dropped(tmp_path):
+    cache = TranslationCache(str(tmp_path))
+    cache.conn.execute("DROP TABLE translations")
+    cache.conn.execute("CREATE TABLE translations (key TEXT PRIMARY KEY, translation TEXT NOT NULL)")
+    cache.conn.execute("INSERT INTO translations VALUES ('k', 'v')")
+    cache.conn.commit()
+    cache.conn.close()
+
+    cache = TranslationCache(str(tmp_path))
+    assert cache.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0] == 0
@@ -1,130 +1,435 @@
 import asyncio
-from typing import List, Dict, Any
+import heapq
+import logging
+import os
+import sqlite3
+import threading
 import uuid
-from datetime import datetime
-import random
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from models import TranslationReviewRequest, ReviewedSegment, ReviewResponse, ReviewStatus
+import numpy as np
+import orjson
+from cachetools import LRUCache, TTLCache
+from pydantic import TypeAdapter
+
+from models import InputSegment, TranslationReviewRequest, ReviewedSegment, ReviewResponse, ReviewStatus
+
+logger = logging.getLogger(__name__)
+
+# Finished reviews and their segment files live here
+DATA_DIR = os.getenv("DATA_DIR", "/app/data")
+
+# Simulated per-segment validation latency in seconds (0 disables it)
+MOCK_DELAY = float(os.getenv("MOCK_DELAY", "0"))
+
+# Reviewer feedback per quality level
+_FEEDBACK = {
+    "excellent": "Translation is excellent and ready for approval.",
+    "good": "Translation is good with minor issues that can be addressed.",
+    "acceptable": "Translation is acceptable but needs some improvements.",
+}
+_DEFAULT_FEEDBACK = "Translation needs significant revision before approval."
+
+# Raw request segments are validated once into typed segments
+_input_segments_adapter = TypeAdapter(List[InputSegment])
+
+@dataclass(slots=True)
+class _SegmentInternal:
+    """In-memory reviewed segment; becomes a ReviewedSegment only at the API/storage boundary"""
+    start_time: str
+    end_time: str
+    original_text: str
+    original_translation: str
+    approved_translation: Optional[str]
+    review_status: ReviewStatus
+    reviewer_notes: Optional[str]
+    review_time: Optional[datetime]
+    
+    def to_model(self) -> ReviewedSegment:
+        # Fields are already known-good, so skip validation
+        return ReviewedSegment.model_construct(**asdict(self))
+
+def _to_models(segments: List[_SegmentInternal]) -> List[ReviewedSegment]:
+    return [segment.to_model() for segment in segments]
 
 class TranslationReviewer:
     """Translation review engine for validating existing translations"""
     
     def __init__(self):
         self.review_loaded = False
+        self._load_lock = asyncio.Lock()
+        # Batches of one review validated at the same time
+        self.max_concurrency = int(os.getenv("REVIEW_CONCURRENCY", "4"))
+        # Segments sent to the validator per batch call
+        self.batch_size = int(os.getenv("REVIEW_BATCH_SIZE", "32"))
+        # Repeated (original, translation) pairs are common in subtitles, validate each once
+        self._validation_cache: LRUCache = LRUCache(maxsize=int(os.getenv("VALIDATION_CACHE_SIZE", "10000")))
+        # Own generator instead of numpy's shared global state; review workers pass their own
+        self._rng = np.random.default_rng()
         self.quality_thresholds = {
             "excellent": 0.9,
             "good": 0.7,
             "acceptable": 0.5,
             "needs_revision": 0.3
         }
+        # Ascending thresholds for np.searchsorted; _levels[k] is the level with k thresholds reached
+        ordered = sorted(self.quality_thresholds.items(), key=lambda kv: kv[1])
+        self._threshold_values = np.array([threshold for _, threshold in ordered])
+        self._levels = ("needs_revision",) + tuple(level for level, _ in ordered)
     
     async def load_review_tools(self):
         """Load review tools and validation models"""
         # Simulate loading review tools
         await asyncio.sleep(1)
         self.review_loaded = True
-        print("Translation review tools loaded successfully")
+        logger.info("Translation review tools loaded successfully")
     
     async def validate_translation(self, arabic_text: str, urdu_translation: str) -> Dict[str, Any]:
         """Validate an existing Arabic-to-Urdu translation"""
-        if not self.review_loaded:
-            await self.load_review_tools()
-        
-        # Simulate validation delay
-        await asyncio.sleep(0.1)
-        
-        # Mock validation logic
-        # In a real implementation, this would use actual validation models
-        validation_score = random.uniform(0.6, 0.95)
+        return (await self.validate_batch([(arabic_text, urdu_translation)]))[0]
+    
+    async def validate_batch(self, pairs: List[Tuple[str, str]], rng: Optional[np.random.Generator] = None) -> List[Dict[str, Any]]:
+        """Validate many (Arabic, Urdu) pairs in one model call
         
-        # Determine quality level
-        quality_level = "needs_revision"
-        for level, threshold in self.quality_thresholds.items():
-            if validation_score >= threshold:
-                quality_level = level
-                break
+        Cached pairs are answered directly; only the misses reach the model,
+        so per-call overhead is paid once per batch instead of once per pair.
+        Scores are drawn from ``rng``, or the reviewer's own generator.
+        """
+        results: List[Optional[Dict[str, Any]]] = [self._validation_cache.get(pair) for pair in pairs]
+        misses = [i for i, cached in enumerate(results) if cached is None]
         
-        # Generate validation feedback
-        feedback = self._generate_feedback(validation_score, quality_level)
+        if misses:
+            if not self.review_loaded:
+                # Concurrent batches share a single load
+                async with self._load_lock:
+                    if not self.review_loaded:
+                        await self.load_review_tools()
+            
+            # Simulate validation delay, once for the whole batch
+            if MOCK_DELAY:
+                await asyncio.sleep(MOCK_DELAY)
+            
+            # Mock validation logic, scored for the whole batch at once
+            # In a real implementation, this would use actual validation models
+            scores = (rng or self._rng).uniform(0.6, 0.95, len(misses))
+            level_indices = np.searchsorted(self._threshold_values, scores, side="right")
+            
+            for i, validation_score, level_index in zip(misses, scores.tolist(), level_indices.tolist()):
+                quality_level = self._levels[level_index]
+                result = {
+                    "score": validation_score,
+                    "quality_level": quality_level,
+                    "feedback": self._generate_feedback(validation_score, quality_level),
+                    "needs_revision": validation_score < 0.7
+                }
+                self._validation_cache[pairs[i]] = result
+                results[i] = result
         
-        return {
-            "score": validation_score,
-            "quality_level": quality_level,
-            "feedback": feedback,
-            "needs_revision": validation_score < 0.7
-        }
+        return [dict(result) for result in results]
     
     def _generate_feedback(self, score: float, quality_level: str) -> str:
         """Generate feedback based on validation score"""
-        if quality_level == "excellent":
-            return "Translation is excellent and ready for approval."
-        elif quality_level == "good":
-            return "Translation is good with minor issues that can be addressed."
-        elif quality_level == "acceptable":
-            return "Translation is acceptable but needs some improvements."
-        else:
-            return "Translation needs significant revision before approval."
+        return _FEEDBACK.get(quality_level, _DEFAULT_FEEDBACK)
+    
+    def _build_review(self, segment: InputSegment, validation_result: Dict[str, Any], now: datetime) -> _SegmentInternal:
+        """Turn one segment and its validation result into a review"""
+        needs_revision = validation_result["needs_revision"]
+        return _SegmentInternal(
+            start_time=segment.start_time,
+            end_time=segment.end_time,
+            original_text=segment.original_text,
+            original_translation=segment.translated_text,
+            approved_translation=None if needs_revision else segment.translated_text,
+            review_status=ReviewStatus.NEEDS_REVISION if needs_revision else ReviewStatus.APPROVED,
+            reviewer_notes=validation_result["feedback"],
+            review_time=now
+        )
+    
+    def _error_review(self, segment: InputSegment, error: Exception, now: datetime) -> _SegmentInternal:
+        """Rejected review for a segment whose validation failed"""
+        return _SegmentInternal(
+            start_time=segment.start_time,
+            end_time=segment.end_time,
+            original_text=segment.original_text,
+            original_translation=segment.translated_text,
+            approved_translation=None,
+            review_status=ReviewStatus.REJECTED,
+            reviewer_notes=f"Error during review: {str(error)}",
+            review_time=now
+        )
+    
+    async def review_batch(self, segments: List[InputSegment], rng: Optional[np.random.Generator] = None) -> List[_SegmentInternal]:
+        """Review segments with a single ``validate_batch`` call
+        
+        If validation fails, every segment of the batch is rejected with the
+        error instead of raising.
+        """
+        pairs = [(segment.original_text, segment.translated_text) for segment in segments]
+        try:
+            results = await self.validate_batch(pairs, rng)
+        except Exception as e:
+            logger.exception("Error reviewing batch of %d segments", len(segments))
+            now = datetime.utcnow()
+            return [self._error_review(segment, e, now) for segment in segments]
+        now = datetime.utcnow()
+        return [self._build_review(segment, result, now) for segment, result in zip(segments, results)]
     
     async def review_segments(self, segments: List[Dict[str, Any]]) -> List[ReviewedSegment]:
-        """Review a list of segments with existing translations"""
-        reviewed_segments = []
+        """Review a list of segments with existing translations
         
-        for i, segment in enumerate(segments):
-            try:
-                # Extract segment data
-                start_time = segment.get('start_time', '00:00:00.000')
-                end_time = segment.get('end_time', '00:00:00.000')
-                original_text = segment.get('original_text', '')
-                translated_text = segment.get('translated_text', '')
-                
-                # Validate translation
-                validation_result = await self.validate_translation(original_text, translated_text)
-                
-                # Determine review status
-                if validation_result["needs_revision"]:
-                    review_status = ReviewStatus.NEEDS_REVISION
-                else:
-                    review_status = ReviewStatus.APPROVED
-                
-                # Create reviewed segment
-                reviewed_segment = ReviewedSegment(
-                    start_time=start_time,
-                    end_time=end_time,
-                    original_text=original_text,
-                    original_translation=translated_text,
-                    approved_translation=translated_text if not validation_result["needs_revision"] else None,
-                    review_status=review_status,
-                    reviewer_notes=validation_result["feedback"],
-                    review_time=datetime.utcnow()
-                )
-                
-                reviewed_segments.append(reviewed_segment)
-                
-                # Simulate processing delay
-                await asyncio.sleep(0.05)
-                
-            except Exception as e:
-                print(f"Error reviewing segment {i}: {e}")
-                # Create segment with error
-                reviewed_segment = ReviewedSegment(
-                    start_time=segment.get('start_time', '00:00:00.000'),
-                    end_time=segment.get('end_time', '00:00:00.000'),
-                    original_text=segment.get('original_text', ''),
-                    original_translation=segment.get('translated_text', ''),
-                    review_status=ReviewStatus.REJECTED,
-                    reviewer_notes=f"Error during review: {str(e)}",
-                    review_time=datetime.utcnow()
+        All segments go to the validator in one batch; results keep the
+        input order.
+        """
+        return _to_models(await self.review_batch(_input_segments_adapter.validate_python(segments)))
+
+class ReviewStorage:
+    """Finished reviews in SQLite (WAL mode), reviewed segments in one JSONL file per review"""
+    
+    def __init__(self, storage_dir: str = DATA_DIR):
+        os.makedirs(storage_dir, exist_ok=True)
+        self.segments_dir = os.path.join(storage_dir, "reviews")
+        os.makedirs(self.segments_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(storage_dir, "reviews.db"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reviews (
+                review_id TEXT PRIMARY KEY,
+                file_id TEXT,
+                status TEXT,
+                total_segments INTEGER,
+                reviewed_segments INTEGER,
+                created_at TEXT,
+                completed_at TEXT,
+                reviewer_id TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_reviews_created ON reviews (created_at);
+            CREATE INDEX IF NOT EXISTS idx_reviews_completed ON reviews (completed_at);
+        """)
+        self.conn.commit()
+    
+    _COLUMNS = "review_id, file_id, status, total_segments, reviewed_segments, created_at, completed_at, reviewer_id"
+    
+    @staticmethod
+    def _from_row(row) -> ReviewResponse:
+        return ReviewResponse(
+            review_id=row[0], file_id=row[1], status=row[2], total_segments=row[3], reviewed_segments=row[4],
+            created_at=row[5], completed_at=row[6], reviewer_id=row[7]
+        )
+    
+    def save(self, response: ReviewResponse):
+        """Insert or replace one review"""
+        with self.lock:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO reviews ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    response.review_id, response.file_id, response.status.value, response.total_segments,
+                    response.reviewed_segments, response.created_at.isoformat(),
+                    response.completed_at.isoformat() if response.completed_at else None,
+                    response.reviewer_id
                 )
-                reviewed_segments.append(reviewed_segment)
+            )
+            self.conn.commit()
+    
+    def load(self, review_id: str) -> Optional[ReviewResponse]:
+        with self.lock:
+            row = self.conn.execute(f"SELECT {self._COLUMNS} FROM reviews WHERE review_id = ?", (review_id,)).fetchone()
+        return self._from_row(row) if row else None
+    
+    def oldest(self, limit: Optional[int] = None) -> List[ReviewResponse]:
+        """Reviews in creation order, at most ``limit`` of them"""
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {self._COLUMNS} FROM reviews ORDER BY created_at LIMIT ?", (-1 if limit is None else limit,)
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+    
+    def totals(self) -> Tuple[Counter, int]:
+        """Review count per status and the number of reviewed segments"""
+        with self.lock:
+            rows = self.conn.execute("SELECT status, COUNT(*), COALESCE(SUM(reviewed_segments), 0) FROM reviews GROUP BY status").fetchall()
+        return Counter({ReviewStatus(status): count for status, count, _ in rows}), sum(row[2] for row in rows)
+    
+    def prune(self, completed_before: Optional[str], keep: Optional[int]) -> List[str]:
+        """Delete reviews completed before a timestamp or beyond the newest ``keep``; returns the deleted ids
         
-        return reviewed_segments
+        Either bound may be None to leave it out.
+        """
+        clauses, params = [], []
+        if completed_before is not None:
+            clauses.append("completed_at < ?")
+            params.append(completed_before)
+        if keep is not None:
+            clauses.append("review_id NOT IN (SELECT review_id FROM reviews ORDER BY completed_at DESC LIMIT ?)")
+            params.append(keep)
+        if not clauses:
+            return []
+        condition = " OR ".join(clauses)
+        with self.lock:
+            review_ids = [row[0] for row in self.conn.execute(f"SELECT review_id FROM reviews WHERE {condition}", params)]
+            if review_ids:
+                self.conn.execute(f"DELETE FROM reviews WHERE {condition}", params)
+                self.conn.commit()
+        for review_id in review_ids:
+            self.delete_segments(review_id)
+        return review_ids
+    
+    def _segments_path(self, review_id: str) -> str:
+        return os.path.join(self.segments_dir, f"{review_id}.jsonl")
+    
+    def append_segments(self, review_id: str, segments: List[_SegmentInternal]):
+        """Append reviewed segments to the review's JSONL file, one per line"""
+        with open(self._segments_path(review_id), "ab") as f:
+            f.write(b"".join(orjson.dumps(asdict(segment)) + b"\n" for segment in segments))
+    
+    def read_segments(self, review_id: str, limit: Optional[int] = None, offset: int = 0) -> Optional[List[bytes]]:
+        """Encoded segments ``offset`` to ``offset + limit`` of a review, or None if it has no segment file"""
+        try:
+            with open(self._segments_path(review_id), "rb") as f:
+                stop = None if limit is None else offset + limit
+                return [line.rstrip(b"\n") for line in islice(f, offset, stop)]
+        except FileNotFoundError:
+            return None
+    
+    def delete_segments(self, review_id: str):
+        try:
+            os.remove(self._segments_path(review_id))
+        except FileNotFoundError:
+            pass
+
 
 class ReviewEngine:
-    """Main review engine"""
+    """Main review engine
+    
+    Only reviews still in progress are kept in ``active_reviews``; finished
+    reviews are written to SQLite and read back from there. Reviewed segments
+    go straight to disk and are read back a page at a time, so a review only
+    keeps its counts in memory.
+    """
     
     def __init__(self):
         self.reviewer = TranslationReviewer()
         self.active_reviews = {}
+        self.storage = ReviewStorage()
+        # Recently finished reviews stay in memory for retention_seconds (at most
+        # max_retained of them), so status polls right after finishing skip SQLite
+        self.retention_seconds = float(os.getenv("REVIEW_RETENTION_SECONDS", "3600"))
+        self.max_retained = int(os.getenv("MAX_RETAINED_REVIEWS", "10000"))
+        self.recent_reviews: TTLCache = TTLCache(maxsize=self.max_retained, ttl=self.retention_seconds)
+        # Deleting finished reviews from disk is opt-in; 0 keeps them forever
+        self.db_retention_seconds = float(os.getenv("REVIEW_DB_RETENTION_SECONDS", "0"))
+        self.db_max_retained = int(os.getenv("REVIEW_DB_MAX_RETAINED", "0"))
+        # Counters maintained on every status transition so stats need no scan;
+        # seeded from the reviews persisted by earlier runs
+        self.version = 0
+        self._reseed_counters(*self.storage.totals())
+        # Reviews wait here until one of the fixed pool of workers picks them up
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.num_workers = int(os.getenv("REVIEW_WORKERS", "4"))
+        self._workers: List[asyncio.Task] = []
+        self._cleanup_task: Optional[asyncio.Task] = None
+    
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize()
+    
+    def start_workers(self):
+        """Spawn the review workers that drain the queue, and the periodic cleanup
+        
+        Each worker gets an independent generator spawned from one seed sequence.
+        """
+        seeds = np.random.SeedSequence().spawn(self.num_workers)
+        self._workers = [asyncio.create_task(self._worker(np.random.default_rng(seed))) for seed in seeds]
+        self._cleanup_task = asyncio.create_task(self.run_cleanup())
+    
+    async def stop(self):
+        """Cancel the workers, the cleanup task and any reviews still running"""
+        tasks = [*self._workers, *([self._cleanup_task] if self._cleanup_task else [])]
+        tasks.extend(data["task"] for data in self.active_reviews.values() if data.get("task"))
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._cleanup_task = None
+    
+    async def _worker(self, rng: np.random.Generator):
+        """Process queued reviews one at a time"""
+        while True:
+            review_id = await self.queue.get()
+            try:
+                review_data = self.active_reviews.get(review_id)
+                # Reviews cancelled while still queued are already finished
+                if review_data is None:
+                    continue
+                task = asyncio.create_task(self._process_review(review_id, rng))
+                review_data["task"] = task
+                # wait() rather than await, so cancelling the review doesn't stop the worker
+                await asyncio.wait([task])
+            finally:
+                self.queue.task_done()
+    
+    @property
+    def total_reviews(self) -> int:
+        return len(self.active_reviews) + self.finished_reviews
+    
+    def set_status(self, response: ReviewResponse, status: ReviewStatus):
+        """Move a review to a new status, keeping the status counters in step"""
+        self.status_counts[response.status] -= 1
+        self.status_counts[status] += 1
+        response.status = status
+        self.version += 1
+    
+    def _reseed_counters(self, finished_counts: Counter, finished_segments: int):
+        """Rebuild the counters from the persisted totals plus the reviews still in memory
+        
+        Other uvicorn workers finish and prune reviews too, so the stored totals
+        are the source of truth for finished reviews.
+        """
+        counts = Counter(finished_counts)
+        segments = finished_segments
+        for response in self.iter_reviews():
+            counts[response.status] += 1
+            segments += response.reviewed_segments
+        self.status_counts, self.total_segments_reviewed = counts, segments
+        self.finished_reviews = sum(finished_counts.values())
+        self.version += 1
+    
+    async def finish(self, review_id: str):
+        """Stamp a review as completed, persist it and drop it from the active reviews"""
+        response = self.active_reviews[review_id]["response"]
+        response.completed_at = datetime.utcnow()
+        await asyncio.to_thread(self.storage.save, response)
+        self.active_reviews.pop(review_id, None)
+        self.recent_reviews[review_id] = response
+        self.finished_reviews += 1
+        self.version += 1
+    
+    async def evict_expired(self, older_than: Optional[float] = None, keep: Optional[int] = None):
+        """Delete finished reviews from disk past the opt-in retention limits, then resync the counters
+        
+        ``older_than`` (seconds) and ``keep`` override REVIEW_DB_RETENTION_SECONDS
+        and REVIEW_DB_MAX_RETAINED; a limit of 0 is not applied.
+        """
+        age = self.db_retention_seconds if older_than is None else older_than
+        keep = self.db_max_retained if keep is None else keep
+        cutoff = (datetime.utcnow() - timedelta(seconds=age)).isoformat() if age else None
+        for review_id in await asyncio.to_thread(self.storage.prune, cutoff, keep or None):
+            self.recent_reviews.pop(review_id, None)
+        self._reseed_counters(*await asyncio.to_thread(self.storage.totals))
+    
+    async def run_cleanup(self, interval: float = 900):
+        """Apply the disk retention limits and resync the counters periodically"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_expired()
+            except Exception as e:
+                logger.warning("Review cleanup failed: %s", e)
     
     async def start_review(self, request: TranslationReviewRequest) -> ReviewResponse:
         """Start a translation review job"""
@@ -141,64 +446,114 @@ class ReviewEngine:
         )
         
         # Store review
+        self.status_counts[response.status] += 1
+        self.version += 1
         self.active_reviews[review_id] = {
             "response": response,
             "request": request,
             "task": None
         }
         
-        # Start background review task
-        task = asyncio.create_task(self._process_review(review_id))
-        self.active_reviews[review_id]["task"] = task
+        # Hand the review to the worker pool
+        self.queue.put_nowait(review_id)
         
         return response
     
-    async def _process_review(self, review_id: str):
+    async def _process_review(self, review_id: str, rng: Optional[np.random.Generator] = None):
         """Process review in background"""
+        review_data = self.active_reviews.get(review_id)
+        if review_data is None:
+            return
+        response = review_data["response"]
+        request = review_data["request"]
+        
         try:
-            review_data = self.active_reviews[review_id]
-            response = review_data["response"]
-            request = review_data["request"]
-            
             # Update status to in review
-            response.status = ReviewStatus.IN_REVIEW
+            self.set_status(response, ReviewStatus.IN_REVIEW)
+            
+            # Review batches concurrently, publishing each one as soon as it finishes
+            sem = asyncio.Semaphore(self.reviewer.max_concurrency)
+            batch_size = self.reviewer.batch_size
             
-            # Review segments
-            reviewed_segments = await self.reviewer.review_segments(request.segments)
+            segments = _input_segments_adapter.validate_python(request.segments)
             
-            # Update response
-            response.segments = reviewed_segments
-            response.reviewed_segments = len(reviewed_segments)
+            async def review_chunk(start: int):
+                async with sem:
+                    return start, await self.reviewer.review_batch(segments[start:start + batch_size], rng)
+            
+            # Segments are written to disk in input order; chunks that finish early wait in ``waiting``
+            waiting: Dict[int, List[_SegmentInternal]] = {}
+            next_start = 0
+            approved_count = 0
+            for next_done in asyncio.as_completed([review_chunk(start) for start in range(0, len(segments), batch_size)]):
+                start, chunk = await next_done
+                waiting[start] = chunk
+                ready = []
+                while next_start in waiting:
+                    ready.extend(waiting.pop(next_start))
+                    next_start += batch_size
+                if not ready:
+                    continue
+                await asyncio.to_thread(self.storage.append_segments, review_id, ready)
+                approved_count += sum(1 for seg in ready if seg.review_status == ReviewStatus.APPROVED)
+                response.reviewed_segments += len(ready)
+                self.total_segments_reviewed += len(ready)
+                self.version += 1
             
             # Determine final status
-            approved_count = sum(1 for seg in reviewed_segments if seg.review_status == ReviewStatus.APPROVED)
-            if approved_count == len(reviewed_segments):
-                response.status = ReviewStatus.APPROVED
+            if approved_count == response.reviewed_segments:
+                self.set_status(response, ReviewStatus.APPROVED)
             elif approved_count > 0:
-                response.status = ReviewStatus.NEEDS_REVISION
+                self.set_status(response, ReviewStatus.NEEDS_REVISION)
             else:
-                response.status = ReviewStatus.REJECTED
-            
-            response.completed_at = datetime.utcnow()
+                self.set_status(response, ReviewStatus.REJECTED)
             
-            print(f"Review job {review_id} completed successfully")
+            await self.finish(review_id)
             
-        except Exception as e:
-            # Handle errors
-            review_data = self.active_reviews[review_id]
-            response = review_data["response"]
-            response.status = ReviewStatus.REJECTED
-            response.completed_at = datetime.utcnow()
+            logger.info("Review job %s completed successfully", review_id)
             
-            print(f"Review job {review_id} failed: {e}")
+        except Exception:
+            logger.exception("Review job %s failed", review_id)
+            # Nothing left to record if the failure came after the review was finished
+            if review_id in self.active_reviews:
+                self.set_status(response, ReviewStatus.REJECTED)
+                await self.finish(review_id)
+    
+    async def get_review(self, review_id: str) -> Optional[ReviewResponse]:
+        """An in-progress or recently finished review from memory, otherwise one from storage"""
+        review_data = self.active_reviews.get(review_id)
+        if review_data is not None:
+            return review_data["response"]
+        response = self.recent_reviews.get(review_id)
+        if response is not None:
+            return response
+        return await asyncio.to_thread(self.storage.load, review_id)
+    
+    async def get_segments(self, review_id: str, limit: Optional[int] = None, offset: int = 0) -> Optional[List[bytes]]:
+        """Encoded reviewed segments of a review, read from its JSONL file"""
+        segments = await asyncio.to_thread(self.storage.read_segments, review_id, limit, offset)
+        if segments is None and await self.get_review(review_id) is None:
+            return None
+        return segments or []
     
-    def get_review_status(self, review_id: str) -> ReviewResponse:
+    async def get_review_status(self, review_id: str) -> ReviewResponse:
         """Get status of a review job"""
-        if review_id not in self.active_reviews:
+        response = await self.get_review(review_id)
+        if response is None:
             raise ValueError(f"Review {review_id} not found")
-        
-        return self.active_reviews[review_id]["response"]
+        return response
+    
+    async def get_all_reviews(self) -> List[ReviewResponse]:
+        """Get all reviews"""
+        return await self.get_reviews_page()
+    
+    def iter_reviews(self) -> Iterator[ReviewResponse]:
+        """Iterate over the in-progress reviews without building a list"""
+        return (review_data["response"] for review_data in self.active_reviews.values())
     
-    def get_all_reviews(self) -> List[ReviewResponse]:
-        """Get all active reviews"""
-        return [review_data["response"] for review_data in self.active_reviews.values()] 
\ No newline at end of file
+    async def get_reviews_page(self, limit: Optional[int] = None, offset: int = 0) -> List[ReviewResponse]:
+        """Reviews in creation order, ``limit`` of them starting at ``offset`` (all when limit is None)"""
+        stop = None if limit is None else offset + limit
+        finished = await asyncio.to_thread(self.storage.oldest, stop)
+        merged = heapq.merge(finished, self.iter_reviews(), key=lambda response: response.created_at)
+        return list(islice(merged, offset, stop)) 
\ No newline at end of file